@@ -0,0 +1,101 @@
+import queue
+import threading
+import time
+
+
+class AIWorker:
+    """
+    Computes AI moves in a background thread so that the Tk event loop never
+    blocks on a search. The result is put on a queue that the Tk thread polls
+    with root.after; a request can be cancelled at any time (resign, new
+    game, quit), which stops the search and drops its result.
+    """
+
+    def __init__(self, root, ai, poll_ms=50):
+        self.root = root
+        self.ai = ai
+        self.poll_ms = poll_ms
+        self.results = queue.Queue()
+        self.request_id = 0
+        self.thread = None
+        self.search_lock = threading.Lock()  # Une seule recherche à la fois sur l'IA partagée
+        self.stop_event = None
+        self.poll_job = None
+        self.callback = None
+        self.progress = None
+        self.on_error = None
+        self.started = 0.0
+
+    @property
+    def thinking(self):
+        return self.callback is not None
+
+    def request_move(self, board, player, callback, progress=None, on_error=None):
+        """
+        Starts computing a move for `player` on a copy of `board`.
+        Args:
+            board: Current board; the UI keeps drawing it while the AI searches its copy.
+            player (str): 'B' or 'N'.
+            callback: Called on the Tk thread with the move ((start, end) or None).
+            progress: Optional, called on the Tk thread every poll with the elapsed seconds.
+            on_error: Optional, called on the Tk thread with the exception if the AI
+                fails; `callback` is then not called.
+        """
+        self.cancel()
+        self.request_id += 1
+        self.callback, self.progress, self.on_error = callback, progress, on_error
+        self.stop_event = threading.Event()
+        self.started = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, daemon=True,
+                                       args=(self.request_id, board.copy(), player, self.stop_event))
+        self.thread.start()
+        self.poll_job = self.root.after(self.poll_ms, self.poll)
+
+    def run(self, request_id, board, player, stop_event):
+        # La recherche annulée précédente finit ses derniers nœuds avant que celle-ci commence
+        with self.search_lock:
+            if stop_event.is_set():
+                return  # Annulée avant d'avoir commencé
+            # Une erreur de l'IA est transmise à part : None voudrait dire « aucun coup légal »
+            try:
+                move = self.ai.get_best_move(board, player=player, stop_event=stop_event)
+            except Exception as e:
+                self.results.put((request_id, None, e))
+                return
+        self.results.put((request_id, move, None))
+
+    def poll(self):
+        self.poll_job = None
+        while True:
+            try:
+                request_id, move, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            # Résultat d'une demande annulée : ignoré
+            if request_id == self.request_id and self.callback:
+                callback, on_error = self.callback, self.on_error
+                self.callback = self.progress = self.on_error = None
+                if error is None:
+                    callback(move)
+                elif on_error:
+                    on_error(error)
+                else:
+                    print(f"❌ Erreur de l'IA : {error}")
+                return
+
+        if self.callback:
+            if self.progress:
+                self.progress(time.perf_counter() - self.started)
+            self.poll_job = self.root.after(self.poll_ms, self.poll)
+
+    def cancel(self):
+        # Arrête la recherche en cours ; son résultat ne sera jamais transmis
+        self.callback = self.progress = self.on_error = None
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
+        if self.stop_event is not None:
+            self.stop_event.set()
+        # Pas d'attente sur le thread Tk : la recherche arrêtée se termine seule
+        # (thread démon) et son résultat, d'une demande périmée, sera ignoré
+        self.thread = None
@@ -0,0 +1,165 @@
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import evaluation
+import perft
+from bitboard import BitBoard
+from board import Board
+from ia import MODE_HISTORY, MODE_SEARCH, CheckersAI
+from search import AlphaBetaSearch
+
+# Mesure du générateur de coups et de l'IA sur un jeu de positions fixe
+# (positions de référence de perft + positions de milieu de partie tirées
+# avec une graine fixe), pour que deux exécutions soient comparables :
+# une régression apparaît comme un temps par appel plus élevé.
+
+PLAYOUT_POSITIONS = 20
+PLAYOUT_PLIES = (10, 40)
+SEARCH_DEPTH = 4
+PERFT_DEPTH = 5
+
+
+def sample_positions(board_class=Board, count=PLAYOUT_POSITIONS, seed=0):
+    """
+    Builds the benchmark positions: the perft reference positions followed by
+    positions reached by random games from the start position.
+    Returns:
+        list: (board, player) pairs.
+    """
+    positions = [(perft.position_board(p, board_class), p["player"]) for p in perft.PERFT_POSITIONS]
+    rng = random.Random(seed)
+    while len(positions) < len(perft.PERFT_POSITIONS) + count:
+        board, player = Board(), "B"
+        for _ in range(rng.randint(*PLAYOUT_PLIES)):
+            moves = board.generate_legal_moves(player)
+            if not moves:
+                break
+            board.make_move(*rng.choice(moves))
+            if not board.mandatory_jump_piece:
+                player = perft.opponent(player)
+        if board.generate_legal_moves(player):
+            positions.append((BitBoard.from_board(board) if board_class is BitBoard else board, player))
+    return positions
+
+
+def per_call(func, calls, repeat=5):
+    # Meilleur temps sur `repeat` séries, en µs par appel
+    number = max(1, 20_000 // max(calls, 1))
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    return best / (number * calls) * 1e6
+
+
+def bench_generator(positions):
+    squares = [(board, square) for board, player in positions for square in sorted(board.pieces[player])]
+    moves = [(board, move) for board, player in positions for move in board.generate_legal_moves(player)]
+
+    def get_valid_moves():
+        for board, (row, col) in squares:
+            board.get_valid_moves(row, col)
+
+    def has_capture():
+        for board, player in positions:
+            board.has_capture(player)
+
+    def generate_legal_moves():
+        for board, player in positions:
+            board.generate_legal_moves(player)
+
+    def copy():
+        for board, _ in moves:
+            board.copy()
+
+    def move_piece():
+        # Sur une copie : le plateau de départ reste le même d'une série à l'autre
+        for board, (start, end) in moves:
+            board.copy().move_piece(start, end)
+
+    def make_unmake():
+        for board, (start, end) in moves:
+            board.unmake_move(board.make_move(start, end))
+
+    copy_cost = per_call(copy, len(moves))
+    return [
+        ("get_valid_moves", per_call(get_valid_moves, len(squares))),
+        ("has_capture", per_call(has_capture, len(positions))),
+        ("generate_legal_moves", per_call(generate_legal_moves, len(positions))),
+        ("copy", copy_cost),
+        ("move_piece (copie déduite)", per_call(move_piece, len(moves)) - copy_cost),
+        ("make_move + unmake_move", per_call(make_unmake, len(moves))),
+    ]
+
+
+def bench_evaluation(positions):
+    moves = [(board, player, board.generate_legal_moves(player)) for board, player in positions]
+    count = sum(len(candidates) for _, _, candidates in moves)
+    # Lot de toutes les positions atteintes : coût par position d'un grand lot
+    codes = np.concatenate([evaluation.encode_moves(board, candidates) for board, _, candidates in moves])
+    black = np.concatenate([np.full(len(candidates), player == "N") for _, player, candidates in moves])
+
+    def evaluate_moves():
+        for board, player, candidates in moves:
+            evaluation.evaluate_moves(board, player, candidates)
+
+    return [
+        ("evaluation.evaluate_moves (par coup)", per_call(evaluate_moves, count)),
+        (f"evaluation.evaluate_positions (lot de {len(codes)})", per_call(
+            lambda: evaluation.evaluate_positions(codes, black), len(codes))),
+    ]
+
+
+def bench_ai(positions, depth=SEARCH_DEPTH):
+    # Sans historique, bibliothèque ni tables de finales : seul le calcul est mesuré
+    greedy = CheckersAI(mode=MODE_HISTORY, use_book=False, use_tablebase=False)
+    greedy.history_index = {}
+    started = time.perf_counter()
+    for board, player in positions:
+        greedy.get_best_move(board, player)
+    greedy_time = (time.perf_counter() - started) / len(positions) * 1e6
+
+    # Recherche à profondeur fixe (sans limite de temps), table vide à chaque
+    # position : le travail est identique d'une exécution à l'autre
+    searcher = CheckersAI(mode=MODE_SEARCH, use_book=False, use_tablebase=False)
+    nodes = elapsed = 0
+    for board, player in positions:
+        searcher.search = AlphaBetaSearch(time_limit_ms=10 ** 9, max_depth=depth)
+        started = time.perf_counter()
+        searcher.get_best_move(board, player)
+        elapsed += time.perf_counter() - started
+        nodes += searcher.search.nodes
+    return [
+        (f"get_best_move ({MODE_HISTORY})", greedy_time),
+        (f"get_best_move ({MODE_SEARCH}, profondeur {depth})", elapsed / len(positions) * 1e6),
+    ], nodes / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure du générateur de coups et de l'IA.")
+    parser.add_argument("--bitboard", action="store_true", help="Mesurer bitboard.BitBoard au lieu de Board")
+    parser.add_argument("--search-depth", type=int, default=SEARCH_DEPTH)
+    parser.add_argument("--perft-depth", type=int, default=PERFT_DEPTH)
+    args = parser.parse_args(argv)
+
+    board_class = BitBoard if args.bitboard else Board
+    positions = sample_positions(board_class)
+    print(f"{board_class.__name__}, {len(positions)} positions")
+    print(f"{'opération':<45} {'µs/appel':>12}")
+    results, nps = bench_ai(positions, args.search_depth)
+    for name, micros in bench_generator(positions) + bench_evaluation(positions) + results:
+        print(f"{name:<45} {micros:>12.2f}")
+    print(f"{'recherche (nœuds/s)':<45} {nps:>12.0f}")
+
+    start = perft.PERFT_POSITIONS[0]
+    nodes, elapsed = perft.timed_perft(perft.position_board(start, board_class), start["player"], args.perft_depth)
+    print(f"{f'perft profondeur {args.perft_depth} (positions/s)':<45} {nodes / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats import GameStats
+
+# Mesure du temps de GameStats.compute_stats sur des historiques synthétiques
+# de taille croissante (jusqu'à un million de coups) : le temps par coup doit
+# rester à peu près constant, c'est-à-dire un coût linéaire.
+
+SIZES = (125_000, 250_000, 500_000, 1_000_000)
+MOVES_PER_GAME = 50
+
+
+def synthetic_history(move_rows, seed=0):
+    # Historique au format de game_history.csv : marqueurs, coups, résultat
+    rng = np.random.default_rng(seed)
+    games = move_rows // MOVES_PER_GAME
+    per_game = MOVES_PER_GAME + 3
+
+    game_ids = np.repeat(np.arange(1, games + 1), per_game)
+    position = np.tile(np.arange(per_game), games)
+    is_move = (position >= 1) & (position <= MOVES_PER_GAME)
+
+    squares = np.array([f"({r}, {c})" for r in range(8) for c in range(8) if (r + c) % 2 == 1])
+    turn = position.astype(object)
+    turn[position == 0] = np.char.add(np.char.add("---debut-partie", game_ids[position == 0].astype(str)), "---")
+    turn[position == MOVES_PER_GAME + 1] = "Résultat"
+    turn[position == MOVES_PER_GAME + 2] = np.char.add(
+        np.char.add("---fin-partie", game_ids[position == MOVES_PER_GAME + 2].astype(str)), "---")
+    turn = turn.astype(str)
+
+    player = np.where(position % 2 == 1, "B", "N").astype(object)
+    start = squares[rng.integers(0, len(squares), len(position))].astype(object)
+    end = squares[rng.integers(0, len(squares), len(position))].astype(object)
+    captured = np.full(len(position), "None", dtype=object)
+    winners = np.where(rng.random(games) < 0.5, "IA", "Joueur")
+    captured[position == MOVES_PER_GAME + 1] = winners
+    for column in (player, start, end):
+        column[~is_move] = None
+    captured[position == 0] = None
+    captured[position == MOVES_PER_GAME + 2] = None
+
+    return pd.DataFrame({"turn": turn, "player": player, "start": start, "end": end, "captured piece": captured})
+
+
+def main():
+    print(f"{'coups':>10} {'secondes':>10} {'µs/coup':>10}")
+    for size in SIZES:
+        df = synthetic_history(size)
+        started = time.perf_counter()
+        GameStats.compute_stats(df)
+        elapsed = time.perf_counter() - started
+        print(f"{size:>10} {elapsed:>10.2f} {elapsed / size * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+import csv
+import mmap
+import os
+import shutil
+import struct
+
+import numpy as np
+
+import history
+import history_reader
+
+# Format binaire compact de l'historique (fichier .bin à côté du CSV).
+#
+#   En-tête (24 octets) : magie "DAMB", version, nombre de parties,
+#                         position de la table des parties, taille du CSV source déjà converti
+#   Coups (3 octets chacun, toutes les parties à la suite) :
+#                         case de départ, case d'arrivée, drapeaux
+#   Table des parties (32 octets par partie, en fin de fichier) :
+#                         premier coup, nombre de coups, vainqueur, numéro de partie,
+#                         date (texte history.DATE_FORMAT, vide si inconnue)
+#
+# Une case est un octet : ligne * 4 + colonne // 2 (cases noires uniquement).
+# Drapeaux : bit 0 = coup des noirs, bits 2 à 4 = pièce capturée (voir CAPTURED_CODES).
+
+MAGIC = b"DAMB"
+VERSION = 2  # 2 : date des parties dans la table
+HEADER = struct.Struct("<4sB3xIIQ")
+HEADER_SIZE = HEADER.size
+DATE_SIZE = 19  # len("2024-01-31 23:59:59")
+GAME_ENTRY = struct.Struct(f"<IHBxI{DATE_SIZE}sx")
+
+MOVE_DTYPE = np.dtype([("start", "u1"), ("end", "u1"), ("flags", "u1")])
+GAME_DTYPE = np.dtype([("first", "<u4"), ("length", "<u2"), ("winner", "u1"), ("pad", "u1"), ("game_id", "<u4"),
+                       ("date", f"S{DATE_SIZE}"), ("pad2", "u1")])
+
+WINNER_CODES = {None: 0, history.WINNER_BLACK: 1, history.WINNER_WHITE: 2, history.WINNER_DRAW: 3}
+WINNER_LABELS = {code: label for label, code in WINNER_CODES.items()}
+CAPTURED_CODES = {None: 0, "B": 1, "N": 2, "BD": 3, "ND": 4}
+CAPTURED_PIECES = {code: piece for piece, code in CAPTURED_CODES.items()}
+
+FLAG_BLACK = 0x01
+
+
+def square_index(square):
+    row, col = square
+    return row * 4 + col // 2
+
+
+def square_coords(index):
+    row = index // 4
+    return row, 2 * (index % 4) + (1 if row % 2 == 0 else 0)
+
+
+def binary_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".bin"
+
+
+def pack_moves(moves):
+    data = bytearray()
+    for player, start, end, captured_piece in moves:
+        flags = (FLAG_BLACK if player == "N" else 0) | (CAPTURED_CODES.get(captured_piece, 0) << 2)
+        data += bytes((square_index(start), square_index(end), flags))
+    return bytes(data)
+
+
+def unpack_moves(data):
+    moves = []
+    for i in range(0, len(data), 3):
+        start, end, flags = data[i], data[i + 1], data[i + 2]
+        moves.append(("N" if flags & FLAG_BLACK else "B", square_coords(start), square_coords(end),
+                      CAPTURED_PIECES.get(flags >> 2)))
+    return moves
+
+
+def append_games(games, bin_path, source_size=None):
+    """
+    Appends games to a binary history file (created if missing).
+    Args:
+        games: Iterable of (game_id, moves, winner, date) tuples, date as in history.game_rows.
+        bin_path (str): Binary history file.
+        source_size (int, optional): Size of the CSV converted so far, stored in the header.
+    Returns:
+        int: Number of games in the file after the append.
+    """
+    data, table, first = bytearray(), [], 0
+    for game_id, moves, winner, date in games:
+        data += pack_moves(moves)
+        table.append((first, len(moves), WINNER_CODES.get(winner, 0), 0, game_id, date.encode("ascii"), 0))
+        first += len(moves)
+    return write_games(bytes(data), np.array(table, dtype=GAME_DTYPE), bin_path, source_size)
+
+
+def pack_chunk(chunk):
+    """
+    Packs a history_reader.HistoryChunk column by column.
+    Returns:
+        tuple: (move_data, table, source_size) as expected by write_games,
+        source_size being the CSV offset just after the chunk.
+    """
+    moves = np.empty(len(chunk.moves), dtype=MOVE_DTYPE)
+    moves["start"] = chunk.moves["start"].to_numpy()
+    moves["end"] = chunk.moves["end"].to_numpy()
+    captured = chunk.moves["captured"].cat
+    captured_codes = np.array([CAPTURED_CODES[piece] for piece in captured.categories] + [0], dtype=np.uint8)
+    moves["flags"] = (chunk.moves["player"].to_numpy() == "N") * FLAG_BLACK | \
+        (captured_codes[captured.codes.to_numpy()] << 2)
+
+    winner = chunk.games["winner"].cat
+    winner_codes = np.array([WINNER_CODES[label] for label in winner.categories] + [0], dtype=np.uint8)
+    lengths = chunk.games["plies"].to_numpy()
+    table = np.zeros(len(lengths), dtype=GAME_DTYPE)
+    table["first"] = np.cumsum(lengths) - lengths
+    table["length"] = lengths
+    table["winner"] = winner_codes[winner.codes.to_numpy()]
+    table["game_id"] = chunk.games["game_id"].to_numpy()
+    # Date illisible (trop longue, non ASCII) : gardée vide plutôt que tronquée
+    dates = chunk.games["date"].astype(str)
+    dates = dates.where((dates.str.len() <= DATE_SIZE) & dates.map(str.isascii), "")
+    table["date"] = dates.to_numpy(dtype=str).astype(f"S{DATE_SIZE}")
+    return moves.tobytes(), table, chunk.end_offset
+
+
+def append_chunk(chunk, bin_path):
+    """
+    Appends a history_reader.HistoryChunk and records its end offset as the
+    size of the CSV converted so far.
+    Returns:
+        int: Number of games in the file after the append.
+    """
+    move_data, table, source_size = pack_chunk(chunk)
+    return write_games(move_data, table, bin_path, source_size)
+
+
+def append_to(f, move_data, table, source_size=None):
+    # `table` (GAME_DTYPE) numérote les coups à partir de 0 : décalé ici après les coups existants
+    f.seek(0)
+    _, _, count, table_offset, old_source_size = HEADER.unpack(f.read(HEADER_SIZE))
+    f.seek(table_offset)
+    old_table = f.read(count * GAME_ENTRY.size)
+
+    # Les nouveaux coups remplacent l'ancienne table, réécrite à la fin
+    table = table.copy()
+    table["first"] += (table_offset - HEADER_SIZE) // MOVE_DTYPE.itemsize
+    f.seek(table_offset)
+    f.write(move_data)
+    table_offset = f.tell()
+    f.write(old_table)
+    f.write(table.tobytes())
+    f.truncate()
+    count += len(table)
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, VERSION, count, table_offset,
+                        old_source_size if source_size is None else source_size))
+    return count
+
+
+def write_batches(bin_path, batches, fresh=False):
+    """
+    Appends batches of games to a binary history file; the caller holds
+    history.locked(bin_path).
+    The batches are written to a copy of the file that then replaces it in
+    one step: a process stopped midway leaves the previous file intact.
+    Args:
+        batches: Iterable of (move_data, table, source_size), see write_games.
+        fresh (bool): Start from an empty file instead of the existing one.
+    Returns:
+        int: Number of games in the file after the append.
+    """
+    tmp_path = bin_path + ".tmp"
+    if os.path.exists(bin_path) and not fresh:
+        shutil.copyfile(bin_path, tmp_path)
+        f = open(tmp_path, "r+b")
+    else:
+        f = open(tmp_path, "w+b")
+        f.write(HEADER.pack(MAGIC, VERSION, 0, HEADER_SIZE, 0))
+    with f:
+        f.seek(0)
+        count = HEADER.unpack(f.read(HEADER_SIZE))[2]
+        for move_data, table, source_size in batches:
+            count = append_to(f, move_data, table, source_size)
+    os.replace(tmp_path, bin_path)
+    return count
+
+
+def write_games(move_data, table, bin_path, source_size=None):
+    # Ajout sous verrou : plusieurs processus peuvent compléter le même fichier
+    with history.locked(bin_path):
+        return write_batches(bin_path, [(move_data, table, source_size)])
+
+
+class BinaryHistory:
+    """
+    Memory-mapped, read-only view of a binary history file.
+    game(n) gives random access to any game; `moves` and `games` are NumPy
+    views over the mapped file for vectorised loads (no parsing, no copy).
+    """
+
+    def __init__(self, bin_path):
+        self.path = bin_path
+        self._file = open(bin_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, table_offset, self.source_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Fichier d'historique binaire invalide : {bin_path}")
+        total_moves = (table_offset - HEADER_SIZE) // MOVE_DTYPE.itemsize
+        self.moves = np.frombuffer(self._map, dtype=MOVE_DTYPE, count=total_moves, offset=HEADER_SIZE)
+        self.games = np.frombuffer(self._map, dtype=GAME_DTYPE, count=self.count, offset=table_offset)
+
+    def __len__(self):
+        return self.count
+
+    def game(self, n):
+        """
+        Returns game number n (0-based position in the file).
+        Returns:
+            tuple: (game_id, moves, winner, date), moves as (player, start, end,
+            captured_piece), date empty if unknown.
+        """
+        first, length, winner, game_id, date = GAME_ENTRY.unpack_from(
+            self._map, HEADER_SIZE + len(self.moves) * MOVE_DTYPE.itemsize + n * GAME_ENTRY.size)
+        offset = HEADER_SIZE + first * MOVE_DTYPE.itemsize
+        return game_id, unpack_moves(self._map[offset:offset + length * MOVE_DTYPE.itemsize]), \
+            WINNER_LABELS.get(winner), date.rstrip(b"\0").decode("ascii")
+
+    def iter_games(self):
+        for n in range(self.count):
+            yield self.game(n)
+
+    def move_winners(self):
+        # Code du vainqueur de la partie, répété pour chacun de ses coups
+        return np.repeat(self.games["winner"], self.games["length"])
+
+    def close(self):
+        # Les vues NumPy doivent être libérées avant de fermer la projection
+        self.moves = self.games = None
+        self._map.close()
+        self._file.close()
+
+
+def csv_to_binary(csv_path=history.HISTORY_FILE, bin_path=None):
+    """
+    Brings the binary mirror of a CSV history up to date.
+    Only the games appended to the CSV since the last conversion are read
+    (the header remembers how many CSV bytes were already converted). The
+    whole update is done under the lock of the binary file, so concurrent
+    callers never convert the same games twice.
+    Returns:
+        str: Path of the binary file.
+    """
+    bin_path = bin_path or binary_path(csv_path)
+    with history.locked(bin_path):
+        source_size, fresh = 0, True
+        if os.path.exists(bin_path):
+            with open(bin_path, "rb") as f:
+                header = f.read(HEADER_SIZE)
+            # Fichier d'une autre version (sans dates) : reconverti entièrement
+            if len(header) == HEADER_SIZE and header[:4] == MAGIC and header[4] == VERSION:
+                source_size, fresh = HEADER.unpack(header)[4], False
+            if not os.path.exists(csv_path) or source_size > os.path.getsize(csv_path):
+                source_size, fresh = 0, True  # CSV réécrit ou tronqué : conversion complète
+
+        csv_size = os.path.getsize(csv_path) if os.path.exists(csv_path) else 0
+        if fresh or source_size < csv_size:
+            # Conversion par blocs de parties : la mémoire ne dépend pas de la taille du CSV
+            chunks = history_reader.iter_chunks(csv_path, start_offset=source_size) if csv_size else ()
+            write_batches(bin_path, (pack_chunk(chunk) for chunk in chunks), fresh=fresh)
+    return bin_path
+
+
+def binary_to_csv(bin_path, csv_path):
+    """
+    Writes a binary history back to the CSV layout (game ids and dates preserved).
+    """
+    records = BinaryHistory(bin_path)
+    try:
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(history.HEADER)
+            for game_id, moves, winner, date in records.iter_games():
+                writer.writerows(history.game_rows(game_id, moves, winner or "", date))
+    finally:
+        records.close()
+
+
+def load_history(csv_path=history.HISTORY_FILE):
+    """
+    Opens the binary mirror of `csv_path`, converting new CSV games first.
+    Returns:
+        BinaryHistory or None: None if there is no history yet.
+    """
+    if not os.path.exists(csv_path):
+        return None
+    return BinaryHistory(csv_to_binary(csv_path))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Conversion de l'historique CSV <-> binaire.")
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    args = parser.parse_args()
+    if args.source.endswith(".bin"):
+        binary_to_csv(args.source, args.destination)
+    else:
+        csv_to_binary(args.source, args.destination)
@@ -0,0 +1,509 @@
+# Moteur de plateau "bitboard" : les 32 cases noires jouables sont stockées
+# dans des entiers 32 bits (un bit par case), un masque par type de pièce.
+#
+# Numérotation des cases : case = ligne * 4 + colonne // 2, pour les cases
+# (ligne + colonne) impaires. Les lignes paires utilisent les colonnes 1,3,5,7
+# et les lignes impaires les colonnes 0,2,4,6.
+
+from board import ZOBRIST_PIECES, ZOBRIST_JUMP
+
+FULL = 0xFFFFFFFF
+EVEN_ROWS = 0x0F0F0F0F          # Lignes 0, 2, 4, 6
+ODD_ROWS = 0xF0F0F0F0           # Lignes 1, 3, 5, 7
+COL_0 = 0x10101010              # Colonne 0 (lignes impaires uniquement)
+COL_7 = 0x08080808              # Colonne 7 (lignes paires uniquement)
+ROW_0 = 0x0000000F
+ROW_7 = 0xF0000000
+
+# Même ordre que Board : haut-gauche, haut-droite, bas-gauche, bas-droite
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = range(4)
+DIRECTIONS = (UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT)
+OPPOSITE = {UP_LEFT: DOWN_RIGHT, UP_RIGHT: DOWN_LEFT, DOWN_LEFT: UP_RIGHT, DOWN_RIGHT: UP_LEFT}
+FORWARD = {"B": (UP_LEFT, UP_RIGHT), "N": (DOWN_LEFT, DOWN_RIGHT)}
+
+SQUARE_COORDS = [(s // 4, 2 * (s % 4) + (1 if (s // 4) % 2 == 0 else 0)) for s in range(32)]
+COORD_SQUARE = {coords: s for s, coords in enumerate(SQUARE_COORDS)}
+
+
+def shift(bb, direction):
+    # Décale toutes les cases du masque d'un pas dans la direction donnée
+    if direction == UP_LEFT:
+        return ((bb & EVEN_ROWS) >> 4) | ((bb & ODD_ROWS & ~COL_0) >> 5)
+    if direction == UP_RIGHT:
+        return ((bb & EVEN_ROWS & ~COL_7) >> 3) | ((bb & ODD_ROWS) >> 4)
+    if direction == DOWN_LEFT:
+        return (((bb & EVEN_ROWS) << 4) | ((bb & ODD_ROWS & ~COL_0) << 3)) & FULL
+    return (((bb & EVEN_ROWS & ~COL_7) << 5) | ((bb & ODD_ROWS) << 4)) & FULL
+
+
+# Mêmes clés de Zobrist que Board, indexées par case : les deux moteurs
+# donnent la même empreinte pour une même position.
+ZOBRIST_SQUARES = {
+    piece: [ZOBRIST_PIECES[piece][row][col] for row, col in SQUARE_COORDS]
+    for piece in ZOBRIST_PIECES
+}
+
+
+def iter_bits(bb):
+    while bb:
+        low = bb & -bb
+        yield low
+        bb ^= low
+
+
+def bit_to_coords(bit):
+    return SQUARE_COORDS[bit.bit_length() - 1]
+
+
+def coords_to_bit(row, col):
+    square = COORD_SQUARE.get((row, col))
+    return 0 if square is None else 1 << square
+
+
+def popcount(bb):
+    return bin(bb).count("1")
+
+
+class BitBoard:
+    """
+    Drop-in replacement for board.Board backed by 32-bit masks.
+    Black men, white men and kings are each a mask over the 32 dark squares;
+    move and capture generation use shift/mask operations. The `board`
+    attribute is an 8x8 view built on first access and then kept up to date
+    by make_move/unmake_move, so that gui.GUI and replay_visual keep working
+    unchanged.
+    """
+
+    def __init__(self):
+        self.black = 0x00000FFF           # Pions noirs en haut (lignes 0 à 2)
+        self.white = 0xFFF00000           # Pions blancs en bas (lignes 5 à 7)
+        self.kings = 0
+        self.captured_black = 0           # Pions noirs capturés
+        self.captured_white = 0           # Pions blancs capturés
+        self.mandatory_jump_piece = None  # Pièce obligée de continuer une capture
+        self._view = None
+        self._pieces = None
+        self.zobrist_key = self.compute_zobrist_key()
+
+    @classmethod
+    def from_board(cls, board):
+        # Conversion depuis un plateau 8x8 (Board ou liste de listes)
+        grid = board.board if hasattr(board, "board") else board
+        bb = cls()
+        bb.black = bb.white = bb.kings = 0
+        for s, (row, col) in enumerate(SQUARE_COORDS):
+            piece = grid[row][col]
+            if not piece:
+                continue
+            if piece[0] == "N":
+                bb.black |= 1 << s
+            else:
+                bb.white |= 1 << s
+            if "D" in piece:
+                bb.kings |= 1 << s
+        if hasattr(board, "board"):
+            bb.captured_black = board.captured_black
+            bb.captured_white = board.captured_white
+            bb.mandatory_jump_piece = board.mandatory_jump_piece
+        bb.zobrist_key = bb.compute_zobrist_key()
+        return bb
+
+    def compute_zobrist_key(self):
+        key = 0
+        for bit in iter_bits(self.black | self.white):
+            key ^= ZOBRIST_SQUARES[self.piece_at_bit(bit)][bit.bit_length() - 1]
+        if self.mandatory_jump_piece:
+            row, col = self.mandatory_jump_piece
+            key ^= ZOBRIST_JUMP[row][col]
+        return key
+
+    def set_mandatory_jump_piece(self, square):
+        if self.mandatory_jump_piece:
+            self.zobrist_key ^= ZOBRIST_JUMP[self.mandatory_jump_piece[0]][self.mandatory_jump_piece[1]]
+        if square:
+            self.zobrist_key ^= ZOBRIST_JUMP[square[0]][square[1]]
+        self.mandatory_jump_piece = square
+
+    # --- Vue 8x8 compatible avec Board -------------------------------------
+
+    @property
+    def board(self):
+        if self._view is None:
+            view = [[None] * 8 for _ in range(8)]
+            for s, (row, col) in enumerate(SQUARE_COORDS):
+                bit = 1 << s
+                piece = self.piece_at_bit(bit)
+                if piece:
+                    view[row][col] = piece
+            self._view = view
+        return self._view
+
+    def piece_at_bit(self, bit):
+        if self.black & bit:
+            piece = "N"
+        elif self.white & bit:
+            piece = "B"
+        else:
+            return None
+        return piece + "D" if self.kings & bit else piece
+
+    @property
+    def pieces(self):
+        # Cases occupées par camp, comme Board.pieces : construites au premier accès,
+        # puis tenues à jour par make_move/unmake_move (comme la vue 8x8)
+        if self._pieces is None:
+            self._pieces = {"B": {bit_to_coords(bit) for bit in iter_bits(self.white)},
+                            "N": {bit_to_coords(bit) for bit in iter_bits(self.black)}}
+        return self._pieces
+
+    @property
+    def king_counts(self):
+        # Nombre de dames par camp, comme Board.king_counts
+        return {"B": popcount(self.white & self.kings), "N": popcount(self.black & self.kings)}
+
+    def piece_count(self, player):
+        return popcount(self.side_mask(player))
+
+    def side_mask(self, player):
+        return self.black if player == "N" else self.white
+
+    def empty_mask(self):
+        return ~(self.black | self.white) & FULL
+
+    # --- Génération de coups ------------------------------------------------
+
+    def _capture_landings(self, bit, player, is_king):
+        # Cases d'arrivée des captures depuis une pièce (masque d'un bit)
+        enemy = self.white if player == "N" else self.black
+        empty = self.empty_mask()
+        landings = []
+        if is_king:
+            occupied = self.black | self.white
+            for direction in DIRECTIONS:
+                x = shift(bit, direction)
+                while x:
+                    if x & occupied:
+                        if x & enemy:
+                            land = shift(x, direction) & empty
+                            if land:
+                                landings.append(land)
+                        break
+                    x = shift(x, direction)
+        else:
+            for direction in DIRECTIONS:
+                if direction not in FORWARD[player]:
+                    continue
+                land = shift(shift(bit, direction) & enemy, direction) & empty
+                if land:
+                    landings.append(land)
+        return landings
+
+    def _slide_targets(self, bit, player, is_king):
+        empty = self.empty_mask()
+        targets = []
+        for direction in DIRECTIONS:
+            if is_king:
+                x = shift(bit, direction) & empty
+                while x:
+                    targets.append(x)
+                    x = shift(x, direction) & empty
+            elif direction in FORWARD[player]:
+                x = shift(bit, direction) & empty
+                if x:
+                    targets.append(x)
+        return targets
+
+    def _men_capture_mask(self, player):
+        # Pions du joueur ayant au moins une prise (toutes les pièces à la fois)
+        own = self.side_mask(player)
+        men = own & ~self.kings
+        enemy = self.white if player == "N" else self.black
+        empty = self.empty_mask()
+        capturers = 0
+        for direction in FORWARD[player]:
+            back = OPPOSITE[direction]
+            land = shift(shift(men, direction) & enemy, direction) & empty
+            capturers |= shift(shift(land, back), back)
+        return capturers & men
+
+    def get_capture_moves(self, row, col):
+        bit = coords_to_bit(row, col)
+        piece = self.piece_at_bit(bit) if bit else None
+        if not piece:
+            return []
+        return [bit_to_coords(land) for land in self._capture_landings(bit, piece[0], "D" in piece)]
+
+    def has_capture(self, player):
+        # Y a-t-il une capture disponible pour ce joueur ?
+        if self._men_capture_mask(player):
+            return True
+        for bit in iter_bits(self.side_mask(player) & self.kings):
+            if self._capture_landings(bit, player, True):
+                return True
+        return False
+
+    def get_valid_moves(self, row, col):
+        bit = coords_to_bit(row, col)
+        piece = self.piece_at_bit(bit) if bit else None
+        if not piece:
+            return []
+
+        if self.mandatory_jump_piece and (row, col) != self.mandatory_jump_piece:
+            return []
+
+        player, is_king = piece[0], "D" in piece
+        captures = self._capture_landings(bit, player, is_king)
+        if captures:
+            return [bit_to_coords(land) for land in captures]
+        if self.has_capture(player):
+            return []
+        return [bit_to_coords(target) for target in self._slide_targets(bit, player, is_king)]
+
+    def generate_legal_moves(self, player, sequences=False):
+        """
+        Returns every legal (start, end) step for `player` in one pass.
+        The forced-capture status is computed once for the whole side; with
+        `sequences` set, captures are expanded into full multi-jump sequences
+        (same contract as Board.generate_legal_moves).
+        """
+        own = self.side_mask(player)
+        if self.mandatory_jump_piece:
+            bit = coords_to_bit(*self.mandatory_jump_piece)
+            if not bit & own:
+                return []
+            start = self.mandatory_jump_piece
+            moves = [(start, bit_to_coords(land))
+                     for land in self._capture_landings(bit, player, bool(self.kings & bit))]
+            return self.expand_sequences(moves, player) if sequences else moves
+
+        moves = []
+        men_capturers = self._men_capture_mask(player)
+        for bit in iter_bits(men_capturers):
+            start = bit_to_coords(bit)
+            moves.extend((start, bit_to_coords(land)) for land in self._capture_landings(bit, player, False))
+        for bit in iter_bits(own & self.kings):
+            start = bit_to_coords(bit)
+            moves.extend((start, bit_to_coords(land)) for land in self._capture_landings(bit, player, True))
+        if moves:
+            return self.expand_sequences(moves, player) if sequences else moves
+
+        empty = self.empty_mask()
+        men = own & ~self.kings
+        for direction in FORWARD[player]:
+            back = OPPOSITE[direction]
+            for target in iter_bits(shift(men, direction) & empty):
+                moves.append((bit_to_coords(shift(target, back)), bit_to_coords(target)))
+        for bit in iter_bits(own & self.kings):
+            start = bit_to_coords(bit)
+            moves.extend((start, bit_to_coords(target)) for target in self._slide_targets(bit, player, True))
+        return moves
+
+    def expand_sequences(self, captures, player):
+        # Déroule chaque prise jusqu'au bout de la rafle (prises multiples)
+        sequences = []
+        for start, end in captures:
+            undo = self.make_move(start, end)
+            if self.mandatory_jump_piece:
+                for tail in self.generate_legal_moves(player, sequences=True):
+                    sequences.append((start,) + tail)
+            else:
+                sequences.append((start, end))
+            self.unmake_move(undo)
+        return sequences
+
+    def copy(self):
+        clone = BitBoard.__new__(BitBoard)
+        clone.black, clone.white, clone.kings = self.black, self.white, self.kings
+        clone.captured_black = self.captured_black
+        clone.captured_white = self.captured_white
+        clone.mandatory_jump_piece = self.mandatory_jump_piece
+        clone.zobrist_key = self.zobrist_key
+        clone._view = None
+        clone._pieces = None
+        return clone
+
+    def has_valid_moves(self, player):
+        if self.mandatory_jump_piece:
+            row, col = self.mandatory_jump_piece
+            piece = self.board[row][col]
+            return bool(piece and piece[0] == player and self.get_valid_moves(row, col))
+        return bool(self.generate_legal_moves(player))
+
+    def has_any_capture(self, player_color):
+        # Vérifie si le joueur a au moins une capture possible
+        for bit in iter_bits(self.side_mask(player_color)):
+            row, col = bit_to_coords(bit)
+            moves = self.get_valid_moves(row, col)
+            for move_row, move_col in moves:
+                if abs(move_row - row) == 2 or self.kings & bit:
+                    return True
+        return False
+
+    # --- Validation et déplacement -----------------------------------------
+
+    def is_capture_move(self, start, end):
+        # Une pièce adverse entre les deux cases (une dame peut aussi glisser de plusieurs cases sans prendre)
+        if abs(start[0] - end[0]) < 2 or abs(start[0] - end[0]) != abs(start[1] - end[1]):
+            return False
+        start_bit = coords_to_bit(*start)
+        enemy = self.white if self.black & start_bit else self.black if self.white & start_bit else 0
+        return bool(self._path(start, end) & enemy)
+
+    @staticmethod
+    def _path(start, end):
+        # Cases strictement entre deux cases d'une même diagonale
+        direction = (UP_LEFT if end[1] < start[1] else UP_RIGHT) if end[0] < start[0] \
+            else (DOWN_LEFT if end[1] < start[1] else DOWN_RIGHT)
+        end_bit = coords_to_bit(*end)
+        path = 0
+        x = shift(coords_to_bit(*start), direction)
+        while x and x != end_bit:
+            path |= x
+            x = shift(x, direction)
+        return path
+
+    def is_valid_move(self, start, end):
+        x1, y1 = start
+        x2, y2 = end
+
+        if not (0 <= x1 < 8 and 0 <= y1 < 8 and 0 <= x2 < 8 and 0 <= y2 < 8):
+            return False
+
+        start_bit = coords_to_bit(x1, y1)
+        end_bit = coords_to_bit(x2, y2)
+        piece = self.piece_at_bit(start_bit) if start_bit else None
+        if not piece or not end_bit or end_bit & (self.black | self.white):
+            return False
+
+        if self.mandatory_jump_piece and (x1, y1) != self.mandatory_jump_piece:
+            return False
+
+        if self.has_capture(piece[0]) and not self.is_capture_move(start, end):
+            return False
+
+        dx, dy = abs(x2 - x1), abs(y2 - y1)
+        if dx != dy:
+            return False
+        direction = (UP_LEFT if y2 < y1 else UP_RIGHT) if x2 < x1 else (DOWN_LEFT if y2 < y1 else DOWN_RIGHT)
+        own = self.side_mask(piece[0])
+        enemy = self.white if piece[0] == "N" else self.black
+
+        if "D" in piece:
+            enemy_found = False
+            x = shift(start_bit, direction)
+            while x != end_bit:
+                if x & own:
+                    return False
+                if x & enemy:
+                    if enemy_found:
+                        return False
+                    enemy_found = True
+                x = shift(x, direction)
+            return True
+
+        if direction not in FORWARD[piece[0]]:
+            return False
+        # Déplacement simple
+        if dx == 1:
+            return True
+        # Capture diagonale
+        return dx == 2 and bool(shift(start_bit, direction) & enemy)
+
+    def move_piece(self, start, end):
+        if not self.is_valid_move(start, end):
+            return False, False
+
+        self.make_move(start, end)
+        return True, self.mandatory_jump_piece is not None
+
+    def make_move(self, start, end):
+        # Coup déjà connu comme légal : pas de validation. Le retour sert à unmake_move.
+        start_row, start_col = start
+        end_row, end_col = end
+        start_bit = coords_to_bit(start_row, start_col)
+        end_bit = coords_to_bit(end_row, end_col)
+        player = "N" if self.black & start_bit else "B"
+        start, end = (start_row, start_col), (end_row, end_col)
+        is_king = bool(self.kings & start_bit)
+        piece = self.piece_at_bit(start_bit)
+        # Masques d'avant le coup, puis de quoi défaire les ensembles de pièces et la vue 8x8
+        # (camp, cases, pièce jouée, puis chaque pièce prise)
+        undo = (self.black, self.white, self.kings, self.captured_black, self.captured_white,
+                self.mandatory_jump_piece, self.zobrist_key, player, start, end, piece)
+        start_sq, end_sq = start_bit.bit_length() - 1, end_bit.bit_length() - 1
+        self.zobrist_key ^= ZOBRIST_SQUARES[piece][start_sq] ^ ZOBRIST_SQUARES[piece][end_sq]
+        # Vue et ensembles déjà construits : mis à jour case par case plutôt que reconstruits
+        view, pieces = self._view, self._pieces
+        if view is not None:
+            view[start_row][start_col] = None
+            view[end_row][end_col] = piece
+        if pieces is not None:
+            pieces[player].discard(start)
+            pieces[player].add(end)
+
+        if player == "N":
+            self.black ^= start_bit | end_bit
+        else:
+            self.white ^= start_bit | end_bit
+        if is_king:
+            self.kings ^= start_bit | end_bit
+
+        # Si capture : retirer la pièce adverse sautée
+        taken = 0
+        if abs(start_row - end_row) > 1:
+            path = self._path(start, end)
+            if player == "N":
+                taken = path & self.white
+                self.white &= ~taken
+                self.captured_white += popcount(taken)
+            else:
+                taken = path & self.black
+                self.black &= ~taken
+                self.captured_black += popcount(taken)
+            for bit in iter_bits(taken):
+                taken_piece = ("B" if player == "N" else "N") + ("D" if self.kings & bit else "")
+                self.zobrist_key ^= ZOBRIST_SQUARES[taken_piece][bit.bit_length() - 1]
+                row, col = bit_to_coords(bit)
+                if view is not None:
+                    view[row][col] = None
+                if pieces is not None:
+                    pieces[taken_piece[0]].discard((row, col))
+                undo += (bit, taken_piece)
+            self.kings &= ~taken
+        # Un long déplacement de dame sans pièce sautée n'est pas une prise : pas de rafle à suivre
+        is_capture = taken != 0
+
+        # Promotion en dame
+        if not is_king and ((player == "B" and end_bit & ROW_0) or (player == "N" and end_bit & ROW_7)):
+            self.kings |= end_bit
+            is_king = True
+            if view is not None:
+                view[end_row][end_col] = player + "D"
+            self.zobrist_key ^= ZOBRIST_SQUARES[player][end_sq] ^ ZOBRIST_SQUARES[player + "D"][end_sq]
+
+        # Vérifie s'il y a encore une capture possible
+        if is_capture and self._capture_landings(end_bit, player, is_king):
+            self.set_mandatory_jump_piece((end_row, end_col))
+        else:
+            self.set_mandatory_jump_piece(None)
+        return undo
+
+    def unmake_move(self, undo):
+        view, pieces = self._view, self._pieces
+        if view is not None or pieces is not None:
+            player, start, end, piece = undo[7], undo[8], undo[9], undo[10]
+            if view is not None:
+                view[end[0]][end[1]] = None
+                view[start[0]][start[1]] = piece
+            if pieces is not None:
+                pieces[player].discard(end)
+                pieces[player].add(start)
+            for i in range(11, len(undo), 2):
+                row, col = bit_to_coords(undo[i])
+                taken_piece = undo[i + 1]
+                if view is not None:
+                    view[row][col] = taken_piece
+                if pieces is not None:
+                    pieces[taken_piece[0]].add((row, col))
+        (self.black, self.white, self.kings, self.captured_black, self.captured_white,
+         self.mandatory_jump_piece, self.zobrist_key) = undo[:7]
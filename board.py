@@ -1,9 +1,76 @@
+import random
+
+# Clés de Zobrist, tirées avec une graine fixe pour que l'empreinte d'une
+# position soit la même d'une exécution (ou d'un processus) à l'autre.
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST_PIECES = {
+    piece: [[_zobrist_rng.getrandbits(64) for _ in range(8)] for _ in range(8)]
+    for piece in ('B', 'N', 'BD', 'ND')
+}
+ZOBRIST_JUMP = [[_zobrist_rng.getrandbits(64) for _ in range(8)] for _ in range(8)]
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)  # À combiner quand les noirs ont le trait
+
+# Tables de déplacement calculées une fois pour toutes : pour chaque case et
+# chaque direction diagonale, la suite des cases jusqu'au bord (rayon), et pour
+# les pions, les cases voisines vers l'avant et les couples (case sautée, arrivée).
+DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTIONS)}
+FORWARD = {'B': (0, 1), 'N': (2, 3)}  # Directions des pions : les blancs montent, les noirs descendent
+
+
+def _ray(row, col, dx, dy):
+    squares = []
+    r, c = row + dx, col + dy
+    while 0 <= r < 8 and 0 <= c < 8:
+        squares.append((r, c))
+        r += dx
+        c += dy
+    return tuple(squares)
+
+
+RAYS = [[tuple(_ray(row, col, dx, dy) for dx, dy in DIRECTIONS) for col in range(8)] for row in range(8)]
+MAN_STEPS = {
+    man: [[tuple(RAYS[row][col][d][0] for d in FORWARD[man] if RAYS[row][col][d]) for col in range(8)]
+          for row in range(8)]
+    for man in FORWARD
+}
+MAN_JUMPS = {
+    man: [[tuple(RAYS[row][col][d][:2] for d in FORWARD[man] if len(RAYS[row][col][d]) >= 2) for col in range(8)]
+          for row in range(8)]
+    for man in FORWARD
+}
+
+
+def ray_between(start, end):
+    # Cases strictement entre deux cases d'une même diagonale
+    dx = 1 if end[0] > start[0] else -1
+    dy = 1 if end[1] > start[1] else -1
+    return RAYS[start[0]][start[1]][DIRECTION_INDEX[(dx, dy)]][:abs(end[0] - start[0]) - 1]
+
+
 class Board:
     def __init__(self):
         self.board = self.create_board()  # Plateau 8x8
         self.captured_black = 0           # Pions noirs capturés
         self.captured_white = 0           # Pions blancs capturés
         self.mandatory_jump_piece = None  # Pièce obligée de continuer une capture
+        self.zobrist_key = self.compute_zobrist_key()  # Empreinte incrémentale de la position
+        self.index_pieces()
+
+    def index_pieces(self):
+        # Cases occupées et nombre de dames par camp, tenus à jour par make_move/unmake_move
+        self.pieces = {'B': set(), 'N': set()}
+        self.king_counts = {'B': 0, 'N': 0}
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece:
+                    self.pieces[piece[0]].add((row, col))
+                    if 'D' in piece:
+                        self.king_counts[piece[0]] += 1
+
+    def piece_count(self, player):
+        return len(self.pieces[player])
 
     def create_board(self):
         # Création du plateau avec pièces blanches et noires
@@ -18,62 +85,114 @@ class Board:
                     board[row][col] = 'B'  # Pions blancs en bas
         return board
 
-    def has_any_capture(self, player_color):
-        # Vérifie si le joueur a au moins une capture possible
+    def compute_zobrist_key(self):
+        # Calcul complet de l'empreinte (move_piece la met ensuite à jour par XOR)
+        key = 0
         for row in range(8):
             for col in range(8):
                 piece = self.board[row][col]
-                if piece and piece[0] == player_color:
-                    moves = self.get_valid_moves(row, col)
-                    for move_row, move_col in moves:
-                        if abs(move_row - row) == 2 or "D" in piece:
-                            return True
+                if piece:
+                    key ^= ZOBRIST_PIECES[piece][row][col]
+        if self.mandatory_jump_piece:
+            row, col = self.mandatory_jump_piece
+            key ^= ZOBRIST_JUMP[row][col]
+        return key
+
+    def set_mandatory_jump_piece(self, square):
+        if self.mandatory_jump_piece:
+            self.zobrist_key ^= ZOBRIST_JUMP[self.mandatory_jump_piece[0]][self.mandatory_jump_piece[1]]
+        if square:
+            self.zobrist_key ^= ZOBRIST_JUMP[square[0]][square[1]]
+        self.mandatory_jump_piece = square
+
+    def has_any_capture(self, player_color):
+        # Vérifie si le joueur a au moins une capture possible
+        for row, col in sorted(self.pieces[player_color]):
+            piece = self.board[row][col]
+            moves = self.get_valid_moves(row, col)
+            for move_row, move_col in moves:
+                if abs(move_row - row) == 2 or "D" in piece:
+                    return True
         return False
 
     def move_piece(self, start, end):
+        if not self.is_valid_move(start, end):
+            return False, False
+
+        self.make_move(start, end)
+        return True, self.mandatory_jump_piece is not None
+
+    def make_move(self, start, end):
+        """
+        Plays a move already known to be legal, without validating it.
+        Returns:
+            tuple: Undo record to pass to unmake_move (pieces taken, counters,
+            mandatory_jump_piece and hash before the move).
+        """
         start_row, start_col = start
         end_row, end_col = end
         piece = self.board[start_row][start_col]
-
-        if not self.is_valid_move(start, end):
-            return False, False
+        undo = (start, end, piece, self.captured_black, self.captured_white,
+                self.mandatory_jump_piece, self.zobrist_key)
 
         self.board[start_row][start_col] = None
         self.board[end_row][end_col] = piece
+        self.zobrist_key ^= ZOBRIST_PIECES[piece][start_row][start_col] ^ ZOBRIST_PIECES[piece][end_row][end_col]
+        own = self.pieces[piece[0]]
+        own.discard((start_row, start_col))
+        own.add((end_row, end_col))
 
         # Si capture : retirer la pièce adverse sautée
-        is_capture = abs(start_row - end_row) > 1
-        if is_capture:
-            dx = 1 if end_row > start_row else -1
-            dy = 1 if end_col > start_col else -1
-            r, c = start_row + dx, start_col + dy
-            while (r != end_row and c != end_col):
-                if self.board[r][c] and self.board[r][c][0] != piece[0]:
-                    captured_piece = self.board[r][c]
+        if abs(start_row - end_row) > 1:
+            grid = self.board
+            for r, c in ray_between(start, end):
+                captured_piece = grid[r][c]
+                if captured_piece and captured_piece[0] != piece[0]:
                     if captured_piece[0] == 'N':
                         self.captured_black += 1
                     elif captured_piece[0] == 'B':
                         self.captured_white += 1
-                    self.board[r][c] = None
-                r += dx
-                c += dy
+                    grid[r][c] = None
+                    self.zobrist_key ^= ZOBRIST_PIECES[captured_piece][r][c]
+                    self.pieces[captured_piece[0]].discard((r, c))
+                    if 'D' in captured_piece:
+                        self.king_counts[captured_piece[0]] -= 1
+                    undo += (r, c, captured_piece)
+        # Un long déplacement de dame sans pièce sautée n'est pas une prise : pas de rafle à suivre
+        is_capture = len(undo) > 7
 
         # Promotion en dame
         if (end_row == 0 and piece == 'B') or (end_row == 7 and piece == 'N'):
             self.board[end_row][end_col] = piece + 'D'
+            self.zobrist_key ^= ZOBRIST_PIECES[piece][end_row][end_col] ^ ZOBRIST_PIECES[piece + 'D'][end_row][end_col]
+            self.king_counts[piece] += 1
 
         # Vérifie s'il y a encore une capture possible
-        if is_capture:
-            further_captures = self.get_capture_moves(end_row, end_col)
-            if further_captures:
-                self.mandatory_jump_piece = (end_row, end_col)
-                return True, True
-            else:
-                self.mandatory_jump_piece = None
+        if is_capture and self.get_capture_moves(end_row, end_col):
+            self.set_mandatory_jump_piece((end_row, end_col))
         else:
-            self.mandatory_jump_piece = None
-
-        return True, False
+            self.set_mandatory_jump_piece(None)
+
+        return undo
+
+    def unmake_move(self, undo):
+        # Restaure exactement la position d'avant make_move (prises et promotion comprises)
+        (start_row, start_col), (end_row, end_col), piece = undo[0], undo[1], undo[2]
+        if self.board[end_row][end_col] != piece:
+            self.king_counts[piece[0]] -= 1  # Promotion annulée
+        self.board[end_row][end_col] = None
+        self.board[start_row][start_col] = piece
+        own = self.pieces[piece[0]]
+        own.discard((end_row, end_col))
+        own.add((start_row, start_col))
+        for i in range(7, len(undo), 3):
+            captured_piece = undo[i + 2]
+            self.board[undo[i]][undo[i + 1]] = captured_piece
+            self.pieces[captured_piece[0]].add((undo[i], undo[i + 1]))
+            if 'D' in captured_piece:
+                self.king_counts[captured_piece[0]] += 1
+        self.captured_black, self.captured_white = undo[3], undo[4]
+        self.mandatory_jump_piece, self.zobrist_key = undo[5], undo[6]
 
     def is_valid_move(self, start, end):
         x1, y1 = start
@@ -97,147 +216,150 @@ class Board:
         if 'D' in piece:
             if dx != dy:
                 return False
-            step_x = 1 if x2 > x1 else -1
-            step_y = 1 if y2 > y1 else -1
             enemy_found = False
-            r, c = x1 + step_x, y1 + step_y
-            while r != x2 and c != y2:
-                if self.board[r][c]:
-                    if self.board[r][c][0] == piece[0]:
-                        return False
-                    elif not enemy_found:
-                        enemy_found = True
-                    else:
+            for r, c in ray_between(start, end):
+                target = self.board[r][c]
+                if target:
+                    if target[0] == piece[0] or enemy_found:
                         return False
-                r += step_x
-                c += step_y
+                    enemy_found = True
             return True
 
         else:
             # Déplacement simple
-            if dx == dy == 1:
-                if (piece.startswith('B') and x2 < x1) or (piece.startswith('N') and x2 > x1):
-                    return True
+            if (x2, y2) in MAN_STEPS[piece][x1][y1]:
+                return True
             # Capture diagonale
-            if dx == dy == 2:
-                mid_row, mid_col = (x1 + x2) // 2, (y1 + y2) // 2
-                mid_piece = self.board[mid_row][mid_col]
-                if mid_piece and mid_piece[0] != piece[0]:
-                    if piece.startswith('B') and x2 < x1:
-                        return True
-                    if piece.startswith('N') and x2 > x1:
-                        return True
+            for (mid_row, mid_col), landing in MAN_JUMPS[piece][x1][y1]:
+                if landing == (x2, y2):
+                    mid_piece = self.board[mid_row][mid_col]
+                    return bool(mid_piece) and mid_piece[0] != piece[0]
             return False
 
     def is_capture_move(self, start, end):
-        return abs(start[0] - end[0]) > 1 and abs(start[1] - end[1]) > 1
+        # Une pièce adverse entre les deux cases (une dame peut aussi glisser de plusieurs cases sans prendre)
+        if abs(start[0] - end[0]) < 2 or abs(start[0] - end[0]) != abs(start[1] - end[1]):
+            return False
+        piece = self.board[start[0]][start[1]]
+        return any(self.board[r][c] and piece and self.board[r][c][0] != piece[0]
+                   for r, c in ray_between(start, end))
 
     def get_capture_moves(self, row, col):
         piece = self.board[row][col]
         if not piece:
             return []
 
+        grid = self.board
+        color = piece[0]
         captures = []
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
 
         if 'D' in piece:
-            for dx, dy in directions:
-                r, c = row + dx, col + dy
-                while 0 <= r < 8 and 0 <= c < 8:
-                    if self.board[r][c] and self.board[r][c][0] != piece[0]:
-                        after_r, after_c = r + dx, c + dy
-                        if 0 <= after_r < 8 and 0 <= after_c < 8 and self.board[after_r][after_c] is None:
-                            captures.append((after_r, after_c))
-                        break
-                    elif self.board[r][c]:
+            for ray in RAYS[row][col]:
+                for i, (r, c) in enumerate(ray):
+                    target = grid[r][c]
+                    if target:
+                        if target[0] != color and i + 1 < len(ray):
+                            after_r, after_c = ray[i + 1]
+                            if grid[after_r][after_c] is None:
+                                captures.append((after_r, after_c))
                         break
-                    r += dx
-                    c += dy
         else:
-            for dx, dy in directions:
-                enemy_r, enemy_c = row + dx, col + dy
-                land_r, land_c = row + 2 * dx, col + 2 * dy
-                if 0 <= enemy_r < 8 and 0 <= enemy_c < 8 and 0 <= land_r < 8 and 0 <= land_c < 8:
-                    target = self.board[enemy_r][enemy_c]
-                    if target and target[0] != piece[0] and self.board[land_r][land_c] is None:
-                        if piece == 'B' and dx == -1:
-                            captures.append((land_r, land_c))
-                        elif piece == 'N' and dx == 1:
-                            captures.append((land_r, land_c))
+            for (enemy_r, enemy_c), (land_r, land_c) in MAN_JUMPS[piece][row][col]:
+                target = grid[enemy_r][enemy_c]
+                if target and target[0] != color and grid[land_r][land_c] is None:
+                    captures.append((land_r, land_c))
 
         return captures
 
     def has_capture(self, player):
         # Y a-t-il une capture disponible pour ce joueur ?
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece[0] == player:
-                    if self.get_capture_moves(row, col):
-                        return True
+        for row, col in self.pieces[player]:
+            if self.get_capture_moves(row, col):
+                return True
         return False
 
     def has_valid_moves(self, player):
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece[0] == player:
-                    if self.get_valid_moves(row, col):
-                        return True
-        return False
+        return bool(self.generate_legal_moves(player))
 
     def get_valid_moves(self, row, col):
         piece = self.board[row][col]
         if not piece:
             return []
+        return [end for start, end in self.generate_legal_moves(piece[0]) if start == (row, col)]
 
-        player = piece[0]
-
-        if self.mandatory_jump_piece and (row, col) != self.mandatory_jump_piece:
-            return []
-
-        capture_moves = self.get_capture_moves(row, col)
-        if capture_moves:
-            return capture_moves
-
+    def get_slide_moves(self, row, col):
+        # Déplacements sans prise (la prise obligatoire est gérée par l'appelant)
+        piece = self.board[row][col]
+        grid = self.board
         moves = []
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
 
         if 'D' in piece:
-            for dx, dy in directions:
-                for dist in range(1, 8):
-                    new_row = row + dx * dist
-                    new_col = col + dy * dist
-                    if 0 <= new_row < 8 and 0 <= new_col < 8:
-                        if self.board[new_row][new_col] is None:
-                            if not self.has_capture(player):
-                                moves.append((new_row, new_col))
-                        else:
-                            break
-                    else:
+            for ray in RAYS[row][col]:
+                for r, c in ray:
+                    if grid[r][c] is not None:
                         break
+                    moves.append((r, c))
         else:
-            if piece == 'B':
-                directions = [(-1, -1), (-1, 1)]
-            elif piece == 'N':
-                directions = [(1, -1), (1, 1)]
-
-            for dx, dy in directions:
-                new_row = row + dx
-                new_col = col + dy
-                if 0 <= new_row < 8 and 0 <= new_col < 8:
-                    if self.board[new_row][new_col] is None:
-                        if not self.has_capture(player):
-                            moves.append((new_row, new_col))
-
-                # Vérifie aussi les captures
-                new_row = row + 2 * dx
-                new_col = col + 2 * dy
-                if 0 <= new_row < 8 and 0 <= new_col < 8:
-                    mid_row = row + dx
-                    mid_col = col + dy
-                    mid_piece = self.board[mid_row][mid_col]
-                    if mid_piece and mid_piece[0] != player and self.board[new_row][new_col] is None:
-                        moves.append((new_row, new_col))
+            for r, c in MAN_STEPS[piece][row][col]:
+                if grid[r][c] is None:
+                    moves.append((r, c))
+
+        return moves
 
+    def generate_legal_moves(self, player, sequences=False):
+        """
+        Returns every legal move for `player` in a single pass over the board.
+        The forced-capture status is computed once for the whole side instead
+        of once per target square.
+        Args:
+            player (str): 'B' or 'N'.
+            sequences (bool): If True, captures are expanded into full multi-jump
+                sequences and each move is a tuple of squares (start, ..., end).
+        Returns:
+            list: (start, end) tuples, or square sequences when `sequences` is True.
+        """
+        if self.mandatory_jump_piece:
+            row, col = self.mandatory_jump_piece
+            piece = self.board[row][col]
+            if not piece or piece[0] != player:
+                return []
+            moves = [((row, col), end) for end in self.get_capture_moves(row, col)]
+            return self.expand_sequences(moves) if sequences else moves
+
+        # Pièces vivantes du camp, dans l'ordre du plateau (ordre des coups inchangé)
+        pieces = sorted(self.pieces[player])
+        captures = []
+        for row, col in pieces:
+            captures.extend(((row, col), end) for end in self.get_capture_moves(row, col))
+
+        if captures:
+            return self.expand_sequences(captures) if sequences else captures
+
+        moves = []
+        for row, col in pieces:
+            moves.extend(((row, col), end) for end in self.get_slide_moves(row, col))
         return moves
+
+    def expand_sequences(self, captures):
+        # Déroule chaque prise jusqu'au bout de la rafle (prises multiples)
+        sequences = []
+        for start, end in captures:
+            undo = self.make_move(start, end)
+            if self.mandatory_jump_piece:
+                for tail in self.generate_legal_moves(self.board[end[0]][end[1]][0], sequences=True):
+                    sequences.append((start,) + tail)
+            else:
+                sequences.append((start, end))
+            self.unmake_move(undo)
+        return sequences
+
+    def copy(self):
+        clone = Board.__new__(Board)
+        clone.board = [row[:] for row in self.board]
+        clone.captured_black = self.captured_black
+        clone.captured_white = self.captured_white
+        clone.mandatory_jump_piece = self.mandatory_jump_piece
+        clone.zobrist_key = self.zobrist_key
+        clone.pieces = {'B': set(self.pieces['B']), 'N': set(self.pieces['N'])}
+        clone.king_counts = dict(self.king_counts)
+        return clone
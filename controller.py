@@ -0,0 +1,185 @@
+import history
+from board import Board, ZOBRIST_SIDE
+
+# Règles de nulle, pour borner la longueur d'une partie
+REPETITION_LIMIT = 3     # Même position (trait compris) rencontrée 3 fois
+QUIET_PLY_LIMIT = 80     # Demi-coups de suite sans prise ni déplacement de pion
+MAX_PLIES = 400          # Nombre maximal de demi-coups par partie
+
+
+def opponent(player):
+    return "B" if player == "N" else "N"
+
+
+class GameController:
+    """
+    GUI-free game logic: turn management, end detection and history recording.
+    Front-ends (game.Game, iaversus.IAVersus) and headless code (selfplay,
+    benchmarks) drive the same controller. Listeners are optional observers;
+    each may implement any of:
+        on_move(player, start, end, captured_piece, multiple_capture)
+        on_turn(player)
+        on_game_over(winner)
+    so a GUI only redraws when one is actually attached.
+    """
+
+    def __init__(self, board=None, first_player="B", repetition_limit=REPETITION_LIMIT,
+                 quiet_ply_limit=QUIET_PLY_LIMIT, max_plies=MAX_PLIES):
+        self.board = board if board is not None else Board()
+        self.current_player = first_player
+        self.moves = []            # (joueur, départ, arrivée, pièce capturée)
+        self.game_over = False
+        self.winner = None         # Valeur de la ligne "Résultat" (history.WINNER_*)
+        self.draw_reason = None    # Règle qui a déclaré la nulle
+        self.resigned = None       # Camp qui a abandonné
+        self.listeners = []
+
+        # 0 ou None désactive la règle correspondante
+        self.repetition_limit = repetition_limit
+        self.quiet_ply_limit = quiet_ply_limit
+        self.max_plies = max_plies
+        self.quiet_plies = 0       # Demi-coups depuis la dernière prise ou le dernier coup de pion
+        self.positions = {}        # Empreinte (trait compris) -> nombre d'apparitions
+        self.record_position()
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notify(self, event, *args):
+        for listener in self.listeners:
+            handler = getattr(listener, event, None)
+            if handler:
+                handler(*args)
+
+    def record_position(self):
+        # Nombre de fois que la position, trait compris, a été rencontrée
+        key = self.board.zobrist_key ^ (ZOBRIST_SIDE if self.current_player == "N" else 0)
+        self.positions[key] = self.positions.get(key, 0) + 1
+        return self.positions[key]
+
+    def check_draw(self):
+        """
+        Applies the draw rules once the turn has passed to the other side.
+        Returns:
+            str or None: Why the game is drawn, None if it goes on.
+        """
+        seen = self.record_position()
+        if self.repetition_limit and seen >= self.repetition_limit:
+            return f"position répétée {seen} fois"
+        if self.quiet_ply_limit and self.quiet_plies >= self.quiet_ply_limit:
+            return f"{self.quiet_plies} demi-coups sans prise ni coup de pion"
+        if self.max_plies and len(self.moves) >= self.max_plies:
+            return f"limite de {self.max_plies} demi-coups"
+        return None
+
+    def captured_piece(self, start, end):
+        # Pièce adverse sur le chemin du coup (lue avant de jouer le coup)
+        piece = self.board.board[start[0]][start[1]]
+        dx = 1 if end[0] > start[0] else -1
+        dy = 1 if end[1] > start[1] else -1
+        r, c = start[0] + dx, start[1] + dy
+        while (r, c) != tuple(end) and 0 <= r < 8 and 0 <= c < 8:
+            target = self.board.board[r][c]
+            if target and piece and target[0] != piece[0]:
+                return target
+            r += dx
+            c += dy
+        return None
+
+    def play_move(self, start, end):
+        """
+        Plays a move for the side to move, then hands the turn over and checks
+        for the end of the game.
+        Returns:
+            tuple: (success, multiple_capture), like Board.move_piece.
+        """
+        if self.game_over:
+            return False, False
+
+        player = self.current_player
+        piece = self.board.board[start[0]][start[1]]
+        if not piece or piece[0] != player:
+            return False, False
+
+        captured_piece = self.captured_piece(start, end) if abs(start[0] - end[0]) > 1 else None
+        success, multiple_capture = self.board.move_piece(start, end)
+        if not success:
+            return False, False
+
+        self.moves.append((player, start, end, captured_piece))
+        if captured_piece or 'D' not in piece:
+            # Coup irréversible : aucune position antérieure ne peut se répéter
+            self.quiet_plies = 0
+            self.positions.clear()
+        else:
+            self.quiet_plies += 1
+        self.notify("on_move", player, start, end, captured_piece, multiple_capture)
+
+        if not multiple_capture:
+            self.current_player = opponent(player)
+            # Camp sans pièce : simple compteur ; sinon il reste à vérifier qu'il n'est pas bloqué
+            if not (self.board.piece_count(self.current_player) and self.board.has_valid_moves(self.current_player)):
+                self.finish(history.winner_label(player))
+                return True, multiple_capture
+            reason = self.check_draw()
+            if reason:
+                self.draw_reason = reason
+                self.finish(history.WINNER_DRAW)
+            else:
+                self.notify("on_turn", self.current_player)
+        return True, multiple_capture
+
+    def play_ai_move(self, ai):
+        """
+        Asks `ai` for a move for the side to move and plays it.
+        Returns:
+            tuple or None: The move played, None if the side could not move
+            (the game is then over).
+        """
+        if self.game_over:
+            return None
+        return self.apply_ai_move(ai.get_best_move(self.board, player=self.current_player))
+
+    def apply_ai_move(self, move):
+        """
+        Plays a move computed for the side to move (possibly in another
+        thread, see ai_worker); None means that side could not move.
+        An illegal move raises ValueError and leaves the game unchanged.
+        Returns:
+            tuple or None: The move played, None if the game is over.
+        """
+        if self.game_over:
+            return None
+        if move is None:
+            self.finish(history.winner_label(opponent(self.current_player)))
+            return None
+        success, _ = self.play_move(*move)
+        if not success:
+            # Coup refusé : ni changement de trait ni nouvelle demande à l'IA, qui rejouerait le même coup
+            raise ValueError(f"Coup illégal de l'IA : {move[0]} -> {move[1]}")
+        return move
+
+    def resign(self, player):
+        if self.game_over:
+            return
+        self.resigned = player
+        self.finish(history.winner_label(opponent(player)))
+
+    def finish(self, winner):
+        if self.game_over:
+            return
+        self.game_over = True
+        self.winner = winner
+        self.notify("on_game_over", winner)
+
+    def save(self, csv_path=history.HISTORY_FILE):
+        """
+        Appends the game to the history file.
+        Returns:
+            int: The id given to the game.
+        """
+        return history.append_games([(self.moves, self.winner)], csv_path)[0]
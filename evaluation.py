@@ -0,0 +1,207 @@
+import json
+import os
+
+import numpy as np
+
+from board import DIRECTIONS
+
+# Évaluation vectorisée : chaque position est codée en un vecteur de 32 cases
+# (cases noires, ligne * 4 + colonne // 2), puis traduite en caractéristiques
+# du point de vue du camp qui évalue. Le score est le produit de ces
+# caractéristiques par un vecteur de poids : un lot de positions (les coups
+# candidats, les feuilles de la recherche) s'évalue en un seul appel et les
+# poids sont des données, réglables sans toucher au code.
+#
+# Vue du camp noir : plateau tourné d'un demi-tour (case s -> 31 - s) et
+# couleurs échangées. Dans ce repère, les pions du camp qui évalue montent
+# toujours vers la ligne 0, comme les pions blancs.
+
+WEIGHTS_FILE = "data/eval_weights.json"    # Poids réglés par tuner.py, chargés par CheckersAI
+WEIGHTS_VERSION = 1
+
+SQUARES = [(row, col) for row in range(8) for col in range(8) if (row + col) % 2 == 1]
+SQUARE_INDEX = {square: i for i, square in enumerate(SQUARES)}
+
+PIECE_CODES = {None: 0, "B": 1, "BD": 2, "N": 3, "ND": 4}
+EMPTY, OWN_MAN, OWN_KING, OPP_MAN, OPP_KING = range(5)
+SWAP_COLORS = np.array([EMPTY, OPP_MAN, OPP_KING, OWN_MAN, OWN_KING], dtype=np.int8)
+
+# Case voisine dans chaque direction de board.DIRECTIONS (32 = hors plateau)
+NEIGHBORS = np.array([[SQUARE_INDEX.get((row + dx, col + dy), 32) for row, col in SQUARES]
+                      for dx, dy in DIRECTIONS])
+# Case voisine dans la direction opposée
+BEYOND = NEIGHBORS[[DIRECTIONS.index((-dx, -dy)) for dx, dy in DIRECTIONS]]
+# Directions où avancent les pions du camp qui évalue (vers la ligne 0) et ceux de l'adversaire
+FORWARD = np.array([[dx < 0] for dx, _ in DIRECTIONS])
+BACKWARD = ~FORWARD
+
+# Caractéristiques (différence camp qui évalue - adversaire) et taille de leur table de poids
+FEATURES = (
+    ("material_man", 1),      # Nombre de pions
+    ("material_king", 1),     # Nombre de dames
+    ("man_squares", 32),      # Pions par case, chacun vu depuis son camp
+    ("king_squares", 32),     # Dames par case
+    ("mobility", 1),          # Déplacements simples possibles
+    ("exposed_man", 1),       # Pions prenables au coup suivant par une pièce voisine
+    ("exposed_king", 1),      # Dames prenables au coup suivant par une pièce voisine
+)
+FEATURE_SLICES = {}
+_offset = 0
+for _name, _size in FEATURES:
+    FEATURE_SLICES[_name] = slice(_offset, _offset + _size)
+    _offset += _size
+N_FEATURES = _offset
+
+
+def square_table(center, edge):
+    # Bonus des cases centrales (lignes et colonnes 2 à 5), malus des bords gauche et droit
+    return np.array([center if 2 <= row <= 5 and 2 <= col <= 5 else edge if col in (0, 7) else 0
+                     for row, col in SQUARES], dtype=np.float64)
+
+
+def make_weights(**tables):
+    """
+    Builds a weight vector from named tables (see FEATURES); missing tables are zero.
+    Returns:
+        numpy.ndarray: float64 vector of N_FEATURES weights.
+    """
+    weights = np.zeros(N_FEATURES, dtype=np.float64)
+    for name, values in tables.items():
+        weights[FEATURE_SLICES[name]] = values
+    return weights
+
+
+# Poids par défaut, à l'échelle de l'ancien score des coups : une prise vaut 10,
+# une promotion 5 (dame - pion), une case centrale 2 et un bord -1
+DEFAULT_WEIGHTS = make_weights(
+    material_man=10, material_king=15,
+    man_squares=square_table(2, -1), king_squares=square_table(2, -1),
+    mobility=0.5, exposed_man=-5, exposed_king=-7.5,
+)
+
+
+def save_weights(weights, path=WEIGHTS_FILE, **info):
+    """
+    Writes a weight vector as JSON, one list per feature table.
+    Args:
+        info: Extra fields stored alongside (tuning scale, number of positions...).
+    """
+    data = {"version": WEIGHTS_VERSION, **info,
+            "weights": {name: np.asarray(weights[FEATURE_SLICES[name]]).tolist() for name, _ in FEATURES}}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def load_weights(path=WEIGHTS_FILE):
+    """
+    Reads a weight vector written by save_weights.
+    Returns:
+        numpy.ndarray or None: None if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != WEIGHTS_VERSION:
+        raise ValueError(f"Version de poids inconnue : {path}")
+    tables = data["weights"]
+    # Toutes les tables doivent être présentes et de la bonne taille
+    for name, size in FEATURES:
+        if len(np.atleast_1d(tables[name])) != size:
+            raise ValueError(f"Table de poids {name} invalide : {path}")
+    return make_weights(**{name: tables[name] for name, _ in FEATURES})
+
+
+def board_codes(grid):
+    # Cases noires : colonnes impaires sur les lignes paires, paires sur les lignes impaires
+    return [PIECE_CODES[piece] for row, line in enumerate(grid) for piece in line[1 - row % 2::2]]
+
+
+def encode_board(board):
+    # Code de la pièce de chaque case noire (voir PIECE_CODES)
+    return np.array(board_codes(board.board), dtype=np.int8)
+
+
+def encode_moves(board, moves):
+    """
+    Encodes the position reached by each move (played then undone in place).
+    Returns:
+        numpy.ndarray: int8 array of shape (len(moves), 32).
+    """
+    rows = []
+    for start, end in moves:
+        undo = board.make_move(start, end)
+        rows.append(board_codes(board.board))
+        board.unmake_move(undo)
+    return np.array(rows, dtype=np.int8).reshape(len(moves), 32)
+
+
+def position_features(codes, black):
+    """
+    Computes the feature matrix of a batch of positions.
+    Args:
+        codes: int8 array (n, 32) from encode_board / encode_moves.
+        black: bool (scalar or array (n,)), True when black evaluates the position.
+    Returns:
+        numpy.ndarray: float64 array (n, N_FEATURES), own side minus opponent.
+    """
+    codes = np.asarray(codes, dtype=np.int8).reshape(-1, 32)
+    black = np.asarray(black, dtype=bool)
+    if black.ndim == 0:
+        oriented = SWAP_COLORS[codes[:, ::-1]] if black else codes
+    else:
+        oriented = np.where(black[:, None], SWAP_COLORS[codes[:, ::-1]], codes)
+    # Case 32 (hors plateau) ni vide ni occupée
+    padded = np.concatenate([oriented, np.full((len(codes), 1), -1, dtype=np.int8)], axis=1)
+    neighbor = padded[:, NEIGHBORS]             # (n, 4, 32) : case voisine dans chaque direction
+    beyond_empty = padded[:, BEYOND] == EMPTY   # Case opposée libre : une prise y atterrirait
+    pieces = oriented[:, None, :]
+
+    # Déplacements simples : pions vers l'avant seulement, dames dans les 4 directions
+    free = neighbor == EMPTY
+    own_moves = ((pieces == OWN_KING) | ((pieces == OWN_MAN) & FORWARD)) & free
+    opp_moves = ((pieces == OPP_KING) | ((pieces == OPP_MAN) & BACKWARD)) & free
+    # Pièce prenable : un voisin adverse peut sauter par-dessus vers la case opposée
+    # (un pion adverse n'attaque que depuis l'avant de la pièce, en descendant)
+    own_threat = (((neighbor == OPP_KING) | ((neighbor == OPP_MAN) & FORWARD)) & beyond_empty).any(axis=1)
+    opp_threat = (((neighbor == OWN_KING) | ((neighbor == OWN_MAN) & BACKWARD)) & beyond_empty).any(axis=1)
+
+    own_man, own_king = oriented == OWN_MAN, oriented == OWN_KING
+    opp_man, opp_king = oriented == OPP_MAN, oriented == OPP_KING
+    # Chaque pièce adverse compte sur sa case vue depuis son camp (s -> 31 - s)
+    man_squares = own_man.astype(np.int8) - opp_man[:, ::-1]
+    king_squares = own_king.astype(np.int8) - opp_king[:, ::-1]
+    return np.column_stack([
+        man_squares.sum(axis=1),
+        king_squares.sum(axis=1),
+        man_squares,
+        king_squares,
+        own_moves.sum(axis=(1, 2)) - opp_moves.sum(axis=(1, 2)),
+        (own_man & own_threat).sum(axis=1) - (opp_man & opp_threat).sum(axis=1),
+        (own_king & own_threat).sum(axis=1) - (opp_king & opp_threat).sum(axis=1),
+    ]).astype(np.float64)
+
+
+def evaluate_positions(codes, black, weights=DEFAULT_WEIGHTS):
+    """
+    Scores a batch of positions in one vectorised call.
+    Returns:
+        numpy.ndarray: float64 scores (n,), from the point of view given by `black`.
+    """
+    return position_features(codes, black) @ weights
+
+
+def evaluate_moves(board, player, moves, weights=DEFAULT_WEIGHTS):
+    """
+    Scores every candidate move by the position it leads to, for the side playing it.
+    Returns:
+        numpy.ndarray: float64 scores, in the order of `moves`.
+    """
+    if not moves:
+        return np.zeros(0, dtype=np.float64)
+    return evaluate_positions(encode_moves(board, moves), player == "N", weights)
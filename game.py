@@ -1,26 +1,55 @@
-import pandas as pd
 import random
 import os
+import history
 from board import Board
+from controller import GameController
 from gui import GUI
-from ia import CheckersAI
+from ai_worker import AIWorker
+from ia import CheckersAI, MODE_HISTORY, MODE_SEARCH
 from stats import GameStats
 from datetime import datetime
 
 class Game:
-    def __init__(self, root, restart_callback=None):
-        self.board = Board()
-        self.gui = GUI(root, self, restart_callback=restart_callback)
-
-        self.ai = CheckersAI()
-        self.current_player = "B" 
+    def __init__(self, root, restart_callback=None, board_class=Board, ai_mode=MODE_HISTORY):
+        # Logique de jeu sans interface ; cette classe ne fait que l'afficher
+        self.controller = GameController(board_class())  # Board ou bitboard.BitBoard (même API)
+        self.ai = CheckersAI(mode=ai_mode)
+        self.human_player = "B"
+        self.player_labels = {"B": "Le joueur", "N": "L'IA"}
+        self.win_messages = {
+            history.WINNER_BLACK: "Partie terminée! L'IA a gagné!",
+            history.WINNER_WHITE: "Partie terminée! Vous avez gagné!",
+            history.WINNER_DRAW: "Partie terminée! Match nul",
+        }
         self.selected_piece = None
-        self.moves_history = []
         self.stats = GameStats()
-        self.game_over = False
+
+        self.gui = GUI(root, self, restart_callback=restart_callback)
+        self.ai_worker = AIWorker(root, self.ai)  # Calcul des coups hors du thread Tk
+        self.controller.add_listener(self)
 
         self.setup_new_game()
-        
+
+    @property
+    def board(self):
+        return self.controller.board
+
+    @property
+    def current_player(self):
+        return self.controller.current_player
+
+    @current_player.setter
+    def current_player(self, player):
+        self.controller.current_player = player
+
+    @property
+    def game_over(self):
+        return self.controller.game_over
+
+    @property
+    def moves_history(self):
+        return [(start, end) for _, start, end, _ in self.controller.moves]
+
     def setup_new_game(self):
         self.update_status_message(f"À votre tour de jouer (blanc)")
         
@@ -30,58 +59,73 @@ class Game:
             
     def get_ai_move(self):
         return self.ai.get_best_move(self.board)
-    
+
+    # --- Écoute du contrôleur : seul endroit où l'interface est redessinée --
+
+    def on_move(self, player, start, end, captured_piece, multiple_capture):
+        print(f"{self.player_labels[player]} joue : {start} -> {end}")
+        self.gui.append_history(f"{self.player_labels[player]} joue : {start} -> {end}")
+        self.stats.record_move(player, f"{start}->{end}")
+        self.gui.draw_board()
+        self.gui.update_capture_count(self.board.captured_black, self.board.captured_white)
+
+    def on_turn(self, player):
+        if player == self.human_player:
+            self.update_status_message("À votre tour de jouer (blanc)")
+
+    def on_game_over(self, winner):
+        self.end_game()
+
     def ai_turn(self):
-        if self.current_player != "N":  
+        if self.current_player != "N" or self.game_over or self.ai_worker.thinking:
             return
 
         self.update_status_message("L'IA réfléchit...")
-        self.gui.root.update()  
-        best_move = self.ai.get_best_move(self.board)
-        if best_move is None:
-            self.game_over = True
-            self.update_status_message("Partie terminée! Vous avez gagné!")
-            self.end_game() 
-            return
-
-        start, end = best_move
-        print(f"L'IA joue : {start} -> {end}")
-        self.gui.append_history(f"L'IA joue : {start} -> {end}")
+        self.ai_worker.request_move(self.board, "N", self.on_ai_move, progress=self.show_thinking,
+                                    on_error=self.on_ai_error)
 
+    def on_ai_move(self, move):
+        try:
+            move = self.controller.apply_ai_move(move)
+        except ValueError as e:
+            self.on_ai_error(e)
+            return
 
-        success, multiple_capture = self.move_piece(start, end)
+        # Prise multiple : l'IA continue avec la même pièce
+        if move is not None and not self.game_over and self.current_player == "N":
+            self.ai_turn()
 
-        self.moves_history.append((start, end))
-        self.stats.record_move("N", f"{start}->{end}")
+    def on_ai_error(self, error):
+        # Panne de l'IA : la partie reste en cours, sans vainqueur ni sauvegarde
+        print(f"❌ Erreur de l'IA : {error}")
+        self.update_status_message("Erreur de l'IA : partie interrompue.")
+        self.gui.show_error("Erreur de l'IA", f"L'IA n'a pas pu calculer son coup :\n{error}")
 
-        self.gui.draw_board()
-        self.gui.update_capture_count(self.board.captured_black, self.board.captured_white)
+    def show_thinking(self, elapsed):
+        # Indicateur de réflexion : points animés, profondeur atteinte en mode alphabeta
+        message = f"{self.player_labels[self.current_player]} réfléchit" + "." * (int(elapsed * 3) % 4)
+        if self.ai.mode == MODE_SEARCH and self.ai.search.last_depth:
+            message += f"  (profondeur {self.ai.search.last_depth})"
+        self.update_status_message(message)
 
-        if multiple_capture:
-            self.ai_turn()  
-        else:
-            if self.board.has_valid_moves("B"):
-                self.current_player = "B"
-                self.update_status_message("À votre tour de jouer (blanc)")
-            else:
-                self.game_over = True
-                self.update_status_message("Partie terminée! L'IA a gagné!")
-                self.end_game()
+    def stop(self):
+        # Nouvelle partie, abandon ou fermeture : le calcul en cours est abandonné
+        self.ai_worker.cancel()
 
     def move_piece(self, start, end):
         try:
-            success, multiple_capture = self.board.move_piece(start, end)
-
-            if success:
-                if not multiple_capture:
-                    self.current_player = "B" if self.current_player == "N" else "N"
-                return success, multiple_capture
-
-            return False, False
+            return self.controller.play_move(start, end)
         except Exception as e:
             self.update_status_message(f"Erreur lors du déplacement : {e}")
             return False, False
 
+    def resign(self):
+        # Seul un camp joué à la souris peut abandonner (pas en IA vs IA)
+        if self.human_player is None:
+            return
+        self.stop()
+        self.controller.resign(self.human_player)
+
     def select_piece(self, row, col):
         piece = self.board.board[row][col]
         if piece and piece[0] == self.current_player:
@@ -94,7 +138,7 @@ class Game:
         if self.game_over:
             return
 
-        if self.current_player != "B": 
+        if self.current_player != self.human_player:
             self.update_status_message("Ce n'est pas votre tour!")
             return
 
@@ -113,15 +157,9 @@ class Game:
             success, multiple_capture = self.move_piece(self.selected_piece, (row, col))
 
             if success:
-                self.moves_history.append((self.selected_piece, (row, col)))
-                self.stats.record_move("B", f"{self.selected_piece}->{(row, col)}")
-                print(f"Le joueur joue : {self.selected_piece} -> {(row, col)}")
-                self.gui.append_history(f"Le joueur joue : {self.selected_piece} -> {(row, col)}")
-
-                self.gui.draw_board()
-                self.gui.update_capture_count(self.board.captured_black, self.board.captured_white)
-
-                if multiple_capture:
+                if self.game_over:
+                    self.selected_piece = None
+                elif multiple_capture:
                     self.selected_piece = (row, col)
 
                     # Vérifie s'il reste des captures à faire depuis la nouvelle position
@@ -162,84 +200,30 @@ class Game:
             self.update_status_message("Clique sur un rond vert")
 
     def end_game(self):
-        if not self.game_over:
-            self.game_over = True
-            
-        if not self.board.has_valid_moves("N"):
-            self.update_status_message("Partie terminée! Vous avez gagné!")
-        elif not self.board.has_valid_moves("B"):
-            self.update_status_message("Partie terminée! L'IA a gagné!")
-        else:
-            self.update_status_message("Partie terminée!")
+        message = self.win_messages.get(self.controller.winner, "Partie terminée!")
+        if self.controller.resigned is not None:
+            message = "Vous avez abandonné. L'IA gagne!"
+        elif self.controller.draw_reason:
+            message += f" ({self.controller.draw_reason})"
+        self.update_status_message(message)
         print("Partie terminée!")
         print("Sauvegarde de la partie.")
         self.save_game_to_csv()
-            
 
     def save_game_to_csv(self):
-        game_data = []
-
-        os.makedirs("data", exist_ok=True)
-        csv_path = "data/game_history.csv"
-
-        game_id = 1
-        if os.path.exists(csv_path):
-            try:
-                with open(csv_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                    game_id = sum(1 for line in lines if line.strip().startswith("---debut-partie")) + 1
-            except Exception as e:
-                print(f"Erreur lors de la lecture brute du fichier : {e}")
-
-        game_data.append({
-            "Turn": f"---debut-partie{game_id}---",
-            "Player": "", "Start": "", "End": "", "Captured Piece": ""
-        })
-
-        for i, move in enumerate(self.moves_history):
-            start, end = move
-            player = "B" if i % 2 == 0 else "N"
-            captured_piece = None
-
-            if abs(start[0] - end[0]) > 1:
-                mid_row = (start[0] + end[0]) // 2
-                mid_col = (start[1] + end[1]) // 2
-                captured_piece = self.board.board[mid_row][mid_col]
-
-            game_data.append({
-                "Turn": i + 1,
-                "Player": player,
-                "Start": str(start),
-                "End": str(end),
-                "Captured Piece": str(captured_piece)
-            })
-
-        winner = "IA" if not self.board.has_valid_moves("B") else "Joueur"
-
-        game_data.append({
-            "Turn": "Résultat",
-            "Player": "",
-            "Start": "",
-            "End": "",
-            "Captured Piece": winner
-        })
-
-        game_data.append({
-            "Turn": f"---fin-partie{game_id}---",
-            "Player": "", "Start": "", "End": "", "Captured Piece": ""
-        })
-
-        df = pd.DataFrame(game_data)
+        csv_path = history.HISTORY_FILE
+        moves = self.controller.moves
+        winner = self.controller.winner
+
+        # L'IA profite tout de suite de la partie, sans relire le CSV
+        self.ai.record_game([(player, start, end) for player, start, end, _ in moves], winner)
 
         try:
-            if os.path.exists(csv_path):
-                df.to_csv(csv_path, mode='a', header=False, index=False)
-                print(f"Données ajoutées (partie {game_id}).")
-            else:
-                df.to_csv(csv_path, index=False)
+            new_file = not os.path.exists(csv_path)
+            game_id = self.controller.save(csv_path)
+            if new_file:
                 print(f"Nouveau fichier créé (partie {game_id}).")
+            else:
+                print(f"Données ajoutées (partie {game_id}).")
         except Exception as e:
             print(f"Erreur lors de la sauvegarde du CSV : {e}")
-
-
-            
\ No newline at end of file
@@ -0,0 +1,188 @@
+import mmap
+import os
+import re
+import struct
+import time
+
+import numpy as np
+
+import history
+import history_reader
+from binary_history import WINNER_CODES, WINNER_LABELS
+
+# Index des parties de l'historique (fichier .idx à côté du CSV) : pour chaque
+# partie, sa position et sa taille en octets dans le CSV et un résumé
+# (vainqueur, nombre de coups, date). Le sélecteur de relecture liste les
+# parties depuis l'index seul et ne lit du CSV que la partie choisie.
+#
+#   En-tête (24 octets) : magie "DAMI", version, nombre de parties, taille du CSV déjà indexée
+#   Entrées (28 octets) : numéro de partie, position, taille, coups, vainqueur, date (timestamp, 0 = inconnue)
+
+MAGIC = b"DAMI"
+VERSION = 1
+HEADER = struct.Struct("<4sB3xIQ4x")
+HEADER_SIZE = HEADER.size
+
+ENTRY_DTYPE = np.dtype([("game_id", "<u4"), ("offset", "<u8"), ("length", "<u4"), ("plies", "<u2"),
+                        ("winner", "u1"), ("pad", "u1"), ("date", "<f8")])
+
+GAME_START = re.compile(rb"^---debut-partie(\d*)---[^\n]*", re.MULTILINE)
+GAME_END = re.compile(rb"^---fin-partie[^\n]*(?:\n|$)", re.MULTILINE)
+RESULT = re.compile("^Résultat,[^\n]*?([^,\r\n]*)\r?$".encode("utf-8"), re.MULTILINE)
+
+
+def index_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".idx"
+
+
+def parse_date(field):
+    if not field.strip():
+        return 0.0
+    try:
+        return time.mktime(time.strptime(field.decode("utf-8").strip(), history.DATE_FORMAT))
+    except ValueError:
+        return 0.0
+
+
+def index_block(data, base_offset):
+    """
+    Builds the index entries of a block of whole games (see history_reader.iter_blocks).
+    Markers, line ends and "Résultat" rows are located with regular
+    expressions and matched to their game with binary searches.
+    Args:
+        data (bytes): Raw CSV bytes.
+        base_offset (int): Position of `data` in the CSV file.
+    Returns:
+        numpy.ndarray: One ENTRY_DTYPE row per ---debut-partie marker.
+    """
+    starts = list(GAME_START.finditer(data))
+    entries = np.zeros(len(starts), dtype=ENTRY_DTYPE)
+    if not starts:
+        return entries
+
+    begin = np.array([m.start() for m in starts], dtype=np.int64)
+    ends = np.array([m.end() for m in GAME_END.finditer(data)], dtype=np.int64)
+    # Une partie s'arrête à la fin de sa ligne ---fin-partie (ou au début de la partie suivante)
+    next_begin = np.append(begin[1:], len(data))
+    following_end = np.searchsorted(ends, begin, side="right")
+    stop = np.minimum(next_begin, np.append(ends, len(data))[following_end])
+
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n"))
+    lines = np.searchsorted(newlines, stop, side="left") - np.searchsorted(newlines, begin, side="left")
+    if not data.endswith(b"\n"):
+        lines[stop == len(data)] += 1  # Dernière ligne du fichier sans retour à la ligne
+
+    winners = np.zeros(len(starts), dtype=np.uint8)
+    result_rows = np.zeros(len(starts), dtype=np.int64)
+    results = list(RESULT.finditer(data))
+    if results:
+        owner = np.searchsorted(begin, [m.start() for m in results], side="right") - 1
+        codes = np.array([WINNER_CODES.get(m.group(1).decode("utf-8").strip(), 0) for m in results], dtype=np.uint8)
+        inside = owner >= 0  # Ligne "Résultat" avant la première partie du bloc : ignorée
+        owner = owner[inside]
+        winners[owner] = codes[inside]
+        # Ligne "Résultat" comptée même si le vainqueur est vide ou inconnu
+        result_rows = np.bincount(owner, minlength=len(starts))
+
+    # Lignes de la partie moins les marqueurs et la ligne "Résultat"
+    plies = lines - 2 - result_rows
+
+    entries["game_id"] = [int(m.group(1) or 0) for m in starts]
+    entries["offset"] = base_offset + begin
+    entries["length"] = stop - begin
+    entries["plies"] = np.maximum(plies, 0)
+    entries["winner"] = winners
+    entries["date"] = [parse_date(m.group(0).rsplit(b",", 1)[-1]) if b"," in m.group(0) else 0.0
+                       for m in starts]
+    return entries
+
+
+class GameIndex:
+    """
+    Memory-mapped, read-only view of a game index file.
+    `entries` is a NumPy view over the file: a page of the picker only
+    touches the entries it shows.
+    """
+
+    def __init__(self, idx_path):
+        self.path = idx_path
+        self._file = open(idx_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.source_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Index de l'historique invalide : {idx_path}")
+        self.entries = np.frombuffer(self._map, dtype=ENTRY_DTYPE, count=self.count, offset=HEADER_SIZE)
+
+    def __len__(self):
+        return self.count
+
+    def summary(self, n):
+        """
+        Returns the summary of game number n (0-based position in the file).
+        Returns:
+            dict: game_id, winner (None if unknown), plies, date (str, empty if unknown),
+            offset and length of the game in the CSV.
+        """
+        entry = self.entries[n]
+        date = float(entry["date"])
+        return {
+            "game_id": int(entry["game_id"]),
+            "winner": WINNER_LABELS.get(int(entry["winner"])),
+            "plies": int(entry["plies"]),
+            "date": time.strftime(history.DATE_FORMAT, time.localtime(date)) if date else "",
+            "offset": int(entry["offset"]),
+            "length": int(entry["length"]),
+        }
+
+    def page(self, start, count):
+        return [self.summary(n) for n in range(start, min(start + count, self.count))]
+
+    def close(self):
+        # La vue NumPy doit être libérée avant de fermer la projection
+        self.entries = None
+        self._map.close()
+        self._file.close()
+
+
+def update_index(csv_path=history.HISTORY_FILE, idx_path=None):
+    """
+    Brings the index of a CSV history up to date, indexing only the games
+    appended since the last update (the header remembers how many CSV bytes
+    were already indexed).
+    Returns:
+        str: Path of the index file.
+    """
+    idx_path = idx_path or index_path(csv_path)
+    with history.locked(idx_path):
+        count = source_size = 0
+        if os.path.exists(idx_path):
+            with open(idx_path, "rb") as f:
+                header = f.read(HEADER_SIZE)
+            if len(header) == HEADER_SIZE and header[:4] == MAGIC and header[4] == VERSION:
+                _, _, count, source_size = HEADER.unpack(header)
+            if count == 0 or not os.path.exists(csv_path) or source_size > os.path.getsize(csv_path):
+                count = source_size = 0  # Index vide, CSV réécrit ou tronqué : index complet
+
+        with open(idx_path, "r+b" if count else "w+b") as f:
+            f.seek(HEADER_SIZE + count * ENTRY_DTYPE.itemsize)
+            if os.path.exists(csv_path):
+                for data, end_offset in history_reader.iter_blocks(csv_path, source_size):
+                    entries = index_block(data, end_offset - len(data))
+                    f.write(entries.tobytes())
+                    count += len(entries)
+                    source_size = end_offset
+            f.truncate()
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, count, source_size))
+    return idx_path
+
+
+def load_index(csv_path=history.HISTORY_FILE):
+    """
+    Opens the index of `csv_path`, indexing new games first.
+    Returns:
+        GameIndex or None: None if there is no history yet.
+    """
+    if not os.path.exists(csv_path):
+        return None
+    return GameIndex(update_index(csv_path))
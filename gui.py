@@ -36,8 +36,9 @@ class GUI:
                         "activebackground": "#666", "padx": 20, "pady": 10, "bd": 0, "relief": tk.FLAT}
 
         tk.Button(side_frame, text="Nouvelle Partie", command=self.new_game, **button_style).pack(pady=10, fill=tk.X, padx=10)
-        tk.Button(side_frame, text="Abandonner", command=self.resign_game, **button_style).pack(pady=10, fill=tk.X, padx=10)
-        tk.Button(side_frame, text="Quitter", command=root.quit, **button_style).pack(pady=10, fill=tk.X, padx=10)
+        self.resign_button = tk.Button(side_frame, text="Abandonner", command=self.resign_game, **button_style)
+        self.resign_button.pack(pady=10, fill=tk.X, padx=10)
+        tk.Button(side_frame, text="Quitter", command=self.quit, **button_style).pack(pady=10, fill=tk.X, padx=10)
 
         # Zone historique des coups
         self.history_label = tk.Label(side_frame, text="Historique des coups:", font=("Helvetica", 14), fg="white", bg="#2b2b2b")
@@ -50,59 +51,92 @@ class GUI:
         self.board = self.game.board
         self.selected_piece = None
         self.canvas.bind("<Button-1>", self.on_click)
+        self.create_board_items()
         self.draw_board()
 
-    def draw_board(self):
-        self.canvas.delete("all")
+    def create_board_items(self):
+        # Éléments du canevas créés une seule fois : cases, puis un pion et une
+        # couronne (cachés si la case est vide) par case noire
+        self.piece_items = {}
+        self.rendered = [[None] * 8 for _ in range(8)]  # Pièces actuellement affichées
+        radius = self.cell_size // 2 - 10
         for row in range(8):
             for col in range(8):
                 x1 = col * self.cell_size
                 y1 = row * self.cell_size
-                x2 = x1 + self.cell_size
-                y2 = y1 + self.cell_size
-
                 color = "#FFCE9E" if (row + col) % 2 == 0 else "#D18B47"
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="black")
+                self.canvas.create_rectangle(x1, y1, x1 + self.cell_size, y1 + self.cell_size,
+                                             fill=color, outline="black")
+
+        for row in range(8):
+            for col in range(8):
+                if (row + col) % 2 == 0:
+                    continue
+                x_center = col * self.cell_size + self.cell_size // 2
+                y_center = row * self.cell_size + self.cell_size // 2
+                oval = self.canvas.create_oval(
+                    x_center - radius, y_center - radius,
+                    x_center + radius, y_center + radius,
+                    width=4, state=tk.HIDDEN
+                )
+                crown = self.canvas.create_text(x_center, y_center, text="♛", font=("Arial", 32), state=tk.HIDDEN)
+                self.piece_items[(row, col)] = (oval, crown)
+
+        self.mandatory_item = self.canvas.create_rectangle(0, 0, self.cell_size, self.cell_size,
+                                                           outline="orange", width=4, state=tk.HIDDEN)
+        self.rendered_mandatory = None
 
-                piece = self.board.board[row][col]
-                if piece:
+    def draw_board(self):
+        """
+        Brings the canvas in line with the board, touching only the squares
+        whose piece changed since the last call (origin, destination, captured
+        pieces, promotion); highlights from the previous move are removed.
+        """
+        self.canvas.delete("highlight", "selection")
+        board = self.board.board
+        for row in range(8):
+            if board[row] == self.rendered[row]:
+                continue
+            for col in range(8):
+                piece = board[row][col]
+                if piece != self.rendered[row][col]:
                     self.draw_piece(row, col, piece)
+                    self.rendered[row][col] = piece
 
-        if self.board.mandatory_jump_piece:
-            row, col = self.board.mandatory_jump_piece
-            x1 = col * self.cell_size
-            y1 = row * self.cell_size
-            x2 = x1 + self.cell_size
-            y2 = y1 + self.cell_size
-            self.canvas.create_rectangle(x1, y1, x2, y2, outline="orange", width=4)
+        mandatory = self.board.mandatory_jump_piece
+        if mandatory != self.rendered_mandatory:
+            if mandatory:
+                row, col = mandatory
+                x1 = col * self.cell_size
+                y1 = row * self.cell_size
+                self.canvas.coords(self.mandatory_item, x1, y1, x1 + self.cell_size, y1 + self.cell_size)
+                self.canvas.itemconfig(self.mandatory_item, state=tk.NORMAL)
+            else:
+                self.canvas.itemconfig(self.mandatory_item, state=tk.HIDDEN)
+            self.rendered_mandatory = mandatory
 
     def draw_piece(self, row, col, piece):
-        x_center = col * self.cell_size + self.cell_size // 2
-        y_center = row * self.cell_size + self.cell_size // 2
-        radius = self.cell_size // 2 - 10
+        oval, crown = self.piece_items[(row, col)]
+        if not piece:
+            self.canvas.itemconfig(oval, state=tk.HIDDEN)
+            self.canvas.itemconfig(crown, state=tk.HIDDEN)
+            return
 
         color = "black" if piece[0] == 'N' else "white"
         outline_color = "white" if piece[0] == 'N' else "black"
-
-        self.canvas.create_oval(
-            x_center - radius, y_center - radius,
-            x_center + radius, y_center + radius,
-            fill=color, outline=outline_color, width=4
-        )
+        self.canvas.itemconfig(oval, fill=color, outline=outline_color, state=tk.NORMAL)
 
         if "D" in piece:
-            self.canvas.create_text(
-                x_center, y_center,
-                text="♛", font=("Arial", 32),
-                fill="gold" if piece[0] == 'N' else "darkgoldenrod"
-            )
+            self.canvas.itemconfig(crown, fill="gold" if piece[0] == 'N' else "darkgoldenrod", state=tk.NORMAL)
+        else:
+            self.canvas.itemconfig(crown, state=tk.HIDDEN)
 
     def highlight_selected_piece(self, row, col):
         x1 = col * self.cell_size
         y1 = row * self.cell_size
         x2 = x1 + self.cell_size
         y2 = y1 + self.cell_size
-        self.canvas.create_rectangle(x1, y1, x2, y2, outline="blue", width=4)
+        self.canvas.create_rectangle(x1, y1, x2, y2, outline="blue", width=4, tags="selection")
 
     def highlight_possible_moves(self, row, col):
         self.canvas.delete("highlight")
@@ -141,19 +175,41 @@ class GUI:
         self.history_text.yview(tk.END)
         self.history_text.config(state=tk.DISABLED)
 
+    def set_history(self, move_descriptions):
+        # Remplace tout l'historique affiché (relecture : retour arrière, saut à un coup)
+        self.history_text.config(state=tk.NORMAL)
+        self.history_text.delete("1.0", tk.END)
+        if move_descriptions:
+            self.history_text.insert(tk.END, "\n".join(move_descriptions) + "\n")
+        self.history_text.yview(tk.END)
+        self.history_text.config(state=tk.DISABLED)
+
     def update_capture_count(self, captured_black, captured_white):
         self.root.title(f"Dames - Noirs capturés: {captured_black}, Blancs capturés: {captured_white}")
 
+    def stop_game(self):
+        # Annule un calcul de l'IA en cours (Game.stop), si la partie affichée en a un
+        stop = getattr(self.game, "stop", None)
+        if stop:
+            stop()
+
+    def quit(self):
+        self.stop_game()
+        self.root.quit()
+
     def new_game(self):
         if messagebox.askyesno("Nouvelle partie", "Voulez-vous vraiment recommencer ?"):
             if self.restart_callback:
+                self.stop_game()
                 self.root.destroy()
                 self.restart_callback()
 
 
+    def show_error(self, title, message):
+        messagebox.showerror(title, message)
+
     def resign_game(self):
-        if not self.game.game_over:
+        # Relecture et IA contre IA : aucun camp humain, rien à abandonner
+        if not self.game.game_over and getattr(self.game, "human_player", None) is not None:
             if messagebox.askyesno("Abandonner", "Êtes-vous sûr de vouloir abandonner ?"):
-                self.game.game_over = True
-                self.game.update_status_message("Vous avez abandonné. L'IA gagne!")
-                self.game.end_game()
+                self.game.resign()
@@ -0,0 +1,191 @@
+import csv
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Lecture/écriture de data/game_history.csv sans pandas ni tkinter, pour
+# pouvoir être utilisé aussi bien par le jeu que par l'auto-jeu en lot.
+#
+# La colonne "Captured Piece" ne contient une pièce que sur les lignes de coup :
+# sur la ligne ---debut-partie elle porte la date de la partie (DATE_FORMAT,
+# vide pour les parties plus anciennes), sur la ligne "Résultat" le vainqueur.
+# Un lecteur externe doit filtrer les lignes de marqueur et de résultat avant
+# d'interpréter cette colonne (voir le format dans le README).
+
+HISTORY_FILE = "data/game_history.csv"
+HEADER = ["Turn", "Player", "Start", "End", "Captured Piece"]
+
+# Valeurs de la ligne "Résultat"
+WINNER_BLACK = "IA"        # Les noirs (l'IA en mode Humain vs IA) ont gagné
+WINNER_WHITE = "Joueur"    # Les blancs ont gagné
+WINNER_DRAW = "Nul"        # Partie nulle (répétition, coups sans progrès ou limite de coups)
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def winner_label(player):
+    return WINNER_BLACK if player == "N" else WINNER_WHITE
+
+
+def meta_path(csv_path):
+    # Petit fichier compagnon : prochain numéro de partie, taille et nombre de lignes
+    return csv_path + ".meta"
+
+
+@contextmanager
+def locked(csv_path):
+    """
+    Exclusive lock on the history file, held while appending.
+    Several self-play workers (or a game and a batch run) can then write
+    to the same history without interleaving their rows.
+    """
+    lock_file = open(csv_path + ".lock", "a+b")
+    try:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        lock_file.close()
+
+
+def scan_history(csv_path):
+    # Relecture complète (une seule fois, quand le fichier compagnon manque ou est périmé)
+    meta = {"next_game_id": 1, "size": 0, "rows": 0, "ends_with_newline": True}
+    if not os.path.exists(csv_path):
+        return meta
+    games = rows = 0
+    last = b"\n"
+    with open(csv_path, "rb") as f:
+        for line in f:
+            rows += 1
+            if line.lstrip().startswith(b"---debut-partie"):
+                games += 1
+            last = line[-1:]
+        meta["size"] = f.tell()
+    meta.update(next_game_id=games + 1, rows=rows, ends_with_newline=last == b"\n")
+    return meta
+
+
+def read_meta(csv_path=HISTORY_FILE):
+    """
+    Returns the sidecar metadata of the history file, rebuilding it with a
+    full scan only if it is missing or does not match the file size.
+    """
+    size = os.path.getsize(csv_path) if os.path.exists(csv_path) else 0
+    try:
+        with open(meta_path(csv_path), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("size") == size:
+            return meta
+    except (OSError, ValueError):
+        pass
+    meta = scan_history(csv_path)
+    if os.path.exists(csv_path):
+        write_meta(csv_path, meta)
+    return meta
+
+
+def write_meta(csv_path, meta):
+    tmp_path = meta_path(csv_path) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path(csv_path))
+
+
+def next_game_id(csv_path=HISTORY_FILE):
+    # Numéro de la prochaine partie, lu dans le fichier compagnon (O(1))
+    try:
+        return read_meta(csv_path)["next_game_id"]
+    except Exception as e:
+        print(f"Erreur lors de la lecture brute du fichier : {e}")
+        return 1
+
+
+def parse_square(text):
+    # "(5, 2)" -> (5, 2), sans ast.literal_eval
+    try:
+        row, col = text.strip().strip("()").split(",")
+        return int(row), int(col)
+    except ValueError:
+        return None
+
+
+def game_rows(game_id, moves, winner, date=""):
+    """
+    Builds the CSV rows of one game, markers and "Résultat" row included.
+    Args:
+        game_id (int): Number written in the ---debut-partie/---fin-partie markers.
+        moves: List of (player, start, end, captured_piece) tuples.
+        winner (str): Value of the "Résultat" row.
+        date (str): Date of the game (DATE_FORMAT), kept in the last column of the
+            ---debut-partie row; empty for games recorded before dates were kept.
+    Returns:
+        list: Rows in HEADER order.
+    """
+    rows = [[f"---debut-partie{game_id}---", "", "", "", date]]
+    for i, (player, start, end, captured_piece) in enumerate(moves):
+        rows.append([i + 1, player, str(start), str(end), str(captured_piece)])
+    rows.append(["Résultat", "", "", "", winner])
+    rows.append([f"---fin-partie{game_id}---", "", "", "", ""])
+    return rows
+
+
+def append_games(games, csv_path=HISTORY_FILE):
+    """
+    Appends finished games to the history file in a single buffered write.
+    The next game id comes from the sidecar file, so the history is never
+    reread; the append is done under an exclusive lock.
+    Args:
+        games: Iterable of (moves, winner) pairs, see game_rows.
+        csv_path (str): History file, created with its header if missing.
+    Returns:
+        list: The game ids given to the appended games.
+    """
+    directory = os.path.dirname(csv_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with locked(csv_path):
+        meta = read_meta(csv_path)
+        game_id = meta["next_game_id"]
+        buffer = io.StringIO()
+        if not meta["ends_with_newline"]:
+            buffer.write("\n")
+        writer = csv.writer(buffer, lineterminator="\n")
+        rows = 0
+        if meta["size"] == 0:
+            writer.writerow(HEADER)
+            rows += 1
+
+        ids = []
+        date = time.strftime(DATE_FORMAT)
+        for moves, winner in games:
+            game = game_rows(game_id, moves, winner, date)
+            writer.writerows(game)
+            rows += len(game)
+            ids.append(game_id)
+            game_id += 1
+
+        with open(csv_path, "ab") as f:
+            f.write(buffer.getvalue().encode("utf-8"))
+            size = f.tell()
+
+        meta.update(next_game_id=game_id, size=size, rows=meta["rows"] + rows, ends_with_newline=True)
+        write_meta(csv_path, meta)
+    return ids
@@ -0,0 +1,196 @@
+import io
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import history
+
+# Lecture en flux de data/game_history.csv, partagée par l'IA, les
+# statistiques et la relecture : le fichier est lu par blocs d'octets coupés
+# sur une fin de partie, chaque bloc est analysé par pandas puis converti en
+# colonnes compactes. La mémoire utilisée dépend de la taille d'un bloc, pas
+# de celle de l'historique.
+
+CHUNK_BYTES = 1 << 22
+COLUMNS = ["turn", "player", "start", "end", "captured piece"]
+
+PLAYER_DTYPE = pd.CategoricalDtype(["B", "N"])
+PIECE_DTYPE = pd.CategoricalDtype(["B", "N", "BD", "ND"])
+WINNER_DTYPE = pd.CategoricalDtype([history.WINNER_BLACK, history.WINNER_WHITE, history.WINNER_DRAW])
+
+# Case noire <-> index 0..31 (ligne * 4 + colonne // 2), comme binary_history
+SQUARES = [(row, col) for row in range(8) for col in range(8) if (row + col) % 2 == 1]
+SQUARE_LABELS = np.array([str(square) for square in SQUARES], dtype=object)
+
+# Un bloc de l'historique : parties (game_id, winner, plies, date) et coups
+# (game, turn, player, start, end, captured), end_offset = octet qui suit le bloc
+HistoryChunk = namedtuple("HistoryChunk", ["games", "moves", "end_offset"])
+GameRecord = namedtuple("GameRecord", ["game_id", "winner", "moves"])
+
+
+def square_codes(column):
+    # Les cases sont lues comme catégories : seules les ~32 valeurs distinctes sont analysées
+    column = column.astype("category")
+    codes = []
+    for label in column.cat.categories:
+        square = history.parse_square(str(label))
+        codes.append(square[0] * 4 + square[1] // 2 if square and 0 <= square[0] < 8 and 0 <= square[1] < 8
+                     else -1)
+    codes = np.append(np.array(codes, dtype=np.int16), -1)  # Code -1 de pandas = case vide
+    return codes[column.cat.codes.to_numpy()]
+
+
+def compact(df):
+    """
+    Converts raw history rows into compact per-game and per-move frames.
+    Args:
+        df: Rows in game_history.csv layout (lower-case columns), whole games only.
+    Returns:
+        tuple: (games, moves). games has one row per ---debut-partie marker in
+        file order: game_id (uint32), winner (category), plies (uint16) and
+        date (str, empty if the marker row has none).
+        moves has one row per move: game (uint32, position of the game in
+        `games`), turn (uint16), player (category), start and end (uint8
+        square indices) and captured (category, NaN if nothing was captured).
+    """
+    turn = df["turn"].astype(str).str.strip()
+    is_start = turn.str.startswith("---debut-partie").to_numpy()
+    is_end = turn.str.startswith("---fin-partie").to_numpy()
+    is_result = (turn.str.lower() == "résultat").to_numpy()
+
+    # Position de la partie de chaque ligne : 0 hors partie (avant le premier
+    # marqueur ou entre un ---fin-partie et le ---debut-partie suivant)
+    marker = np.where(is_start, np.cumsum(is_start), np.where(is_end, 0, np.nan))
+    game = pd.Series(marker).ffill().fillna(0).to_numpy(dtype=np.int64)
+
+    game_ids = pd.to_numeric(turn[is_start].str.strip("-").str.replace("debut-partie", "", regex=False),
+                             errors="coerce").fillna(0).to_numpy(dtype=np.uint32)
+    # Date de la partie : dernière colonne de la ligne ---debut-partie
+    dates = df["captured piece"][is_start].fillna("").astype(str).str.strip().to_numpy(dtype=object)
+    winners = pd.Series(df["captured piece"].to_numpy()[is_result & (game > 0)], dtype=object).str.strip()
+    winner_by_game = pd.Series(winners.to_numpy(), index=game[is_result & (game > 0)]).groupby(level=0).last()
+
+    start = square_codes(df["start"])
+    end = square_codes(df["end"])
+    is_move = turn.str.isdigit().to_numpy() & (game > 0) & (start >= 0) & (end >= 0)
+
+    moves = pd.DataFrame({
+        "game": (game[is_move] - 1).astype(np.uint32),
+        "turn": turn[is_move].astype(np.uint16).to_numpy(),
+        "player": pd.Categorical(df["player"].to_numpy()[is_move], dtype=PLAYER_DTYPE),
+        "start": start[is_move].astype(np.uint8),
+        "end": end[is_move].astype(np.uint8),
+        # "None" (aucune prise) et valeurs inconnues deviennent NaN
+        "captured": pd.Categorical(df["captured piece"].where(df["captured piece"].isin(PIECE_DTYPE.categories))
+                                   .to_numpy()[is_move], dtype=PIECE_DTYPE),
+    })
+
+    n_games = int(is_start.sum())
+    games = pd.DataFrame({
+        "game_id": game_ids,
+        "winner": pd.Categorical(winner_by_game.reindex(range(1, n_games + 1)).to_numpy(), dtype=WINNER_DTYPE),
+        "plies": np.bincount(moves["game"].to_numpy(), minlength=n_games).astype(np.uint16),
+        "date": dates,
+    })
+    return games, moves
+
+
+def read_header(csv_path):
+    with open(csv_path, "r", encoding="utf-8-sig") as f:
+        header = f.readline()
+    return [column.strip().lower() for column in header.split(",")]
+
+
+def iter_blocks(csv_path, start_offset=0, chunk_bytes=CHUNK_BYTES):
+    """
+    Streams the raw bytes of the history in blocks made of whole games.
+    Yields:
+        tuple: (data, end_offset), data ending just after a ---fin-partie line.
+    """
+    with open(csv_path, "rb") as f:
+        f.seek(start_offset)
+        offset, pending = start_offset, b""
+        while True:
+            data = f.read(chunk_bytes)
+            pending += data
+            last_end = pending.rfind(b"---fin-partie")
+            if last_end >= 0:
+                line_end = pending.find(b"\n", last_end)
+                if line_end >= 0 or not data:
+                    cut = len(pending) if line_end < 0 else line_end + 1
+                    offset += cut
+                    yield pending[:cut], offset
+                    pending = pending[cut:]
+            if not data:
+                return
+
+
+def iter_chunks(csv_path=history.HISTORY_FILE, start_offset=0, chunk_bytes=CHUNK_BYTES):
+    """
+    Streams the history as compact chunks of whole games.
+    Args:
+        csv_path (str): History file.
+        start_offset (int): Byte offset to start from (0 or a game boundary).
+        chunk_bytes (int): Approximate number of bytes parsed at once.
+    Yields:
+        HistoryChunk: games and moves frames (see compact) and the byte
+        offset just after the chunk's last game.
+    """
+    if start_offset == 0 and not set(COLUMNS).issubset(read_header(csv_path)):
+        raise ValueError("Colonnes manquantes dans game_history.csv")
+
+    for data, end_offset in iter_blocks(csv_path, start_offset, chunk_bytes):
+        # L'en-tête (et son BOM) ne ressemble à aucune ligne de partie : il est ignoré par compact
+        df = pd.read_csv(io.BytesIO(data), header=None, names=COLUMNS, dtype=str,
+                         encoding="utf-8", keep_default_na=False, na_values=[""])
+        games, moves = compact(df)
+        yield HistoryChunk(games, moves, end_offset)
+
+
+def iter_games(csv_path=history.HISTORY_FILE, start_offset=0, chunk_bytes=CHUNK_BYTES):
+    """
+    Streams the history one game at a time.
+    Yields:
+        GameRecord: game_id, winner (None if unknown) and the game's compact moves frame.
+    """
+    for chunk in iter_chunks(csv_path, start_offset, chunk_bytes):
+        bounds = np.concatenate(([0], np.cumsum(chunk.games["plies"].to_numpy(dtype=np.int64))))
+        for n, (game_id, winner) in enumerate(zip(chunk.games["game_id"], chunk.games["winner"])):
+            yield GameRecord(int(game_id), None if pd.isna(winner) else winner,
+                             chunk.moves.iloc[bounds[n]:bounds[n + 1]])
+
+
+def move_tuples(moves):
+    """
+    Converts a compact moves frame back to (player, start, end, captured_piece)
+    tuples, squares as (row, col), like GameController.moves.
+    """
+    captured = moves["captured"].astype(object).where(moves["captured"].notna(), None)
+    return [(player, SQUARES[start], SQUARES[end], piece)
+            for player, start, end, piece in zip(moves["player"], moves["start"], moves["end"], captured)]
+
+
+def move_labels(moves):
+    # Libellé "(5, 2)->(4, 1)" de chaque coup, calculé sur les 32 x 32 coups possibles
+    labels = np.char.add(np.char.add(SQUARE_LABELS.astype(str)[:, None], "->"), SQUARE_LABELS.astype(str)[None, :])
+    return labels.ravel()[moves["start"].to_numpy(dtype=np.intp) * 32 + moves["end"].to_numpy(dtype=np.intp)]
+
+
+def read_game(csv_path, offset, length):
+    """
+    Reads a single game from its byte range (see game_index).
+    Returns:
+        GameRecord or None: None if the range holds no game.
+    """
+    with open(csv_path, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    df = pd.read_csv(io.BytesIO(data), header=None, names=COLUMNS, dtype=str,
+                     encoding="utf-8", keep_default_na=False, na_values=[""])
+    games, moves = compact(df)
+    if games.empty:
+        return None
+    winner = games["winner"].iloc[0]
+    return GameRecord(int(games["game_id"].iloc[0]), None if pd.isna(winner) else winner,
+                      moves[moves["game"] == 0])
@@ -1,111 +1,198 @@
 import random
-import pandas as pd
 import os
+import numpy as np
+import binary_history
+import evaluation
+import history
+import opening_book
+import tablebase
+from search import AlphaBetaSearch
+
+# Modes de jeu de l'IA
+MODE_HISTORY = "historique"   # Score glouton à un coup + historique des parties
+MODE_SEARCH = "alphabeta"     # Recherche negamax alpha-beta à profondeur itérative
+AI_MODES = (MODE_HISTORY, MODE_SEARCH)
+
 
 class CheckersAI:
-    def __init__(self, history_file="data/game_history.csv"):
+    def __init__(self, history_file="data/game_history.csv", mode=MODE_HISTORY, time_limit_ms=200, tt_size_mb=16,
+                 use_book=True, use_tablebase=True, weights=None):
+        if mode not in AI_MODES:
+            raise ValueError(f"Mode d'IA inconnu : {mode}")
+        self.mode = mode
+        self.use_book = use_book
+        self._book = None           # Bibliothèque d'ouvertures, ouverte au premier coup
+        self.book_loaded = False
+        self.use_tablebase = use_tablebase
+        self._tablebase = None      # Tables de finales (data/endgame.tb), ouvertes au premier coup
+        self.tablebase_loaded = False
+        # Poids de l'évaluation des coups (mode historique) : ceux de tuner.py s'ils existent
+        if weights is None:
+            try:
+                weights = evaluation.load_weights()
+            except Exception as e:
+                print(f"❌ Erreur de lecture des poids de l'évaluation : {e}")
+        self.weights = evaluation.DEFAULT_WEIGHTS if weights is None else weights
+        self.search = AlphaBetaSearch(time_limit_ms=time_limit_ms, tt_size_mb=tt_size_mb)
         self.history_file = history_file
-        self.history_data = self.load_history()
+        self.history_index = self.load_history_index()
 
     def load_history(self):
+        # Miroir binaire de l'historique (converti une fois, puis seulement les nouvelles parties)
         if not os.path.exists(self.history_file):
             return None
 
         try:
-            df = pd.read_csv(self.history_file, encoding='utf-8-sig')
+            return binary_history.load_history(self.history_file)
         except Exception as e:
-            print(f"❌ Erreur de lecture du fichier CSV : {e}")
+            print(f"❌ Erreur de lecture de l'historique : {e}")
             return None
 
-        df.columns = df.columns.str.strip().str.lower()
-        expected = {"turn", "start", "end", "player", "captured piece"}
+    def load_history_index(self):
+        # La projection du miroir n'est gardée que le temps de construire l'index
+        records = self.load_history()
+        try:
+            return self.build_history_index(records)
+        finally:
+            if records is not None:
+                records.close()
+
+    @property
+    def book(self):
+        if not self.book_loaded:
+            self.book_loaded = True
+            if self.use_book:
+                try:
+                    self._book = opening_book.load_book(self.history_file)
+                except Exception as e:
+                    print(f"❌ Erreur de lecture de la bibliothèque d'ouvertures : {e}")
+        return self._book
+
+    @property
+    def tablebase(self):
+        if not self.tablebase_loaded:
+            self.tablebase_loaded = True
+            if self.use_tablebase:
+                try:
+                    self._tablebase = tablebase.load_tablebase()
+                except Exception as e:
+                    print(f"❌ Erreur de lecture des tables de finales : {e}")
+                self.search.tablebase = self._tablebase
+        return self._tablebase
+
+    @staticmethod
+    def is_winning_side(player, winner):
+        # "IA" = victoire des noirs, "Joueur" = victoire des blancs
+        return (player == "N" and winner == "IA") or (player == "B" and winner == "Joueur")
+
+    def build_history_index(self, records):
+        """
+        Builds the move-outcome index used by evaluate_moves.
+        Every move of a game is attributed to the winner of that game, so the
+        scoring becomes a dictionary lookup. The counts are computed with
+        NumPy over the memory-mapped move records, without parsing any text.
+        Args:
+            records: The BinaryHistory returned by load_history (or None).
+        Returns:
+            dict: (player, start, end) -> [wins, total], start/end as (row, col) tuples.
+        """
+        index = {}
+        if records is None or not len(records.moves):
+            return index
+
+        moves = records.moves
+        winners = records.move_winners()
+        black = (moves["flags"] & binary_history.FLAG_BLACK) != 0
+        won = np.where(black, winners == binary_history.WINNER_CODES[history.WINNER_BLACK],
+                       winners == binary_history.WINNER_CODES[history.WINNER_WHITE])
+        known = winners != 0  # Parties sans ligne "Résultat" ignorées
+
+        # Clé unique par (joueur, départ, arrivée) : 2 x 32 x 32 valeurs possibles
+        keys = (black.astype(np.int64) << 10) | (moves["start"].astype(np.int64) << 5) | moves["end"]
+        totals = np.bincount(keys[known], minlength=2048)
+        wins = np.bincount(keys[known], weights=won[known], minlength=2048)
+
+        for key in np.flatnonzero(totals):
+            player = "N" if key >> 10 else "B"
+            start = binary_history.square_coords((key >> 5) & 31)
+            end = binary_history.square_coords(key & 31)
+            index[(player, start, end)] = [int(wins[key]), int(totals[key])]
+        return index
+
+    def add_game_to_index(self, index, moves, winner):
+        # Ajoute une partie terminée à l'index (chargement ou nouvelle partie)
+        if not winner:
+            return
+        for player, start, end in moves:
+            stats = index.setdefault((player, start, end), [0, 0])
+            if self.is_winning_side(player, winner):
+                stats[0] += 1
+            stats[1] += 1
+
+    def record_game(self, moves, winner):
+        """
+        Folds a newly finished game into the history index without reloading the CSV.
+        Args:
+            moves: List of (player, start, end) tuples.
+            winner (str): "IA" or "Joueur", as written on the "Résultat" row.
+        """
+        self.add_game_to_index(self.history_index, moves, winner)
 
-        if not expected.issubset(set(df.columns)):
-            print("❌ Colonnes manquantes :", expected - set(df.columns))
-            return None
+    def evaluate_moves(self, board, player, valid_moves):
+        """
+        Scores every valid move: the positions they lead to are evaluated in one
+        vectorised call (see evaluation.py and self.weights), then the win rate
+        of the move in the game history is added.
+        Returns:
+            dict: (start, end) -> score.
+        """
+        scores = evaluation.evaluate_moves(board, player, valid_moves, self.weights)
 
-        return df
+        # Analyse de l'historique : simple lecture dans l'index
+        for i, (start, end) in enumerate(valid_moves):
+            stats = self.history_index.get((player, start, end))
+            if stats and stats[1] > 0:
+                wins, total = stats
+                scores[i] += (wins / total) * 5  # pondération max +5
 
-    def evaluate_moves(self, board, player, valid_moves):
-        move_scores = {(start, end): 0 for start, end in valid_moves}
-
-        for start, end in valid_moves:
-            score = 0
-
-            # Stratégie : aller vers le centre
-            if 2 <= end[0] <= 5 and 2 <= end[1] <= 5:
-                score += 2
-
-            # Stratégie : capture
-            if hasattr(board, 'is_capture_move') and board.is_capture_move(start, end):
-                score += 10
-
-            # Stratégie : promotion
-            if player == "N" and end[0] == 0:
-                score += 5
-            elif player == "B" and end[0] == 7:
-                score += 5
-
-            # Éviter les bords
-            if end[1] in [0, 7]:
-                score -= 1
-
-            # Analyse de l'historique
-            if self.history_data is not None:
-                filtered = self.history_data[
-                    (self.history_data["start"] == str(start)) &
-                    (self.history_data["end"] == str(end)) &
-                    (self.history_data["player"] == player)
-                ]
-
-                wins = 0
-                total = 0
-                current_winner = None
-
-                for _, row in filtered.iterrows():
-                    turn = row["turn"]
-                    if isinstance(turn, str) and "résultat" in turn.lower():
-                        current_winner = str(row["captured piece"]).strip()
-                    elif str(turn).isdigit():
-                        if current_winner:
-                            if (player == "N" and current_winner == "IA") or (player == "B" and current_winner == "Joueur"):
-                                wins += 1
-                            total += 1
-
-                if total > 0:
-                    score += (wins / total) * 5  # pondération max +5
-
-            move_scores[(start, end)] = score
-
-        return move_scores
-
-    def get_best_move(self, board, player="N"):
+        return {move: float(score) for move, score in zip(valid_moves, scores)}
+
+    def get_best_move(self, board, player="N", stop_event=None):
         """
         Determines the best move for the given player on the current board.
-        This function identifies all valid moves available for the player, evaluates each move
-        using the evaluate_moves method, and selects one of the moves with the highest score.
-        If multiple moves have the same highest score, one is chosen randomly.
+        Positions of the opening book are answered from the book (weighted random choice among
+        the moves played there), and endgames covered by the tablebase with the move that keeps
+        the best result. Otherwise, in the "historique" mode, all valid moves are scored with
+        evaluate_moves and one of the moves with the highest score is selected (randomly among
+        ties). In the "alphabeta" mode, the position is searched with AlphaBetaSearch under the
+        per-move time budget.
         Args:
             board: The game board object containing the current state of the game.
             player (str, optional): The player identifier ('N' for black by default).
+            stop_event (threading.Event, optional): Cancels a search in progress (see ai_worker).
         Returns:
             tuple or None: A tuple containing the source position ((row, col)) and the 
             destination position, representing the best move. Returns None if no valid 
             moves are available.
         """
-        valid_moves = []
-
-        for row in range(8):
-            for col in range(8):
-                piece = board.board[row][col]
-                if piece and piece[0] == player:
-                    moves = board.get_valid_moves(row, col)
-                    for move in moves:
-                        valid_moves.append(((row, col), move))
-
+        valid_moves = board.generate_legal_moves(player)
         if not valid_moves:
             return None
 
+        if self.book is not None:
+            move = self.book.choose(board, player, valid_moves)
+            if move:
+                return move
+
+        # Finale résolue : coup du meilleur résultat (gain le plus rapide, nulle, perte la plus lente)
+        if self.tablebase is not None:
+            result = self.tablebase.best_move(board, player)
+            if result:
+                return result[0]
+
+        if self.mode == MODE_SEARCH:
+            return self.search.best_move(board, player, stop_event=stop_event)
+
         scored_moves = self.evaluate_moves(board, player, valid_moves)
         max_score = max(scored_moves.values())
         best_moves = [move for move, score in scored_moves.items() if score == max_score]
@@ -1,17 +1,27 @@
 import tkinter as tk
+import history
 from game import Game
-from ia import CheckersAI
+from ia import MODE_HISTORY
 
 class IAVersus:
-    def __init__(self, root, speed_ms=500):
+    def __init__(self, root, speed_ms=500, ai_mode=MODE_HISTORY):
         self.root = root
         self.root.title("IA vs IA")
         self.root.attributes('-fullscreen', True)
 
         self.speed_ms = speed_ms
-        self.game = Game(root)
+        self.game = Game(root, ai_mode=ai_mode)
         self.game.current_player = "B"  # Commence par IA blanche
-        self.ai = CheckersAI()  # Utilisation directe
+        self.game.human_player = None   # Aucun camp jouable à la souris
+        self.game.gui.resign_button.config(state=tk.DISABLED)  # Ni abandon
+        self.game.player_labels = {"B": "IA B", "N": "IA N"}
+        self.game.win_messages = {
+            history.WINNER_BLACK: "Partie terminée! L'IA N a gagné!",
+            history.WINNER_WHITE: "Partie terminée! L'IA B a gagné!",
+            history.WINNER_DRAW: "Partie terminée! Match nul",
+        }
+        self.ai = self.game.ai
+        self.worker = self.game.ai_worker  # Annulé aussi par Nouvelle Partie / Quitter de GUI
 
         self.add_controls()
         self.start_loop()
@@ -32,53 +42,37 @@ class IAVersus:
         self.speed_scale.set(self.speed_ms)
         self.speed_scale.pack()
 
-        tk.Button(control_frame, text="Quitter", command=self.root.quit, **button_style).pack(pady=10)
+        tk.Button(control_frame, text="Quitter", command=self.quit, **button_style).pack(pady=10)
 
     def set_speed(self, val):
         self.speed_ms = int(val)
 
+    def quit(self):
+        self.game.stop()
+        self.root.quit()
+
     def start_loop(self):
         if self.game.game_over:
-            self.game.end_game()
             return
 
         player = self.game.current_player
-
-        if not self.game.board.has_valid_moves(player):
-            self.game.update_status_message(f"IA {player} ne peut plus jouer.")
-            self.game.end_game()
-            return
-
         self.game.update_status_message(f"IA {player} réfléchit...")
-        self.root.update()
-
-        move = self.ai.get_best_move(self.game.board, player=player)
-        if not move:
-            self.game.end_game()
+        self.worker.request_move(self.game.board, player, self.on_ai_move, progress=self.game.show_thinking,
+                                 on_error=self.game.on_ai_error)
+
+    def on_ai_move(self, move):
+        # Le contrôleur joue le coup, gère les prises multiples, le changement
+        # de trait et la fin de partie ; Game redessine et sauvegarde.
+        try:
+            self.game.controller.apply_ai_move(move)
+        except ValueError as e:
+            self.game.on_ai_error(e)  # Boucle arrêtée : la partie reste en cours
             return
-
-        start, end = move
-        print(f"IA {player} joue : {start} -> {end}")
-        self.game.gui.append_history(f"IA {player} joue : {start} -> {end}")
-
-        success, multiple_capture = self.game.move_piece(start, end)
-        if success:
-            self.game.moves_history.append((start, end))
-            self.game.stats.record_move(player, f"{start}->{end}")
-            self.game.gui.draw_board()
-            self.game.gui.update_capture_count(self.game.board.captured_black, self.game.board.captured_white)
-
-            if multiple_capture:
-                self.root.after(self.speed_ms, self.start_loop)
-                return
-
-            self.game.current_player = "B" if player == "N" else "N"
+        if not self.game.game_over:
             self.root.after(self.speed_ms, self.start_loop)
-        else:
-            self.game.end_game()
 
 
-def start_ia_vs_ia():
+def start_ia_vs_ia(ai_mode=MODE_HISTORY):
     root = tk.Tk()
-    app = IAVersus(root)
+    app = IAVersus(root, ai_mode=ai_mode)
     root.mainloop()
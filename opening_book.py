@@ -0,0 +1,192 @@
+import mmap
+import os
+import random
+import struct
+
+import numpy as np
+import pandas as pd
+
+import history
+import history_reader
+from board import Board
+from search import AlphaBetaSearch
+
+# Bibliothèque d'ouvertures tirée de l'historique (fichier .book à côté du
+# CSV) : pour chaque position des premiers demi-coups des parties jouées, les
+# coups qui y ont été joués avec leur nombre de victoires et de parties.
+# Les parties de l'auto-jeu sont ajoutées à l'historique, donc au livre.
+#
+#   En-tête (24 octets) : magie "DAMO", version, demi-coups retenus par partie,
+#                         nombre d'entrées, taille du CSV déjà lue
+#   Entrées (20 octets, triées par position) : empreinte de la position (trait
+#                         compris), case de départ, case d'arrivée, victoires, parties
+#
+# Une case est un octet : ligne * 4 + colonne // 2, comme binary_history.
+
+MAGIC = b"DAMO"
+VERSION = 1
+HEADER = struct.Struct("<4sBB2xIQ4x")
+HEADER_SIZE = HEADER.size
+
+ENTRY_DTYPE = np.dtype([("key", "<u8"), ("start", "u1"), ("end", "u1"), ("pad", "<u2"),
+                        ("wins", "<u4"), ("total", "<u4")])
+
+BOOK_PLIES = 12     # Demi-coups de chaque partie ajoutés au livre
+MIN_GAMES = 3       # Un coup joué moins souvent n'est pas proposé
+
+
+def book_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".book"
+
+
+def count_chunk(chunk, counts, plies=BOOK_PLIES):
+    """
+    Replays the first `plies` moves of every decided game of a chunk and
+    adds them to `counts`.
+    Args:
+        chunk: history_reader.HistoryChunk.
+        counts (dict): (key, start, end) -> [wins, total], updated in place.
+    """
+    lengths = chunk.games["plies"].to_numpy(dtype=np.int64)
+    ply = np.arange(len(chunk.moves)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    opening = chunk.moves[ply < plies]
+    winners = chunk.games["winner"].astype(object).to_numpy()
+
+    board, current, playable = None, -1, False
+    for game, player, start, end in zip(opening["game"], opening["player"], opening["start"], opening["end"]):
+        if game != current:
+            current, board = game, Board()
+            playable = pd.notna(winners[game])  # Parties sans résultat ignorées
+        if not playable:
+            continue
+        start_square, end_square = history_reader.SQUARES[start], history_reader.SQUARES[end]
+        piece = board.board[start_square[0]][start_square[1]]
+        # Coup illisible ou illégal : la suite de la partie n'est pas rejouée
+        if not piece or piece[0] != player or not board.is_valid_move(start_square, end_square):
+            playable = False
+            continue
+
+        stats = counts.setdefault((AlphaBetaSearch.position_key(board, player), int(start), int(end)), [0, 0])
+        won = winners[game] == (history.WINNER_BLACK if player == "N" else history.WINNER_WHITE)
+        stats[0] += int(won)
+        stats[1] += 1
+        board.make_move(start_square, end_square)
+
+
+def merge_entries(entries, counts):
+    # Entrées existantes + nouveaux comptes, triées par position puis par coup
+    new = pd.DataFrame([(key, start, end, wins, total) for (key, start, end), (wins, total) in counts.items()],
+                       columns=["key", "start", "end", "wins", "total"])
+    old = pd.DataFrame({name: entries[name] for name in ("key", "start", "end", "wins", "total")})
+    merged = pd.concat([old, new.astype(old.dtypes.to_dict())], ignore_index=True)
+    merged = merged.groupby(["key", "start", "end"], sort=True)[["wins", "total"]].sum().reset_index()
+
+    result = np.zeros(len(merged), dtype=ENTRY_DTYPE)
+    for name in ("key", "start", "end", "wins", "total"):
+        result[name] = merged[name].to_numpy()
+    return result
+
+
+class OpeningBook:
+    """
+    Memory-mapped, read-only view of an opening book file.
+    A lookup is a binary search on the sorted position keys.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.plies, self.count, self.source_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Bibliothèque d'ouvertures invalide : {path}")
+        self.entries = np.frombuffer(self._map, dtype=ENTRY_DTYPE, count=self.count, offset=HEADER_SIZE)
+
+    def __len__(self):
+        return self.count
+
+    def lookup(self, board, player):
+        """
+        Returns the book moves of a position.
+        Returns:
+            list: ((start, end), wins, total) tuples, squares as (row, col).
+        """
+        key = np.uint64(AlphaBetaSearch.position_key(board, player))
+        first = int(np.searchsorted(self.entries["key"], key, side="left"))
+        last = int(np.searchsorted(self.entries["key"], key, side="right"))
+        return [((history_reader.SQUARES[entry["start"]], history_reader.SQUARES[entry["end"]]),
+                 int(entry["wins"]), int(entry["total"])) for entry in self.entries[first:last]]
+
+    def choose(self, board, player, legal_moves, min_games=MIN_GAMES, rng=random):
+        """
+        Picks a book move at random, weighted by how often it was played and
+        how often it won.
+        Args:
+            legal_moves (list): Legal moves of the position; a book move that is
+                not among them (hash collision) is ignored.
+        Returns:
+            tuple or None: (start, end), None if the position is not in the book.
+        """
+        legal = set(legal_moves)
+        candidates = [(move, wins, total) for move, wins, total in self.lookup(board, player)
+                      if total >= min_games and move in legal]
+        if not candidates:
+            return None
+        # Popularité x taux de victoire lissé : un coup perdant reste rare
+        weights = [total * (wins + 1) / (total + 2) for _, wins, total in candidates]
+        return rng.choices([move for move, _, _ in candidates], weights=weights)[0]
+
+    def close(self):
+        # La vue NumPy doit être libérée avant de fermer la projection
+        self.entries = None
+        self._map.close()
+        self._file.close()
+
+
+def update_book(csv_path=history.HISTORY_FILE, path=None, plies=BOOK_PLIES):
+    """
+    Brings the opening book of a CSV history up to date, replaying only the
+    games appended since the last update (the header remembers how many CSV
+    bytes were already read).
+    Returns:
+        str: Path of the book file.
+    """
+    path = path or book_path(csv_path)
+    with history.locked(path):
+        entries, source_size = np.zeros(0, dtype=ENTRY_DTYPE), 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                header = f.read(HEADER_SIZE)
+                if len(header) == HEADER_SIZE:
+                    magic, version, book_plies, count, source_size = HEADER.unpack(header)
+                    if magic == MAGIC and version == VERSION and book_plies == plies \
+                            and source_size <= os.path.getsize(csv_path):
+                        entries = np.fromfile(f, dtype=ENTRY_DTYPE, count=count)
+                    else:
+                        source_size = 0  # Autre format ou CSV réécrit : livre reconstruit
+            if source_size == os.path.getsize(csv_path):
+                return path
+
+        counts = {}
+        for chunk in history_reader.iter_chunks(csv_path, start_offset=source_size):
+            count_chunk(chunk, counts, plies)
+            source_size = chunk.end_offset
+        entries = merge_entries(entries, counts)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, plies, len(entries), source_size))
+            f.write(entries.tobytes())
+        os.replace(tmp_path, path)
+    return path
+
+
+def load_book(csv_path=history.HISTORY_FILE):
+    """
+    Opens the opening book of `csv_path`, adding new games first.
+    Returns:
+        OpeningBook or None: None if there is no history yet.
+    """
+    if not os.path.exists(csv_path):
+        return None
+    return OpeningBook(update_book(csv_path))
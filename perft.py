@@ -0,0 +1,240 @@
+import argparse
+import sys
+import time
+
+from bitboard import BitBoard
+from board import Board
+
+# Perft : nombre de positions atteintes après `depth` tours depuis une position,
+# en parcourant tous les coups légaux. Une rafle (prise multiple) compte pour un
+# seul tour : tant que mandatory_jump_piece est posé, le même camp rejoue sans
+# consommer de profondeur. Sert à mesurer la vitesse du générateur de coups et
+# à vérifier qu'une optimisation ne change pas les règles.
+#
+# Positions de référence : 8 lignes de 8 caractères
+#   "." case vide, "b" pion blanc, "B" dame blanche, "n" pion noir, "N" dame noire
+# Les nombres attendus ont été relevés avec l'implémentation d'origine de Board,
+# puis corrigés quand un long déplacement de dame sans prise a cessé d'ouvrir
+# une rafle ; ceux de la position initiale sont aussi les valeurs connues du
+# perft des dames anglaises (7, 49, 302, 1469, 7361, 36768, 179740).
+
+PIECE_CODES = {"b": "B", "B": "BD", "n": "N", "N": "ND"}
+
+PERFT_POSITIONS = [
+    {
+        "name": "depart",
+        "description": "Position initiale, les blancs commencent",
+        "rows": [
+            ".n.n.n.n",
+            "n.n.n.n.",
+            ".n.n.n.n",
+            "........",
+            "........",
+            "b.b.b.b.",
+            ".b.b.b.b",
+            "b.b.b.b.",
+        ],
+        "player": "B",
+        "counts": {1: 7, 2: 49, 3: 302, 4: 1469, 5: 7361, 6: 36768, 7: 179740},
+    },
+    {
+        "name": "prise_forcee",
+        "description": "Une seule prise possible : les déplacements simples sont interdits",
+        "rows": [
+            ".n.n.n.n",
+            "n.n.n.n.",
+            ".n...n.n",
+            "..n.....",
+            ".b......",
+            "b...b.b.",
+            ".b.b.b.b",
+            "b.b.b.b.",
+        ],
+        "player": "B",
+        "counts": {1: 1, 2: 2, 3: 14, 4: 93, 5: 552, 6: 3366},
+    },
+    {
+        "name": "rafle",
+        "description": "Prises multiples en chaîne (mandatory_jump_piece)",
+        "rows": [
+            "........",
+            "..n.n...",
+            "........",
+            "..n.n...",
+            ".b......",
+            "........",
+            "...b....",
+            "........",
+        ],
+        "player": "B",
+        "counts": {1: 2, 2: 6, 3: 40, 4: 112, 5: 525, 6: 1457},
+    },
+    {
+        "name": "promotion",
+        "description": "Promotions en dame, dont une au milieu d'une rafle",
+        "rows": [
+            "........",
+            "..b.n...",
+            "...n....",
+            "........",
+            "........",
+            "....b...",
+            ".n......",
+            "........",
+        ],
+        "player": "B",
+        "counts": {1: 4, 2: 20, 3: 50, 4: 187, 5: 644, 6: 3251},
+    },
+    {
+        "name": "dames",
+        "description": "Dames sur des diagonales ouvertes : rayons et prises à distance",
+        "rows": [
+            ".......N",
+            "........",
+            ".....n..",
+            "........",
+            "...B....",
+            "........",
+            ".n......",
+            "B.......",
+        ],
+        "player": "B",
+        "counts": {1: 2, 2: 4, 3: 30, 4: 77, 5: 109, 6: 498},
+    },
+    {
+        "name": "rafle_en_cours",
+        "description": "Rafle en cours : seule la pièce qui vient de prendre peut jouer",
+        "rows": [
+            "........",
+            "..n.n...",
+            "........",
+            "..n.....",
+            ".b......",
+            "........",
+            ".....b..",
+            "........",
+        ],
+        "player": "B",
+        "mandatory_jump_piece": (4, 1),
+        "counts": {1: 2, 2: 4, 3: 20, 4: 34, 5: 190, 6: 257},
+    },
+]
+
+
+def opponent(player):
+    return "B" if player == "N" else "N"
+
+
+def board_from_rows(rows, mandatory_jump_piece=None, board_class=Board):
+    """
+    Builds a board from 8 strings of 8 characters (see PIECE_CODES).
+    Args:
+        rows (list): Rows 0 to 7.
+        mandatory_jump_piece (tuple, optional): Piece in the middle of a multi-jump.
+        board_class: Board or bitboard.BitBoard.
+    """
+    board = Board()
+    board.board = [[PIECE_CODES.get(char) for char in row] for row in rows]
+    board.mandatory_jump_piece = mandatory_jump_piece
+    board.zobrist_key = board.compute_zobrist_key()
+    board.index_pieces()
+    return BitBoard.from_board(board) if board_class is BitBoard else board
+
+
+def perft(board, player, depth):
+    """
+    Counts the positions reached after `depth` turns.
+    Moves are made and unmade in place; a multi-jump continuation is part
+    of the same turn.
+    Returns:
+        int: Number of leaf positions.
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    for start, end in board.generate_legal_moves(player):
+        undo = board.make_move(start, end)
+        if board.mandatory_jump_piece:
+            nodes += perft(board, player, depth)
+        else:
+            nodes += perft(board, opponent(player), depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+
+def divide(board, player, depth):
+    # Détail par premier pas : utile pour localiser une différence de comptage
+    counts = {}
+    for start, end in board.generate_legal_moves(player):
+        undo = board.make_move(start, end)
+        if board.mandatory_jump_piece:
+            counts[(start, end)] = perft(board, player, depth)
+        else:
+            counts[(start, end)] = perft(board, opponent(player), depth - 1)
+        board.unmake_move(undo)
+    return counts
+
+
+def position_board(position, board_class=Board):
+    return board_from_rows(position["rows"], position.get("mandatory_jump_piece"), board_class)
+
+
+def timed_perft(board, player, depth):
+    started = time.perf_counter()
+    nodes = perft(board, player, depth)
+    elapsed = time.perf_counter() - started
+    return nodes, elapsed
+
+
+def check_positions(board_class=Board, max_depth=None, out=sys.stdout):
+    """
+    Runs perft on every reference position and compares with the recorded counts.
+    Returns:
+        bool: True if every count matches.
+    """
+    ok = True
+    for position in PERFT_POSITIONS:
+        for depth, expected in sorted(position["counts"].items()):
+            if max_depth is not None and depth > max_depth:
+                continue
+            nodes, elapsed = timed_perft(position_board(position, board_class), position["player"], depth)
+            status = "ok" if nodes == expected else f"ÉCHEC (attendu {expected})"
+            ok = ok and nodes == expected
+            rate = nodes / elapsed if elapsed else 0
+            print(f"{position['name']:<16} profondeur {depth:>2} : {nodes:>10} positions "
+                  f"{elapsed:>8.3f} s {rate:>12.0f} pos/s  {status}", file=out)
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft : comptage des positions et vitesse du générateur de coups.")
+    parser.add_argument("-d", "--depth", type=int, default=5, help="Profondeur (en tours) depuis la position initiale")
+    parser.add_argument("--position", choices=[p["name"] for p in PERFT_POSITIONS], default="depart")
+    parser.add_argument("--bitboard", action="store_true", help="Utiliser bitboard.BitBoard au lieu de Board")
+    parser.add_argument("--divide", action="store_true", help="Détail par premier coup")
+    parser.add_argument("--check", action="store_true", help="Comparer toutes les positions aux nombres de référence")
+    parser.add_argument("--max-depth", type=int, default=None, help="Avec --check : profondeur maximale vérifiée")
+    args = parser.parse_args(argv)
+
+    board_class = BitBoard if args.bitboard else Board
+    if args.check:
+        return 0 if check_positions(board_class, args.max_depth) else 1
+
+    position = next(p for p in PERFT_POSITIONS if p["name"] == args.position)
+    board = position_board(position, board_class)
+    if args.divide:
+        for (start, end), nodes in divide(board, position["player"], args.depth).items():
+            print(f"{start} -> {end} : {nodes}")
+
+    nodes, elapsed = timed_perft(board, position["player"], args.depth)
+    print(f"{position['name']} profondeur {args.depth} : {nodes} positions en {elapsed:.3f} s "
+          f"({nodes / elapsed if elapsed else 0:.0f} pos/s)")
+    expected = position["counts"].get(args.depth)
+    if expected is not None and expected != nodes:
+        print(f"❌ Attendu : {expected}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
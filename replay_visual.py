@@ -1,23 +1,48 @@
 import tkinter as tk
-import pandas as pd
-import ast
+from tkinter import messagebox
+
+import game_index
+import history_reader
 from board import Board
 from gui import GUI
 
+PAGE_SIZE = 100  # Parties affichées par page dans le sélecteur
+SNAPSHOT_INTERVAL = 16  # Demi-coups entre deux positions mémorisées pour la relecture
+
 class ReplayGameWrapper:
-    def __init__(self, root, moves):
+    def __init__(self, root, moves, snapshot_interval=SNAPSHOT_INTERVAL):
         self.root = root
         self.moves = moves
         self.board = Board()
         self.canvas = None
+        self.human_player = None  # Relecture : aucun camp ne peut abandonner
         self.gui = GUI(root, self)
+        self.gui.resign_button.config(state=tk.DISABLED)
         self.current_index = 0
         self.game_over = False
         self.replay_speed = 1000
 
+        # Validation unique de la partie : positions mémorisées tous les N demi-coups,
+        # coups illégaux repérés ; ensuite on rejoue sans revalider
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = []
+        self.invalid_moves = set()
+        self.validate_moves()
+
         self.add_replay_controls()
         self.update_status("Cliquez sur ▶️ pour rejouer la partie.")
 
+    def validate_moves(self):
+        board = Board()
+        for i, (_, start, end, _) in enumerate(self.moves):
+            if i % self.snapshot_interval == 0:
+                self.snapshots.append(board.copy())
+            success, _ = board.move_piece(start, end)
+            if not success:
+                self.invalid_moves.add(i)
+        if len(self.moves) % self.snapshot_interval == 0:
+            self.snapshots.append(board.copy())
+
     def add_replay_controls(self):
         control_frame = tk.Frame(self.root, bg="#2b2b2b")
         control_frame.place(relx=0.99, rely=0.01, anchor="ne")
@@ -30,6 +55,9 @@ class ReplayGameWrapper:
         self.next_button = tk.Button(control_frame, text="▶️ Coup Suivant", command=self.replay_next_move, **button_style)
         self.next_button.pack(side=tk.TOP, pady=2)
 
+        self.previous_button = tk.Button(control_frame, text="◀️ Coup Précédent", command=self.replay_previous_move, **button_style)
+        self.previous_button.pack(side=tk.TOP, pady=2)
+
         self.auto_button = tk.Button(control_frame, text="⏩ Lecture Auto", command=self.start_auto_replay, **button_style)
         self.auto_button.pack(side=tk.TOP, pady=2)
 
@@ -40,37 +68,82 @@ class ReplayGameWrapper:
         self.speed_scale.set(self.replay_speed)
         self.speed_scale.pack()
 
+        tk.Label(control_frame, text="Coup", fg="white", bg="#2b2b2b", font=("Helvetica", 10)).pack(pady=(10, 0))
+        self.position_scale = tk.Scale(control_frame, from_=0, to=len(self.moves), orient=tk.HORIZONTAL,
+                                       bg="#2b2b2b", fg="white", troughcolor="#555", highlightthickness=0,
+                                       length=150, command=lambda val: self.seek(int(val)))
+        self.position_scale.pack()
+
+        jump_frame = tk.Frame(control_frame, bg="#2b2b2b")
+        jump_frame.pack(pady=(5, 0))
+        self.jump_entry = tk.Entry(jump_frame, width=5, font=("Helvetica", 12))
+        self.jump_entry.pack(side=tk.LEFT, padx=(0, 5))
+        self.jump_entry.bind("<Return>", lambda event: self.jump_to_entry())
+        tk.Button(jump_frame, text="Aller", command=self.jump_to_entry, **button_style).pack(side=tk.LEFT)
+
     def set_speed(self, val):
         self.replay_speed = int(val)
 
     def update_status(self, message):
         self.gui.update_status(message)
 
-    def replay_next_move(self):
-        if self.current_index >= len(self.moves):
-            self.update_status("🎉 Relecture terminée !")
+    def move_description(self, index):
+        player, start, end, _ = self.moves[index]
+        label = "Le joueur joue" if player == 'B' else "L'IA joue"
+        return f"{label} : {start} -> {end}"
+
+    def seek(self, index):
+        """
+        Shows the position after the first `index` moves of the game.
+        Starts from the nearest snapshot and replays at most snapshot_interval
+        moves with Board.make_move (the moves were validated once at load).
+        """
+        index = max(0, min(index, len(self.moves)))
+        if index == self.current_index:
             return
 
-        move = self.moves.iloc[self.current_index]
+        if index == self.current_index + 1:
+            # Lecture coup par coup : on continue depuis la position affichée
+            board, first = self.board, self.current_index
+        else:
+            snapshot = index // self.snapshot_interval
+            board, first = self.snapshots[snapshot].copy(), snapshot * self.snapshot_interval
+        for i in range(first, index):
+            if i not in self.invalid_moves:
+                board.make_move(self.moves[i][1], self.moves[i][2])
+
+        if board is self.board and index - 1 not in self.invalid_moves:
+            self.gui.append_history(self.move_description(index - 1))
+        elif board is not self.board:
+            self.gui.set_history([self.move_description(i) for i in range(index) if i not in self.invalid_moves])
+        self.board = self.gui.board = board
+        self.current_index = index
+        self.gui.draw_board()
+        self.position_scale.set(index)
+
+        if index == 0:
+            self.update_status("Position initiale")
+        else:
+            player, start, end, _ = self.moves[index - 1]
+            if index - 1 in self.invalid_moves:
+                self.update_status(f"⚠️ Mouvement invalide : {player} {start} → {end}")
+            else:
+                self.update_status(f"{player} : {start} → {end}")
+
+    def jump_to_entry(self):
         try:
-            start = ast.literal_eval(str(move["start"]))
-            end = ast.literal_eval(str(move["end"]))
-            player = move["player"]
-        except Exception as e:
-            self.update_status(f"⚠️ Erreur parsing du coup {self.current_index}: {e}")
-            return
+            self.seek(int(self.jump_entry.get()))
+        except ValueError:
+            self.update_status("⚠️ Numéro de coup invalide")
 
-        success, _ = self.board.move_piece(start, end)
-        if not success:
-            self.update_status(f"⚠️ Mouvement invalide : {player} {start} → {end}")
-        else:
-            self.gui.draw_board()
-            self.gui.update_status(f"{player} : {start} → {end}")
-            if hasattr(self.gui, 'append_history'):
-                label = "Le joueur joue" if player == 'B' else "L'IA joue"
-                self.gui.append_history(f"{label} : {start} -> {end}")
+    def replay_next_move(self):
+        if self.current_index >= len(self.moves):
+            self.update_status("🎉 Relecture terminée !")
+            return
+        self.seek(self.current_index + 1)
 
-        self.current_index += 1
+    def replay_previous_move(self):
+        self.seek(self.current_index - 1)
 
     def start_auto_replay(self):
         if self.current_index < len(self.moves):
@@ -79,46 +152,75 @@ class ReplayGameWrapper:
         else:
             self.update_status("🎉 Relecture automatique terminée !")
 
-def select_game_to_replay(csv_file="data/game_history.csv"):
-    try:
-        df = pd.read_csv(csv_file)
-        df.columns = df.columns.str.strip().str.lower()
+def game_label(summary):
+    winner = summary["winner"] or "-"
+    return f"Partie {summary['game_id']:>6}  {winner:<7}{summary['plies']:>4} coups  {summary['date']}"
 
-        start_indices = df[df["turn"].str.contains("---debut-partie", na=False)].index.tolist()
-        end_indices = df[df["turn"].str.contains("---fin-partie", na=False)].index.tolist()
 
-        if not start_indices or not end_indices:
+def select_game_to_replay(csv_file="data/game_history.csv", page_size=PAGE_SIZE):
+    index = None
+    try:
+        # La liste vient de l'index (une page à la fois) : seule la partie choisie est lue dans le CSV
+        index = game_index.load_index(csv_file)
+
+        if not index:
             print("Aucune partie trouvée.")
             return
 
-        games = []
-        for i, (start, end) in enumerate(zip(start_indices, end_indices), 1):
-            game_data = df.iloc[start+1:end]  # skip start marker
-            games.append((i, game_data))
-
         root = tk.Tk()
         root.title("Sélectionner une partie")
-        root.geometry("400x300")
+        root.geometry("560x420")
 
         tk.Label(root, text="Choisissez une partie à rejouer:", font=("Helvetica", 14)).pack(pady=10)
         listbox = tk.Listbox(root, font=("Courier", 12))
         listbox.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
-        for i in range(len(games)):
-            listbox.insert(tk.END, f"Partie {i+1}")
+        pages = (len(index) + page_size - 1) // page_size
+        state = {"page": 0, "summaries": [], "record": None}
+
+        nav_frame = tk.Frame(root)
+        nav_frame.pack()
+        page_label = tk.Label(nav_frame, font=("Helvetica", 11))
+
+        def show_page(page):
+            state["page"] = max(0, min(page, pages - 1))
+            state["summaries"] = index.page(state["page"] * page_size, page_size)
+            listbox.delete(0, tk.END)
+            for summary in state["summaries"]:
+                listbox.insert(tk.END, game_label(summary))
+            page_label.config(text=f"Page {state['page'] + 1} / {pages}")
+
+        tk.Button(nav_frame, text="◀", command=lambda: show_page(state["page"] - 1)).pack(side=tk.LEFT)
+        page_label.pack(side=tk.LEFT, padx=10)
+        tk.Button(nav_frame, text="▶", command=lambda: show_page(state["page"] + 1)).pack(side=tk.LEFT)
+        show_page(0)
 
         def launch_replay():
             selection = listbox.curselection()
             if selection:
-                game_index = selection[0]
+                summary = state["summaries"][selection[0]]
+                record = history_reader.read_game(csv_file, summary["offset"], summary["length"])
+                if record is None:
+                    # Index en retard sur un CSV réécrit : la plage lue ne contient plus de partie
+                    messagebox.showerror("Relecture", f"Partie {summary['game_id']} introuvable dans l'historique.")
+                    return
+                state["record"] = record
                 root.destroy()
-                replay_root = tk.Tk()
-                replay_root.attributes('-fullscreen', True)
-                ReplayGameWrapper(replay_root, games[game_index][1])
-                replay_root.mainloop()
 
         tk.Button(root, text="Rejouer la partie", command=launch_replay, font=("Helvetica", 12), bg="#444", fg="white").pack(pady=10)
         root.mainloop()
 
+        # Le sélecteur est fermé : l'index n'est plus utile pendant la relecture
+        index.close()
+        index = None
+        if state["record"] is not None:
+            replay_root = tk.Tk()
+            replay_root.attributes('-fullscreen', True)
+            ReplayGameWrapper(replay_root, history_reader.move_tuples(state["record"].moves))
+            replay_root.mainloop()
+
     except Exception as e:
         print("Erreur pendant la sélection/relecture de partie:", e)
+    finally:
+        if index is not None:
+            index.close()
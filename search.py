@@ -0,0 +1,227 @@
+import time
+import tablebase
+from board import ZOBRIST_SIDE
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+WIN_SCORE = 100000
+MATE_BOUND = WIN_SCORE - 1000   # Au-delà : score de gain/perte forcé (dépend du ply)
+MAN_VALUE = 100
+KING_VALUE = 300
+
+
+class SearchTimeout(Exception):
+    # Levée quand le budget de temps du coup est épuisé ou la recherche annulée
+    pass
+
+
+def opponent(player):
+    return "B" if player == "N" else "N"
+
+
+class AlphaBetaSearch:
+    """
+    Negamax search with alpha-beta pruning and iterative deepening.
+    Each call to best_move searches depth 1, 2, 3... until the per-move time
+    budget runs out and returns the best move of the last completed depth.
+    A multi-jump continuation (mandatory_jump_piece set after a capture) is
+    searched as part of the same turn: the same side moves again.
+    """
+
+    def __init__(self, time_limit_ms=200, max_depth=64, tt_size_mb=16):
+        self.time_limit_ms = time_limit_ms
+        self.max_depth = max_depth
+        self.history_table = {}      # (joueur, départ, arrivée) -> bonus de tri
+        # Conservée d'un coup à l'autre (et d'une passe de profondeur à l'autre)
+        self.tt = TranspositionTable(size_mb=tt_size_mb)
+        self.nodes = 0
+        self.last_depth = 0
+        self.deadline = None
+        self.stop_event = None       # threading.Event : annulation depuis un autre thread
+        self.tablebase = None        # tablebase.Tablebase : finales résolues, consultées en priorité
+
+    def evaluate(self, board, player):
+        # Matériel + avancement des pions, du point de vue de `player`
+        score = 0
+        grid = board.board
+        for side, squares in board.pieces.items():
+            sign = 1 if side == player else -1
+            for row, col in squares:
+                piece = grid[row][col]
+                if 'D' in piece:
+                    value = KING_VALUE
+                else:
+                    value = MAN_VALUE + (7 - row if piece == 'B' else row) * 2
+                score += sign * value
+        return score
+
+    def order_moves(self, board, player, moves, first=None):
+        def key(move):
+            start, end = move
+            if move == first:
+                return -WIN_SCORE
+            bonus = self.history_table.get((player, start, end), 0)
+            # Les prises d'abord (plusieurs cases parcourues), puis la table d'historique
+            if abs(start[0] - end[0]) > 1:
+                bonus += 10000
+            piece = board.board[start[0]][start[1]]
+            if piece in ('B', 'N') and end[0] in (0, 7):
+                bonus += 5000
+            return -bonus
+        return sorted(moves, key=key)
+
+    def check_time(self):
+        self.nodes += 1
+        if self.nodes & 31 == 0 and (time.perf_counter() > self.deadline or
+                                     (self.stop_event is not None and self.stop_event.is_set())):
+            raise SearchTimeout()
+
+    @staticmethod
+    def position_key(board, player):
+        return board.zobrist_key ^ (ZOBRIST_SIDE if player == "N" else 0)
+
+    @staticmethod
+    def tablebase_score(value, ply):
+        # Gain ou perte en d tours d'après les tables : score de gain forcé, plus fort si la fin est proche
+        if value > 0:
+            return WIN_SCORE - ply - (tablebase.WIN - value)
+        if value < 0:
+            return -WIN_SCORE + ply + (tablebase.WIN + value)
+        return 0
+
+    @staticmethod
+    def to_tt(score, ply):
+        # Les scores de gain forcé sont stockés relativement au nœud, pas à la racine
+        if score > MATE_BOUND:
+            return score + ply
+        if score < -MATE_BOUND:
+            return score - ply
+        return score
+
+    @staticmethod
+    def from_tt(score, ply):
+        if score > MATE_BOUND:
+            return score - ply
+        if score < -MATE_BOUND:
+            return score + ply
+        return score
+
+    def negamax(self, board, player, depth, alpha, beta, ply):
+        self.check_time()
+
+        if self.tablebase is not None and self.tablebase.covers(board):
+            value = self.tablebase.probe(board, player)
+            if value is not None:
+                return self.tablebase_score(value, ply)
+
+        key = self.position_key(board, player)
+        alpha_orig = alpha
+        tt_move = None
+        entry = self.tt.probe(key)
+        if entry:
+            tt_depth, flag, value, tt_move = entry
+            if tt_depth >= depth:
+                value = self.from_tt(value, ply)
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        moves = board.generate_legal_moves(player)
+        if not moves:
+            return -WIN_SCORE + ply
+
+        # Les prises sont obligatoires : on les prolonge au-delà de l'horizon
+        if depth <= 0 and board.mandatory_jump_piece is None and not board.has_capture(player):
+            value = self.evaluate(board, player)
+            self.tt.store(key, 0, EXACT, value, None)
+            return value
+
+        best, best_move = -WIN_SCORE * 2, None
+        for start, end in self.order_moves(board, player, moves, first=tt_move):
+            undo = board.make_move(start, end)
+            try:
+                if board.mandatory_jump_piece:
+                    score = self.negamax(board, player, depth, alpha, beta, ply + 1)
+                else:
+                    score = -self.negamax(board, opponent(player), depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move(undo)
+
+            if score > best:
+                best, best_move = score, (start, end)
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                move_key = (player, start, end)
+                self.history_table[move_key] = self.history_table.get(move_key, 0) + depth * depth
+                break
+
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, flag, self.to_tt(best, ply), best_move)
+        return best
+
+    def search_root(self, board, player, depth, moves):
+        alpha, beta = -WIN_SCORE * 2, WIN_SCORE * 2
+        best_move, best_score = moves[0], -WIN_SCORE * 2
+        for start, end in moves:
+            undo = board.make_move(start, end)
+            try:
+                if board.mandatory_jump_piece:
+                    score = self.negamax(board, player, depth - 1, alpha, beta, 1)
+                else:
+                    score = -self.negamax(board, opponent(player), depth - 1, -beta, -alpha, 1)
+            finally:
+                board.unmake_move(undo)
+            if score > best_score:
+                best_move, best_score = (start, end), score
+            alpha = max(alpha, score)
+        return best_move, best_score
+
+    def best_move(self, board, player, stop_event=None):
+        """
+        Searches the position with iterative deepening under the time budget.
+        Args:
+            board: Board (or BitBoard) to search; moves are made and unmade in
+                place, so the position is the same when the search returns.
+            player (str): 'B' or 'N'.
+            stop_event (threading.Event, optional): Stops the search as soon as
+                it is set; the best move of the last completed depth is returned.
+        Returns:
+            tuple or None: (start, end) of the best move found, None if no legal move.
+        """
+        moves = board.generate_legal_moves(player)
+        if not moves:
+            return None
+        if len(moves) == 1:
+            return moves[0]
+
+        self.deadline = time.perf_counter() + self.time_limit_ms / 1000
+        self.stop_event = stop_event
+        self.nodes = 0
+        self.last_depth = 0
+        self.tt.new_search()
+        # Vieillissement de la table d'historique entre deux coups
+        self.history_table = {key: value // 2 for key, value in self.history_table.items() if value > 1}
+
+        entry = self.tt.probe(self.position_key(board, player))
+        best = entry[3] if entry and entry[3] in moves else self.order_moves(board, player, moves)[0]
+        for depth in range(1, self.max_depth + 1):
+            ordered = self.order_moves(board, player, moves, first=best)
+            try:
+                best, score = self.search_root(board, player, depth, ordered)
+            except SearchTimeout:
+                break
+            self.last_depth = depth
+            self.tt.store(self.position_key(board, player), depth, EXACT, score, best)
+            if abs(score) >= MATE_BOUND:
+                break  # Gain ou perte forcée trouvé : inutile d'aller plus loin
+        return best
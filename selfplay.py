@@ -0,0 +1,133 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import binary_history
+import history
+import opening_book
+from board import Board
+from controller import GameController, MAX_PLIES, QUIET_PLY_LIMIT
+from ia import CheckersAI, AI_MODES, MODE_HISTORY
+
+# Auto-jeu IA vs IA sans interface : aucune dépendance à tkinter, les parties
+# sont réparties sur un pool de processus puis ajoutées à l'historique.
+
+_worker_ai = None  # Une IA par processus, créée une seule fois (historique chargé une fois)
+
+
+def _init_worker(history_file, mode, time_limit_ms):
+    global _worker_ai
+    _worker_ai = CheckersAI(history_file=history_file, mode=mode, time_limit_ms=time_limit_ms)
+
+
+def prepare_history(history_file):
+    """
+    Brings the binary mirror and the opening book of `history_file` up to date
+    in the calling process, before a pool starts: each worker's CheckersAI then
+    finds them current and only reads them.
+    """
+    if os.path.exists(history_file):
+        binary_history.csv_to_binary(history_file)
+        opening_book.update_book(history_file)
+
+
+def play_game(ai, seed, max_plies=MAX_PLIES, random_plies=4, quiet_ply_limit=QUIET_PLY_LIMIT, black_ai=None):
+    """
+    Plays one AI-vs-AI game on a bare Board.
+    Args:
+        ai (CheckersAI): AI used for both sides.
+        seed (int): Seed of the random opening and tie-breaks, for reproducible games.
+        max_plies (int): Upper bound on the game length; a game reaching it is a draw.
+        random_plies (int): Number of opening plies played at random, so that
+            games differ from one seed to the next.
+        quiet_ply_limit (int): Plies without capture or man move before a draw.
+        black_ai (CheckersAI, optional): AI playing black; `ai` then plays white only.
+    Returns:
+        tuple: (moves, winner) as expected by history.append_games.
+    """
+    random.seed(seed)
+    controller = GameController(Board(), max_plies=max_plies, quiet_ply_limit=quiet_ply_limit)
+    players = {"B": ai, "N": black_ai or ai}
+
+    # Les règles de nulle du contrôleur terminent toujours la partie
+    while not controller.game_over:
+        if len(controller.moves) < random_plies:
+            legal_moves = controller.board.generate_legal_moves(controller.current_player)
+            controller.play_move(*random.choice(legal_moves))
+        else:
+            controller.play_ai_move(players[controller.current_player])
+    return controller.moves, controller.winner
+
+
+def _play_seed(args):
+    seed, max_plies, random_plies, quiet_ply_limit = args
+    return seed, play_game(_worker_ai, seed, max_plies, random_plies, quiet_ply_limit)
+
+
+def run_selfplay(games, workers=None, seed=0, mode=MODE_HISTORY, time_limit_ms=200,
+                 max_plies=MAX_PLIES, random_plies=4, history_file=history.HISTORY_FILE, batch_size=50,
+                 quiet_ply_limit=QUIET_PLY_LIMIT):
+    """
+    Plays `games` AI-vs-AI games across a process pool and appends them to the
+    history, then extends the opening book with them.
+    Game i uses seed `seed + i`. Results are merged by this (single) process,
+    in seed order, every `batch_size` games.
+    Returns:
+        dict: Counts of games played and recorded, wins per side and draws.
+    """
+    summary = {"parties": 0, "enregistrées": 0,
+               history.WINNER_BLACK: 0, history.WINNER_WHITE: 0, history.WINNER_DRAW: 0}
+    pending = []
+
+    prepare_history(history_file)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(history_file, mode, time_limit_ms)) as pool:
+        tasks = ((seed + i, max_plies, random_plies, quiet_ply_limit) for i in range(games))
+        for _, result in pool.map(_play_seed, tasks, chunksize=max(1, min(16, games // 32))):
+            summary["parties"] += 1
+            summary[result[1]] += 1
+            pending.append(result)
+            if len(pending) >= batch_size:
+                history.append_games(pending, history_file)
+                summary["enregistrées"] += len(pending)
+                pending = []
+
+    if pending:
+        history.append_games(pending, history_file)
+        summary["enregistrées"] += len(pending)
+    # Les nouvelles parties prolongent la bibliothèque d'ouvertures
+    if summary["enregistrées"]:
+        opening_book.update_book(history_file)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Auto-jeu IA vs IA sans interface graphique.")
+    parser.add_argument("-n", "--games", type=int, default=100, help="Nombre de parties à jouer")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="Nombre de processus")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de la première partie")
+    parser.add_argument("--mode", choices=AI_MODES, default=MODE_HISTORY, help="Mode de l'IA")
+    parser.add_argument("--time-limit", type=int, default=200, help="Budget par coup en ms (mode alphabeta)")
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES,
+                        help="Nombre maximal de demi-coups par partie (nulle au-delà)")
+    parser.add_argument("--quiet-plies", type=int, default=QUIET_PLY_LIMIT,
+                        help="Demi-coups sans prise ni coup de pion avant la nulle")
+    parser.add_argument("--random-plies", type=int, default=4, help="Demi-coups d'ouverture joués au hasard")
+    parser.add_argument("--output", default=history.HISTORY_FILE, help="Fichier d'historique à compléter")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    summary = run_selfplay(args.games, workers=args.workers, seed=args.seed, mode=args.mode,
+                           time_limit_ms=args.time_limit, max_plies=args.max_plies,
+                           random_plies=args.random_plies, history_file=args.output,
+                           quiet_ply_limit=args.quiet_plies)
+    elapsed = time.perf_counter() - started
+    print(f"{summary['parties']} parties en {elapsed:.1f} s "
+          f"({summary['parties'] / elapsed if elapsed else 0:.1f} parties/s)")
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,13 @@ import os
 import pandas as pd
 import matplotlib.pyplot as plt
 
+import history_reader
+import stats_cache
+
 class GameStats:
-    def __init__(self, result_file="data/game_history.csv"):
+    def __init__(self, result_file="data/game_history.csv", cache_file=stats_cache.CACHE_FILE):
         self.result_file = result_file
+        self.cache_file = cache_file
         self.data = []
 
     def record_move(self, player, move):
@@ -24,82 +28,46 @@ class GameStats:
         except Exception as e:
             print(f"Erreur lors de la sauvegarde : {e}")
 
+    @staticmethod
+    def compute_stats(df):
+        """
+        Computes every aggregate shown by show_stats from a full history DataFrame.
+        Args:
+            df: History DataFrame with lower-case columns.
+        Returns:
+            dict: winners, move_counts, phase_counts, win_effectiveness, turn_df, avg_turns.
+        """
+        return stats_cache.summarize(stats_cache.aggregate(*history_reader.compact(df)))
+
     def show_stats(self):
         if not os.path.exists(self.result_file):
             print("❌ Le fichier game_history.csv n'existe pas.")
             return
 
+        # Agrégats persistés : seules les parties ajoutées depuis la dernière fois sont lues
         try:
-            df = pd.read_csv(self.result_file, encoding="utf-8-sig")
+            aggregates = stats_cache.update(self.result_file, self.cache_file)
         except Exception as e:
             print("❌ Erreur de lecture du fichier :", e)
             return
 
-        df.columns = df.columns.str.strip().str.lower()
-
-        if not {"turn", "start", "end", "player", "captured piece"}.issubset(df.columns):
-            print("❌ Colonnes manquantes dans game_history.csv")
-            return
+        self.plot_stats(stats_cache.summarize(aggregates))
 
-        df["move"] = df.apply(lambda row: f"{row['start']}->{row['end']}" if pd.notna(row['start']) and pd.notna(row['end']) else None, axis=1)
-
-        moves_df = df[df["turn"].apply(lambda x: str(x).isdigit()) & df["move"].notna()].copy()
-        moves_df["turn"] = moves_df["turn"].astype(int)
-
-        def phase_label(turn, max_turn):
-            if turn <= max_turn * 0.33:
-                return "Début"
-            elif turn <= max_turn * 0.66:
-                return "Milieu"
-            else:
-                return "Fin"
-
-        result_rows = df[df["turn"].str.lower() == "résultat"]
-        winners = result_rows["captured piece"].value_counts()
-
-        move_counts = moves_df["move"].value_counts().head(10)
-
-        game_ids = df[df["turn"].str.contains("---debut-partie", na=False)].index.tolist()
-        end_ids = df[df["turn"].str.contains("---fin-partie", na=False)].index.tolist()
-
-        phases = []
-        turn_by_game = []
-        game_stats = []
-        for game_number, (start_idx, end_idx) in enumerate(zip(game_ids, end_ids), 1):
-            game = df.iloc[start_idx + 1:end_idx]
-            game_moves = game[game["turn"].apply(lambda x: str(x).isdigit())].copy()
-            game_moves["turn"] = game_moves["turn"].astype(int)
-            max_turn = game_moves["turn"].max()
-            winner = df.loc[end_idx - 1, "captured piece"]
-            game_moves["phase"] = game_moves["turn"].apply(lambda x: phase_label(x, max_turn))
-            game_moves["move"] = game_moves.apply(lambda row: f"{row['start']}->{row['end']}" if pd.notna(row['start']) and pd.notna(row['end']) else None, axis=1)
-            game_moves["winner"] = winner
-            phases.append(game_moves)
-            turn_by_game.append({"game_id": game_number, "turns": max_turn})
-            game_stats.append({"winner": winner, "turns": max_turn})
-
-        phase_df = pd.concat(phases)
-        turn_df = pd.DataFrame(turn_by_game)
-        stats_df = pd.DataFrame(game_stats)
-
-        phase_counts = phase_df.groupby(["phase", "move"]).size().unstack(fill_value=0)
-        phase_counts = phase_counts.T.apply(lambda x: x.sort_values(ascending=False).head(3))
-
-        win_moves = phase_df.copy()
-        win_moves = win_moves[win_moves["player"] == "N"]  # Suppose que N est IA gagnante
-        win_moves = win_moves[win_moves["winner"] == "IA"]
-        win_effectiveness = win_moves.groupby(["phase", "move"]).size().unstack(fill_value=0)
-        win_effectiveness = win_effectiveness.T.apply(lambda x: x.sort_values(ascending=False).head(3))
-
-        # Moyenne des coups par gagnant
-        avg_turns = stats_df.groupby("winner")["turns"].mean().sort_values()
+    def plot_stats(self, stats):
+        winners = stats["winners"]
+        move_counts = stats["move_counts"]
+        phase_counts = stats["phase_counts"]
+        win_effectiveness = stats["win_effectiveness"]
+        turn_df = stats["turn_df"]
+        avg_turns = stats["avg_turns"]
 
         # Affichage des graphiques
         fig, axs = plt.subplots(3, 2, figsize=(14, 14))
 
-        winners.plot(kind="bar", ax=axs[0][0], title="Victoires par camp", color="skyblue")
-        axs[0][0].set_ylabel("Nombre de victoires")
-        axs[0][0].set_xlabel("Camp gagnant")
+        winners.plot(kind="bar", ax=axs[0][0], title="Résultats des parties (victoires par camp, nulles)",
+                     color="skyblue")
+        axs[0][0].set_ylabel("Nombre de parties")
+        axs[0][0].set_xlabel("Résultat")
 
         move_counts.plot(kind="barh", ax=axs[0][1], title="Top 10 des coups les plus joués", color="lightgreen")
         axs[0][1].set_xlabel("Fréquence")
@@ -0,0 +1,167 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import history
+import history_reader
+
+# Agrégats de statistiques persistés et mis à jour de façon incrémentale :
+# seules les parties ajoutées à game_history.csv depuis la dernière mise à
+# jour sont lues puis ajoutées aux compteurs déjà enregistrés.
+
+CACHE_FILE = "data/stats_cache.json"
+CACHE_VERSION = 3
+
+
+def aggregate(games, moves):
+    """
+    Computes full (mergeable) aggregates of a slice of the history in one vectorised pass.
+    Args:
+        games, moves: Compact frames of whole games, see history_reader.compact.
+    Returns:
+        dict: winners, moves, phase_moves, win_phase_moves (Series of counts)
+        and turns (DataFrame of turns and winner per game, in file order).
+    """
+    game = moves["game"].to_numpy(dtype=np.intp)
+    turn = moves["turn"].to_numpy(dtype=np.int64)
+    winner = games["winner"].astype(object).to_numpy()[game]
+    player = moves["player"].astype(object).to_numpy()
+    labels = history_reader.move_labels(moves)
+
+    # Phase de chaque coup relative au nombre de tours de sa partie
+    max_turn = np.zeros(len(games), dtype=np.int64)
+    np.maximum.at(max_turn, game, turn)
+    phase = np.select([turn <= max_turn[game] * 0.33, turn <= max_turn[game] * 0.66],
+                      ["Début", "Milieu"], default="Fin")
+    frame = pd.DataFrame({"phase": phase, "move": labels})
+
+    # Une partie sans coup (abandon immédiat) compte aussi, avec un nombre de tours vide
+    turns = pd.DataFrame({
+        "turns": np.where(games["plies"].to_numpy() > 0, max_turn, np.nan),
+        "winner": games["winner"].astype(object).to_numpy(),
+    })
+
+    win_moves = frame[(player == "N") & (winner == history.WINNER_BLACK)]  # Coups noirs des victoires noires
+
+    return {
+        "winners": games["winner"].astype(object).value_counts(),
+        "moves": frame["move"].value_counts(),
+        "phase_moves": frame.groupby(["phase", "move"]).size(),
+        "win_phase_moves": win_moves.groupby(["phase", "move"]).size(),
+        "turns": turns,
+    }
+
+
+def summarize(aggregates):
+    """
+    Turns full aggregates into the frames plotted by GameStats.plot_stats
+    (top 10 moves, top 3 moves per phase, turns per game, average turns per winner).
+    """
+    def top_by_phase(counts):
+        if counts.empty:
+            return pd.DataFrame()
+        table = counts.unstack(level="phase", fill_value=0)
+        return table.apply(lambda x: x.sort_values(ascending=False).head(3))
+
+    turns = aggregates["turns"]
+    return {
+        "winners": aggregates["winners"],
+        "move_counts": aggregates["moves"].sort_values(ascending=False, kind="stable").head(10),
+        "phase_counts": top_by_phase(aggregates["phase_moves"]),
+        "win_effectiveness": top_by_phase(aggregates["win_phase_moves"]),
+        "turn_df": pd.DataFrame({"game_id": range(1, len(turns) + 1), "turns": turns["turns"].values}),
+        "avg_turns": turns.groupby("winner")["turns"].mean().sort_values(),
+    }
+
+
+def merge(old, new):
+    # Les compteurs s'additionnent, les parties s'ajoutent à la suite
+    merged = {}
+    for key in ("winners", "moves", "phase_moves", "win_phase_moves"):
+        merged[key] = old[key].add(new[key], fill_value=0).astype(int)
+    merged["turns"] = pd.concat([old["turns"], new["turns"]], ignore_index=True)
+    return merged
+
+
+def empty_aggregates():
+    return aggregate(*history_reader.compact(pd.DataFrame(columns=history_reader.COLUMNS, dtype=object)))
+
+
+def to_json(aggregates, offset, size):
+    def pairs(series):
+        return [[list(key) if isinstance(key, tuple) else key, int(value)] for key, value in series.items()]
+
+    turns = aggregates["turns"]
+    return {
+        "version": CACHE_VERSION,
+        "offset": offset,          # Octets de game_history.csv déjà agrégés
+        "size": size,
+        "winners": pairs(aggregates["winners"]),
+        "moves": pairs(aggregates["moves"]),
+        "phase_moves": pairs(aggregates["phase_moves"]),
+        "win_phase_moves": pairs(aggregates["win_phase_moves"]),
+        "turns": [[None if pd.isna(t) else int(t), None if pd.isna(w) else w]
+                  for t, w in zip(turns["turns"], turns["winner"])],
+    }
+
+
+def from_json(data):
+    def series(pairs, names=None):
+        if not pairs:
+            index = pd.MultiIndex.from_tuples([], names=names) if names else pd.Index([])
+            return pd.Series([], index=index, dtype=int)
+        keys = [tuple(key) if isinstance(key, list) else key for key, _ in pairs]
+        index = pd.MultiIndex.from_tuples(keys, names=names) if names else pd.Index(keys)
+        return pd.Series([value for _, value in pairs], index=index, dtype=int)
+
+    return {
+        "winners": series(data["winners"]),
+        "moves": series(data["moves"]),
+        "phase_moves": series(data["phase_moves"], names=["phase", "move"]),
+        "win_phase_moves": series(data["win_phase_moves"], names=["phase", "move"]),
+        "turns": pd.DataFrame(data["turns"], columns=["turns", "winner"]),
+    }
+
+
+def update(csv_path=history.HISTORY_FILE, cache_path=CACHE_FILE):
+    """
+    Loads the persisted aggregates and folds in only the games appended to
+    the history since the last update.
+    Returns:
+        dict: Full aggregates (see aggregate), or None if there is no history.
+    """
+    if not os.path.exists(csv_path):
+        return None
+    size = os.path.getsize(csv_path)
+
+    aggregates, offset = None, 0
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # Fichier réécrit ou tronqué depuis : on repart de zéro
+        if data.get("version") == CACHE_VERSION and data["offset"] <= size:
+            aggregates, offset = from_json(data), data["offset"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if aggregates is not None and offset == size:
+        return aggregates
+
+    # Parties ajoutées depuis la dernière mise à jour, lues par blocs
+    for chunk in history_reader.iter_chunks(csv_path, start_offset=offset):
+        new = aggregate(chunk.games, chunk.moves)
+        aggregates = new if aggregates is None else merge(aggregates, new)
+        offset = chunk.end_offset
+    if aggregates is None:
+        aggregates = empty_aggregates()
+
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(to_json(aggregates, offset, size), f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+    return aggregates
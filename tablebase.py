@@ -0,0 +1,463 @@
+import argparse
+import itertools
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from board import Board
+
+# Tables de finales (fichier data/endgame.tb) : pour chaque position d'au plus
+# MAX_PIECES pièces, le résultat avec le meilleur jeu des deux camps et le
+# nombre de tours jusqu'à la fin, calculés hors ligne par analyse rétrograde
+# avec les règles exactes de board.Board (prise obligatoire, dames volantes,
+# rafles). Une rafle compte pour un seul tour, comme dans perft.py.
+#
+# Les positions sont rangées par « matériel » (pions blancs, dames blanches,
+# pions noirs, dames noires). Dans une classe, l'index d'une position se
+# calcule directement à partir des cases de chaque groupe de pièces : une
+# consultation est un accès à un tableau, sans recherche.
+#
+#   En-tête (16 octets) : magie "DAMT", version, nombre maximal de pièces, nombre de classes
+#   Répertoire (24 octets par classe) : matériel, position et nombre de valeurs de la classe
+#   Valeurs (int16, 2 par placement : trait aux blancs puis aux noirs), du point de vue du camp au trait :
+#     WIN - d : gain en d tours, -(WIN - d) : perte en d tours, 0 : nulle, INVALID : placement impossible
+
+TABLEBASE_FILE = "data/endgame.tb"
+MAX_PIECES = 4
+
+MAGIC = b"DAMT"
+VERSION = 2  # 2 : un long déplacement de dame sans prise n'ouvre plus de rafle
+HEADER = struct.Struct("<4sBB2xI4x")
+HEADER_SIZE = HEADER.size
+CLASS_ENTRY = struct.Struct("<4B4xQQ")
+
+WIN = 30000
+INVALID = -32768
+
+GROUPS = ("B", "BD", "N", "ND")
+DARK_SQUARES = [(row, col) for row in range(8) for col in range(8) if (row + col) % 2 == 1]
+# Un pion ne reste jamais sur sa ligne de promotion : ces cases sont exclues
+GROUP_SQUARES = {
+    "B": [square for square in DARK_SQUARES if square[0] != 0],
+    "BD": DARK_SQUARES,
+    "N": [square for square in DARK_SQUARES if square[0] != 7],
+    "ND": DARK_SQUARES,
+}
+
+
+def opponent(player):
+    return "B" if player == "N" else "N"
+
+
+@lru_cache(maxsize=None)
+def combinations(group, count):
+    # Placements de `count` pièces d'un groupe, et leur rang (cases triées)
+    combos = list(itertools.combinations(GROUP_SQUARES[group], count))
+    return combos, {combo: rank for rank, combo in enumerate(combos)}
+
+
+@lru_cache(maxsize=None)
+def class_shape(material):
+    return tuple(math.comb(len(GROUP_SQUARES[group]), count) for group, count in zip(GROUPS, material))
+
+
+def class_size(material):
+    # Nombre de valeurs de la classe (deux par placement : un par camp au trait)
+    return math.prod(class_shape(material)) * 2
+
+
+def material_classes(max_pieces):
+    """
+    Lists the materials with one to `max_pieces` pieces per board and at
+    least one piece per side, in solving order: fewer pieces first, then
+    fewer men. A capture or a promotion always leads to an earlier class.
+    """
+    classes = []
+    for material in itertools.product(range(max_pieces + 1), repeat=4):
+        b_men, b_kings, n_men, n_kings = material
+        if b_men + b_kings and n_men + n_kings and sum(material) <= max_pieces:
+            classes.append(material)
+    return sorted(classes, key=lambda m: (sum(m), m[0] + m[2], m))
+
+
+def board_groups(board):
+    # Cases triées de chaque groupe de pièces (même ordre que GROUPS)
+    grid = board.board
+    groups = {group: [] for group in GROUPS}
+    for player in ("B", "N"):
+        for row, col in board.pieces[player]:
+            groups[grid[row][col]].append((row, col))
+    return [sorted(groups[group]) for group in GROUPS]
+
+
+def position_index(groups, player):
+    """
+    Computes the material class and the index of a position in its table.
+    Returns:
+        tuple: (material, index), index None if a man stands on its promotion row.
+    """
+    material = tuple(len(squares) for squares in groups)
+    index = 0
+    for group, squares, size in zip(GROUPS, groups, class_shape(material)):
+        rank = combinations(group, len(squares))[1].get(tuple(squares))
+        if rank is None:
+            return material, None
+        index = index * size + rank
+    return material, index * 2 + (player == "N")
+
+
+def parent_value(value):
+    # Valeur d'une position pour le camp qui vient de jouer : un tour de plus
+    if value > 0:
+        return -value + 1
+    if value < 0:
+        return -value - 1
+    return 0
+
+
+def position_value(board, player, tables):
+    """
+    Looks up a position, following a multi-jump in progress to its end.
+    Args:
+        board: Board (or BitBoard).
+        player (str): Side to move.
+        tables (dict): material -> NumPy int16 array of values.
+    Returns:
+        int or None: Value for `player` (see the file layout above), None if
+        the material is not in the tables.
+    """
+    if board.mandatory_jump_piece:
+        # Rafle en cours : le même camp rejoue, la prise mène à une classe plus petite
+        best = None
+        for start, end in board.generate_legal_moves(player):
+            undo = board.make_move(start, end)
+            if board.mandatory_jump_piece:
+                value = position_value(board, player, tables)
+            else:
+                value = position_value(board, opponent(player), tables)
+                value = None if value is None else parent_value(value)
+            board.unmake_move(undo)
+            if value is None:
+                return None
+            best = value if best is None else max(best, value)
+        return -WIN if best is None else best
+
+    if not board.pieces[player]:
+        return -WIN
+    material, index = position_index(board_groups(board), player)
+    table = tables.get(material)
+    if table is None or index is None:
+        return None
+    value = int(table[index])
+    return None if value == INVALID else value
+
+
+def best_move(board, player, tables):
+    """
+    Picks the move that keeps the best tablebase result: the fastest win,
+    else a draw, else the slowest loss.
+    Returns:
+        tuple or None: ((start, end), value) or None if the position is not covered.
+    """
+    best = None
+    for start, end in board.generate_legal_moves(player):
+        undo = board.make_move(start, end)
+        if board.mandatory_jump_piece:
+            value = position_value(board, player, tables)
+        else:
+            value = position_value(board, opponent(player), tables)
+            value = None if value is None else parent_value(value)
+        board.unmake_move(undo)
+        if value is None:
+            return None
+        if best is None or value > best[1]:
+            best = ((start, end), value)
+    return best
+
+
+def place_pieces(board, material, groups):
+    grid = [[None] * 8 for _ in range(8)]
+    pieces = {"B": set(), "N": set()}
+    for group, squares in zip(GROUPS, groups):
+        for row, col in squares:
+            grid[row][col] = group
+            pieces[group[0]].add((row, col))
+    board.board = grid
+    board.pieces = pieces
+    board.king_counts = {"B": material[1], "N": material[3]}
+    board.mandatory_jump_piece = None
+
+
+def class_strides(material):
+    # Pas de l'index de chaque groupe : index = somme(rang * pas) * 2 + camp
+    strides, stride = [], 2
+    for size in reversed(class_shape(material)):
+        strides.append(stride)
+        stride *= size
+    return strides[::-1]
+
+
+def generate_slice(material, tables, axis, ranks):
+    """
+    Forward pass over the placements of one class whose group `axis` has one
+    of the given ranks: plays every legal move of every position. A move
+    that stays in the class is an edge of the game graph; a capture or a
+    promotion leaves the class and is valued from the tables already solved.
+    Returns:
+        tuple: (positions, exits, parents, children) as NumPy arrays: the
+        valid positions of the slice, the best value (for the side to move)
+        among their moves leaving the class (INVALID if none), and the edges.
+    """
+    positions, exits, parents, children = array("i"), array("i"), array("i"), array("i")
+    board = Board()
+    strides = class_strides(material)
+    group_ranks = {group: combinations(group, count)[1] for group, count in zip(GROUPS, material)}
+    axes = [list(enumerate(combinations(group, count)[0])) for group, count in zip(GROUPS, material)]
+    axes[axis] = [axes[axis][rank] for rank in ranks]
+
+    for placement in itertools.product(*axes):
+        groups = [squares for _, squares in placement]
+        occupied = [square for squares in groups for square in squares]
+        if len(set(occupied)) != len(occupied):
+            continue
+        base = sum(rank * stride for (rank, _), stride in zip(placement, strides))
+        place_pieces(board, material, groups)
+        for player in ("B", "N"):
+            index = base + (player == "N")
+            child_side = 1 - (player == "N")
+            kings = board.king_counts[player]
+            exit_value = INVALID
+            for start, end in board.generate_legal_moves(player):
+                undo = board.make_move(start, end)
+                if board.mandatory_jump_piece:
+                    value = position_value(board, player, tables)
+                elif len(undo) > 7 or board.king_counts[player] != kings:
+                    # Prise ou promotion : position d'une classe déjà résolue
+                    value = parent_value(position_value(board, opponent(player), tables))
+                else:
+                    # Déplacement simple : seul le rang du groupe de la pièce jouée change
+                    group = GROUPS.index(undo[2])
+                    rank, squares = placement[group]
+                    moved = tuple(sorted(end if square == start else square for square in squares))
+                    parents.append(index)
+                    children.append(base + (group_ranks[undo[2]][moved] - rank) * strides[group] + child_side)
+                    value = None
+                board.unmake_move(undo)
+                if value is not None and value > exit_value:
+                    exit_value = value
+            positions.append(index)
+            exits.append(exit_value)
+
+    return tuple(np.frombuffer(data, dtype=np.int32) for data in (positions, exits, parents, children))
+
+
+_worker_tables = None  # Tables déjà résolues, transmises une fois à chaque processus
+
+
+def _init_worker(tables):
+    global _worker_tables
+    _worker_tables = tables
+
+
+def _generate_slice(args):
+    material, axis, ranks = args
+    return generate_slice(material, _worker_tables, axis, ranks)
+
+
+def generate_class(material, tables, workers=1):
+    """
+    Forward pass over a whole class (see generate_slice), split across
+    `workers` processes on the largest group.
+    Returns:
+        tuple: (values, parents, children, best_exit) where values is 0 for
+        valid positions and INVALID elsewhere.
+    """
+    size = class_size(material)
+    shape = class_shape(material)
+    axis = shape.index(max(shape))
+    if workers > 1 and shape[axis] > 1:
+        ranks = np.array_split(np.arange(shape[axis]), min(shape[axis], workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tables,)) as pool:
+            slices = list(pool.map(_generate_slice, [(material, axis, part.tolist()) for part in ranks]))
+    else:
+        slices = [generate_slice(material, tables, axis, range(shape[axis]))]
+
+    values = np.full(size, INVALID, dtype=np.int16)
+    best_exit = np.full(size, INVALID, dtype=np.int32)
+    for positions, exits, _, _ in slices:
+        values[positions] = 0
+        best_exit[positions] = exits
+    parents = np.concatenate([part[2] for part in slices])
+    children = np.concatenate([part[3] for part in slices])
+    return values, parents, children, best_exit
+
+
+def retrograde(values, parents, children, best_exit):
+    """
+    Solves one class by retrograde analysis, one distance at a time: round d
+    settles the positions won or lost in exactly d turns. Positions never
+    settled are draws.
+    Returns:
+        numpy.ndarray: The solved values (int16).
+    """
+    values = values.astype(np.int32)
+    size = len(values)
+    resolved = values == INVALID
+    remaining = np.bincount(parents, minlength=size)     # Coups internes pas encore gagnants pour l'adversaire
+    has_exit = best_exit != INVALID
+    worst = np.where(has_exit, best_exit, -WIN)          # Valeur si tous les coups perdent
+    can_lose = ~has_exit | (best_exit < 0)
+
+    # Prédécesseurs de chaque position (tableau trié par position atteinte)
+    order = np.argsort(children, kind="stable")
+    predecessors = parents[order]
+    bounds = np.searchsorted(children[order], np.arange(size + 1))
+
+    frontier = np.zeros(0, dtype=np.int64)
+    distance = 0
+    while True:
+        settled_win = ~resolved & has_exit & (best_exit == WIN - distance)
+        if frontier.size:
+            counts = bounds[frontier + 1] - bounds[frontier]
+            edges = np.repeat(bounds[frontier] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            preds = predecessors[edges]
+            child_values = np.repeat(values[frontier], counts)
+            lost = child_values < 0
+            settled_win[preds[lost]] = True
+            np.subtract.at(remaining, preds[~lost], 1)
+            np.maximum.at(worst, preds[~lost], -child_values[~lost] + 1)
+        settled_win &= ~resolved
+        settled_loss = ~resolved & ~settled_win & (remaining == 0) & can_lose & (worst == -(WIN - distance))
+
+        values[settled_win] = WIN - distance
+        values[settled_loss] = -(WIN - distance)
+        resolved |= settled_win | settled_loss
+        frontier = np.flatnonzero(settled_win | settled_loss)
+        distance += 1
+
+        pending = ~resolved & ((has_exit & (best_exit > 0)) | ((remaining == 0) & can_lose))
+        if not frontier.size and not pending.any():
+            break
+
+    values[~resolved] = 0
+    return values.astype(np.int16)
+
+
+class Tablebase:
+    """
+    Memory-mapped, read-only view of a tablebase file: every process that
+    opens it shares the same pages.
+    """
+
+    def __init__(self, path=TABLEBASE_FILE):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_pieces, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Tables de finales invalides (à régénérer avec tablebase.py) : {path}")
+        self.tables = {}
+        for n in range(count):
+            *material, offset, size = CLASS_ENTRY.unpack_from(self._map, HEADER_SIZE + n * CLASS_ENTRY.size)
+            self.tables[tuple(material)] = np.frombuffer(self._map, dtype=np.int16, count=size, offset=offset)
+
+    def covers(self, board):
+        return board.piece_count("B") + board.piece_count("N") <= self.max_pieces
+
+    def probe(self, board, player):
+        return position_value(board, player, self.tables) if self.covers(board) else None
+
+    def best_move(self, board, player):
+        return best_move(board, player, self.tables) if self.covers(board) else None
+
+    def close(self):
+        # Les vues NumPy doivent être libérées avant de fermer la projection
+        self.tables = None
+        self._map.close()
+        self._file.close()
+
+
+def write_tablebase(tables, max_pieces, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    offset = HEADER_SIZE + len(tables) * CLASS_ENTRY.size
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, max_pieces, len(tables)))
+        for material, table in tables.items():
+            f.write(CLASS_ENTRY.pack(*material, offset, len(table)))
+            offset += table.nbytes
+        for table in tables.values():
+            f.write(table.tobytes())
+    os.replace(tmp_path, path)
+
+
+def build_tablebase(max_pieces=MAX_PIECES, path=TABLEBASE_FILE, workers=1, out=sys.stdout):
+    """
+    Generates the tables of every class with up to `max_pieces` pieces.
+    Classes already present in an existing file are reused, so going from
+    4 to 5 pieces only solves the 5-piece classes. The forward pass of each
+    class is split across `workers` processes.
+    Returns:
+        str: Path of the tablebase file.
+    """
+    tables = {}
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        # Tables d'une autre version (calculées avec d'autres règles) : tout est recalculé
+        if len(header) == HEADER_SIZE and HEADER.unpack(header)[:2] == (MAGIC, VERSION):
+            existing = Tablebase(path)
+            tables = {material: table.copy() for material, table in existing.tables.items()
+                      if sum(material) <= max_pieces}
+            existing.close()
+
+    for material in material_classes(max_pieces):
+        if material in tables:
+            continue
+        started = time.perf_counter()
+        values = retrograde(*generate_class(material, tables, workers))
+        tables[material] = values
+        valid = values[values != INVALID]
+        print(f"{material} : {len(valid):>9} positions, {np.count_nonzero(valid > 0):>9} gains, "
+              f"{np.count_nonzero(valid < 0):>9} pertes, {np.count_nonzero(valid == 0):>9} nulles "
+              f"({time.perf_counter() - started:.1f} s)", file=out, flush=True)
+
+    write_tablebase({material: tables[material] for material in material_classes(max_pieces)}, max_pieces, path)
+    return path
+
+
+def load_tablebase(path=TABLEBASE_FILE):
+    """
+    Opens the tablebase file.
+    Returns:
+        Tablebase or None: None if it was never generated.
+    """
+    if not os.path.exists(path):
+        return None
+    return Tablebase(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génération des tables de finales par analyse rétrograde.")
+    parser.add_argument("-p", "--pieces", type=int, default=MAX_PIECES, help="Nombre maximal de pièces sur le plateau")
+    parser.add_argument("--output", default=TABLEBASE_FILE, help="Fichier des tables")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="Nombre de processus")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    path = build_tablebase(args.pieces, args.output, args.workers)
+    print(f"{path} : {os.path.getsize(path) / 1e6:.1f} Mo en {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Modules du jeu à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def random_games(count, seed=0, max_plies=60):
+    """
+    Plays `count` random games with the controller (legal moves, captures
+    recorded); a game cut at `max_plies` has no winner.
+    Returns:
+        list: (moves, winner) pairs, as expected by history.append_games.
+    """
+    import random
+
+    from controller import GameController
+
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        controller = GameController(max_plies=max_plies + 1)
+        while not controller.game_over and len(controller.moves) < max_plies:
+            moves = controller.board.generate_legal_moves(controller.current_player)
+            controller.play_move(*rng.choice(moves))
+        games.append((controller.moves, controller.winner or ""))
+    return games
@@ -0,0 +1,52 @@
+import csv
+
+import binary_history
+import history
+from conftest import random_games
+
+
+def write_history(path, games):
+    history.append_games(games, str(path))
+    return str(path)
+
+
+def test_csv_binary_csv_round_trip(tmp_path):
+    games = random_games(12, seed=1, max_plies=40) + random_games(3, seed=2, max_plies=200)
+    csv_path = write_history(tmp_path / "h.csv", games)
+    # Partie enregistrée avant les dates : marqueur sans date
+    with open(csv_path, "a", encoding="utf-8", newline="") as f:
+        csv.writer(f, lineterminator="\n").writerows(history.game_rows(99, games[0][0], history.WINNER_DRAW))
+
+    bin_path = binary_history.csv_to_binary(csv_path)
+    copy_path = str(tmp_path / "copy.csv")
+    binary_history.binary_to_csv(bin_path, copy_path)
+    with open(csv_path, "rb") as original, open(copy_path, "rb") as copy:
+        assert copy.read() == original.read()
+
+
+def test_games_and_winners(tmp_path):
+    games = random_games(8, seed=3)
+    csv_path = write_history(tmp_path / "h.csv", games)
+    records = binary_history.load_history(csv_path)
+    try:
+        assert len(records) == len(games)
+        for n, (moves, winner) in enumerate(games):
+            game_id, stored_moves, stored_winner, date = records.game(n)
+            assert game_id == n + 1
+            assert stored_moves == moves
+            assert stored_winner == (winner or None)
+            assert date
+        assert records.move_winners().tolist() == [binary_history.WINNER_CODES[winner or None]
+                                                   for moves, winner in games for _ in moves]
+    finally:
+        records.close()
+
+
+def test_incremental_conversion_matches_full(tmp_path):
+    csv_path = write_history(tmp_path / "h.csv", random_games(5, seed=4))
+    binary_history.csv_to_binary(csv_path)
+    write_history(csv_path, random_games(4, seed=5))
+    incremental = binary_history.csv_to_binary(csv_path)
+    full = binary_history.csv_to_binary(csv_path, str(tmp_path / "full.bin"))
+    with open(incremental, "rb") as a, open(full, "rb") as b:
+        assert a.read() == b.read()
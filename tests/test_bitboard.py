@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from bitboard import BitBoard
+from board import Board
+
+
+def opponent(player):
+    return "N" if player == "B" else "B"
+
+
+def random_positions(games=40, plies=120, seed=1):
+    # Positions atteintes en jouant au hasard, rafles en cours comprises
+    rng = random.Random(seed)
+    for _ in range(games):
+        board, player = Board(), "B"
+        for _ in range(plies):
+            moves = board.generate_legal_moves(player)
+            if not moves:
+                break
+            yield board, player
+            board.make_move(*rng.choice(moves))
+            if not board.mandatory_jump_piece:
+                player = opponent(player)
+
+
+@pytest.mark.parametrize("sequences", [False, True])
+def test_same_moves_as_board(sequences):
+    for board, player in random_positions():
+        bitboard = BitBoard.from_board(board)
+        assert sorted(bitboard.generate_legal_moves(player, sequences)) == \
+            sorted(board.generate_legal_moves(player, sequences))
+        assert bitboard.has_capture(player) == board.has_capture(player)
+
+
+def test_same_position_after_moves():
+    rng = random.Random(2)
+    for _ in range(20):
+        board, bitboard, player = Board(), BitBoard(), "B"
+        bitboard.board  # Vue 8x8 construite : tenue à jour coup par coup
+        for _ in range(150):
+            moves = board.generate_legal_moves(player)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            board.make_move(*move)
+            bitboard.make_move(*move)
+            assert bitboard.board == board.board
+            assert bitboard.pieces == board.pieces
+            assert bitboard.king_counts == board.king_counts
+            assert bitboard.zobrist_key == board.zobrist_key
+            assert bitboard.mandatory_jump_piece == board.mandatory_jump_piece
+            if not board.mandatory_jump_piece:
+                player = opponent(player)
+
+
+def test_unmake_restores_position():
+    for board, player in random_positions(games=10):
+        bitboard = BitBoard.from_board(board)
+        grid, pieces = [row[:] for row in bitboard.board], {side: set(s) for side, s in bitboard.pieces.items()}
+        key = bitboard.zobrist_key
+        for move in bitboard.generate_legal_moves(player):
+            bitboard.unmake_move(bitboard.make_move(*move))
+            assert bitboard.board == grid
+            assert bitboard.pieces == pieces
+            assert bitboard.zobrist_key == key
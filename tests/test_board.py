@@ -0,0 +1,38 @@
+import pytest
+
+from bitboard import BitBoard
+from board import Board
+from perft import board_from_rows
+
+# Dame blanche en (7, 2), dame noire en (2, 1)
+KINGS = [
+    "........",
+    "........",
+    ".N......",
+    "........",
+    "........",
+    "........",
+    "........",
+    "..B.....",
+]
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_long_king_slide_is_not_a_capture(board_class):
+    board = board_from_rows(KINGS, board_class=board_class)
+    # Arrivée en (5, 4) : la dame noire devient prenable, mais aucune pièce n'a été sautée
+    assert board.is_valid_move((7, 2), (5, 4))
+    assert not board.is_capture_move((7, 2), (5, 4))
+    board.make_move((7, 2), (5, 4))
+    assert board.mandatory_jump_piece is None
+    # Trait aux noirs, qui doivent prendre la dame blanche
+    assert board.generate_legal_moves("N") == [((2, 1), (6, 5))]
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_capture_is_mandatory_for_kings(board_class):
+    board = board_from_rows(KINGS, board_class=board_class)
+    board.make_move((7, 2), (5, 4))
+    assert board.is_capture_move((2, 1), (6, 5))
+    assert board.is_valid_move((2, 1), (6, 5))
+    assert not board.is_valid_move((2, 1), (3, 0))  # Déplacement simple interdit quand une prise existe
@@ -0,0 +1,57 @@
+import csv
+
+import game_index
+import history
+from conftest import random_games
+
+
+def test_plies_and_winners(tmp_path):
+    games = random_games(6, seed=1)
+    games[1] = (games[1][0], "")                    # Vainqueur vide : ligne "Résultat" quand même
+    games[2] = (games[2][0], history.WINNER_DRAW)
+    csv_path = str(tmp_path / "h.csv")
+    history.append_games(games, csv_path)
+
+    index = game_index.load_index(csv_path)
+    try:
+        assert len(index) == len(games)
+        for n, (moves, winner) in enumerate(games):
+            summary = index.summary(n)
+            assert summary["game_id"] == n + 1
+            assert summary["plies"] == len(moves)
+            assert summary["winner"] == (winner or None)
+            assert summary["date"]
+    finally:
+        index.close()
+
+
+def test_summary_locates_game(tmp_path):
+    games = random_games(4, seed=2)
+    csv_path = str(tmp_path / "h.csv")
+    history.append_games(games, csv_path)
+    index = game_index.load_index(csv_path)
+    try:
+        summary = index.summary(2)
+    finally:
+        index.close()
+    with open(csv_path, "rb") as f:
+        f.seek(summary["offset"])
+        block = f.read(summary["length"]).decode("utf-8")
+    rows = list(csv.reader(block.splitlines()))
+    assert rows[0][0] == "---debut-partie3---"
+    assert rows[-1][0] == "---fin-partie3---"
+
+
+def test_incremental_update(tmp_path):
+    csv_path = str(tmp_path / "h.csv")
+    history.append_games(random_games(3, seed=3), csv_path)
+    game_index.update_index(csv_path)
+    history.append_games(random_games(2, seed=4), csv_path)
+    incremental = game_index.update_index(csv_path)
+    full = game_index.update_index(csv_path, str(tmp_path / "full.idx"))
+    with open(incremental, "rb") as a, open(full, "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_no_history(tmp_path):
+    assert game_index.load_index(str(tmp_path / "missing.csv")) is None
@@ -0,0 +1,61 @@
+import random
+from collections import Counter
+
+import numpy as np
+
+import history
+import opening_book
+from board import Board
+from conftest import random_games
+
+
+def test_merge_keeps_large_keys():
+    empty = np.zeros(0, dtype=opening_book.ENTRY_DTYPE)
+    top = (1 << 64) - 1
+    entries = opening_book.merge_entries(empty, {(5, 1, 2): [0, 1], (top, 1, 2): [1, 2], (1 << 63, 3, 4): [1, 1]})
+    entries = opening_book.merge_entries(entries, {(top, 1, 2): [1, 1], ((1 << 63) + 7, 0, 1): [0, 1]})
+    assert entries["key"].tolist() == [5, 1 << 63, (1 << 63) + 7, top]
+    assert entries[entries["key"] == top][["wins", "total"]].tolist() == [(2, 3)]
+    # Fusion sans nouveaux comptes : entrées inchangées
+    assert opening_book.merge_entries(entries, {}).tobytes() == entries.tobytes()
+
+
+def test_first_moves_counted(tmp_path):
+    games = [(moves, winner) for moves, winner in random_games(12, seed=1, max_plies=400) if winner]
+    assert games
+    csv_path = str(tmp_path / "h.csv")
+    history.append_games(games + [(games[0][0], "")], csv_path)  # Partie sans résultat ignorée
+
+    book = opening_book.load_book(csv_path)
+    try:
+        found = {move: (wins, total) for move, wins, total in book.lookup(Board(), "B")}
+    finally:
+        book.close()
+    totals = Counter((moves[0][1], moves[0][2]) for moves, _ in games)
+    wins = Counter((moves[0][1], moves[0][2]) for moves, winner in games if winner == history.WINNER_WHITE)
+    assert found == {move: (wins[move], total) for move, total in totals.items()}
+
+
+def test_choose_ignores_rare_and_illegal_moves(tmp_path):
+    moves = [("B", (5, 0), (4, 1), None)]
+    csv_path = str(tmp_path / "h.csv")
+    history.append_games([(moves, history.WINNER_WHITE)] * 3 + [([("B", (5, 2), (4, 3), None)], "IA")], csv_path)
+    book = opening_book.load_book(csv_path)
+    try:
+        board = Board()
+        legal = board.generate_legal_moves("B")
+        assert book.choose(board, "B", legal, rng=random.Random(0)) == ((5, 0), (4, 1))
+        assert book.choose(board, "B", [((5, 2), (4, 3))]) is None
+    finally:
+        book.close()
+
+
+def test_incremental_update_matches_full(tmp_path):
+    csv_path = str(tmp_path / "h.csv")
+    history.append_games(random_games(6, seed=2), csv_path)
+    opening_book.update_book(csv_path)
+    history.append_games(random_games(6, seed=3), csv_path)
+    incremental = opening_book.update_book(csv_path)
+    full = opening_book.update_book(csv_path, str(tmp_path / "full.book"))
+    with open(incremental, "rb") as a, open(full, "rb") as b:
+        assert a.read() == b.read()
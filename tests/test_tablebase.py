@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+import tablebase
+from board import Board
+
+KING_CLASSES = [(0, 1, 0, 1), (0, 2, 0, 1), (0, 1, 0, 2)]  # Dames seules : deux et trois pièces
+
+
+@pytest.fixture(scope="module")
+def tables(tmp_path_factory):
+    solved = {}
+    for material in KING_CLASSES:
+        solved[material] = tablebase.retrograde(*tablebase.generate_class(material, solved))
+    path = str(tmp_path_factory.mktemp("tb") / "endgame.tb")
+    tablebase.write_tablebase(solved, 3, path)
+    loaded = tablebase.load_tablebase(path)
+    yield loaded
+    loaded.close()
+
+
+def kings(white, black):
+    board = Board()
+    tablebase.place_pieces(board, (0, len(white), 0, len(black)), [[], sorted(white), [], sorted(black)])
+    return board
+
+
+def test_lone_kings_draw(tables):
+    board = kings([(7, 0)], [(0, 1)])
+    assert tables.probe(board, "B") == 0
+    assert tables.probe(board, "N") == 0
+
+
+def test_capture_wins_at_once(tables):
+    # Dames voisines, case libre derrière chacune : le camp au trait prend et gagne
+    board = kings([(5, 2)], [(4, 3)])
+    assert tables.probe(board, "B") == tablebase.WIN - 1
+    assert tables.probe(board, "N") == tablebase.WIN - 1
+
+
+def test_blocked_king_loses(tables):
+    # Dame noire dans le coin, sa seule diagonale fermée par deux dames blanches
+    board = kings([(6, 1), (5, 2)], [(7, 0)])
+    assert board.generate_legal_moves("N") == []
+    assert tables.probe(board, "N") == -tablebase.WIN
+
+
+def test_two_kings_against_one(tables):
+    board = kings([(7, 2), (5, 0)], [(4, 3)])
+    value = tables.probe(board, "B")
+    assert value > 0
+    # Le coup choisi garde le même résultat, et la réponse des noirs le confirme
+    move, best = tables.best_move(board, "B")
+    assert best == value
+    board.make_move(*move)
+    assert tablebase.parent_value(tables.probe(board, "N")) == value
+
+
+def flipped(board):
+    # Plateau tourné d'un demi-tour, couleurs échangées
+    groups = tablebase.board_groups(board)
+    white = [(7 - row, 7 - col) for row, col in groups[3]]
+    black = [(7 - row, 7 - col) for row, col in groups[1]]
+    return kings(white, black)
+
+
+def test_values_match_moves_and_colours(tables):
+    rng = random.Random(0)
+    squares = tablebase.DARK_SQUARES
+    for _ in range(300):
+        white = rng.sample(squares, 2)
+        black = [rng.choice([square for square in squares if square not in white])]
+        board = kings(white, black)
+        for player in ("B", "N"):
+            value = tables.probe(board, player)
+            assert value == tables.probe(flipped(board), "N" if player == "B" else "B")
+            best = tables.best_move(board, player)
+            assert value == (best[1] if best else -tablebase.WIN)
@@ -0,0 +1,46 @@
+import random
+
+from board import Board
+from transposition import EXACT, LOWER, TranspositionTable, decode_move, encode_move
+
+
+def test_incremental_key_matches_full_hash():
+    rng = random.Random(3)
+    board, player = Board(), "B"
+    for _ in range(200):
+        moves = board.generate_legal_moves(player)
+        if not moves:
+            break
+        key = board.zobrist_key
+        undo = board.make_move(*rng.choice(moves))
+        assert board.zobrist_key == board.compute_zobrist_key()
+        board.unmake_move(undo)
+        assert board.zobrist_key == key
+        board.make_move(*rng.choice(moves))
+        if not board.mandatory_jump_piece:
+            player = "N" if player == "B" else "B"
+
+
+def test_move_encoding_round_trip():
+    for move in [((5, 0), (4, 1)), ((0, 7), (7, 0)), None]:
+        assert decode_move(encode_move(move)) == move
+
+
+def test_store_and_probe():
+    table = TranspositionTable(size_mb=1)
+    key = (1 << 63) | 12345
+    table.store(key, 4, EXACT, 120, ((5, 0), (4, 1)))
+    assert table.probe(key) == (4, EXACT, 120, ((5, 0), (4, 1)))
+    # Autre clé du même emplacement : pas de faux résultat
+    assert table.probe(key ^ (table.mask + 1)) is None
+
+
+def test_depth_preferred_replacement():
+    table = TranspositionTable(size_mb=1)
+    key, other = 7, 7 + table.mask + 1
+    table.store(key, 6, EXACT, 10, None)
+    table.store(other, 2, LOWER, 20, None)   # Moins profond, même recherche : refusé
+    assert table.probe(key)[0] == 6
+    table.new_search()
+    table.store(other, 2, LOWER, 20, None)   # Entrée d'une recherche précédente : remplacée
+    assert table.probe(other) == (2, LOWER, 20, None)
@@ -0,0 +1,64 @@
+import json
+
+import numpy as np
+import pytest
+
+import evaluation
+import history
+import tuner
+from board import Board
+from conftest import random_games
+
+
+def test_weights_round_trip(tmp_path):
+    path = str(tmp_path / "weights.json")
+    weights = evaluation.DEFAULT_WEIGHTS + np.arange(evaluation.N_FEATURES) / 7
+    evaluation.save_weights(weights, path, scale=0.1)
+    assert np.array_equal(evaluation.load_weights(path), weights)
+    assert evaluation.load_weights(str(tmp_path / "missing.json")) is None
+
+
+def test_invalid_weights_rejected(tmp_path):
+    path = str(tmp_path / "weights.json")
+    evaluation.save_weights(evaluation.DEFAULT_WEIGHTS, path)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["weights"]["man_squares"] = [0.0] * 31
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    with pytest.raises(ValueError):
+        evaluation.load_weights(path)
+
+
+def test_features_symmetric_between_colours():
+    rng = np.random.default_rng(0)
+    codes = rng.choice(5, size=(50, 32)).astype(np.int8)
+    # Même position vue par les noirs : plateau tourné, couleurs échangées
+    mirrored = evaluation.SWAP_COLORS[codes[:, ::-1]]
+    assert np.array_equal(evaluation.position_features(codes, False), evaluation.position_features(mirrored, True))
+
+
+def test_move_scores_match_positions():
+    board = Board()
+    moves = board.generate_legal_moves("B")
+    scores = evaluation.evaluate_moves(board, "B", moves)
+    for move, score in zip(moves, scores):
+        undo = board.make_move(*move)
+        assert score == pytest.approx(evaluation.evaluate_positions(evaluation.encode_board(board), False)[0])
+        board.unmake_move(undo)
+
+
+def test_tuning_lowers_the_loss(tmp_path):
+    csv_path = str(tmp_path / "h.csv")
+    games = [(moves, winner) for moves, winner in random_games(40, seed=1, max_plies=400) if winner]
+    assert games
+    history.append_games(games, csv_path)
+    codes, results, counts = tuner.load_positions(csv_path, skip_plies=0)
+    assert len(codes) and counts.sum() >= len(codes)
+    assert ((results >= 0) & (results <= 1)).all()  # Résultat moyen des positions identiques
+
+    features = evaluation.position_features(codes, False)
+    weights, scale = tuner.tune(features, results, counts, iterations=200)
+    before = tuner.log_loss(features @ evaluation.DEFAULT_WEIGHTS, results, counts, scale)
+    after = tuner.log_loss(features @ weights, results, counts, scale)
+    assert after < before
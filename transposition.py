@@ -0,0 +1,89 @@
+from array import array
+
+# Type de borne stockée avec le score
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Octets par entrée : clé (8) + profondeur (1) + borne (1) + score (4) + coup (2)
+# + génération (1) + occupée (1)
+ENTRY_BYTES = 18
+
+
+def encode_move(move):
+    if move is None:
+        return 0xFFFF
+    (r1, c1), (r2, c2) = move
+    return ((r1 * 8 + c1) << 6) | (r2 * 8 + c2)
+
+
+def decode_move(code):
+    if code == 0xFFFF:
+        return None
+    start, end = code >> 6, code & 63
+    return (start // 8, start % 8), (end // 8, end % 8)
+
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table indexed by Zobrist key.
+    Entries live in flat typed arrays, so memory is capped at roughly
+    `size_mb` megabytes whatever the number of positions stored. An entry is
+    replaced when it comes from an older search, or when the new result was
+    searched at least as deep (depth-preferred replacement).
+    """
+
+    def __init__(self, size_mb=16):
+        entries = 1
+        while entries * 2 * ENTRY_BYTES <= size_mb * 1024 * 1024:
+            entries *= 2
+        self.size = entries
+        self.mask = entries - 1
+        self.keys = array('Q', bytes(8 * entries))
+        self.depths = array('b', bytes(entries))
+        self.flags = array('B', bytes(entries))
+        self.values = array('i', bytes(4 * entries))
+        self.moves = array('H', b'\xff\xff' * entries)
+        self.ages = array('B', bytes(entries))
+        self.used = array('B', bytes(entries))
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def new_search(self):
+        # Les entrées des recherches précédentes deviennent remplaçables en priorité
+        self.generation = (self.generation + 1) & 0xFF
+
+    def probe(self, key):
+        """
+        Looks up a position.
+        Returns:
+            tuple or None: (depth, flag, value, move) when the key is stored, else None.
+        """
+        index = key & self.mask
+        if not self.used[index]:
+            self.misses += 1
+            return None
+        if self.keys[index] != key:
+            self.collisions += 1
+            return None
+        self.hits += 1
+        return self.depths[index], self.flags[index], self.values[index], decode_move(self.moves[index])
+
+    def store(self, key, depth, flag, value, move):
+        index = key & self.mask
+        same = self.used[index] and self.keys[index] == key
+        if self.used[index] and not same \
+                and self.ages[index] == self.generation and depth < self.depths[index]:
+            return
+        self.keys[index] = key
+        self.depths[index] = max(-128, min(127, depth))
+        self.flags[index] = flag
+        self.values[index] = value
+        # Sans meilleur coup connu, on garde celui déjà stocké pour cette position
+        if move is not None or not same:
+            self.moves[index] = encode_move(move)
+        self.ages[index] = self.generation
+        self.used[index] = 1
+
+    def stats(self):
+        return {"entries": self.size, "hits": self.hits, "misses": self.misses, "collisions": self.collisions}
@@ -0,0 +1,241 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+import evaluation
+import history
+import history_reader
+from board import Board
+from controller import MAX_PLIES
+from ia import CheckersAI
+from selfplay import play_game, prepare_history
+
+# Réglage des poids de l'évaluation (evaluation.py) sur les résultats des
+# parties de l'historique, à la manière de Texel : chaque position calme
+# (aucune prise à jouer) d'une partie terminée est étiquetée par le résultat
+# final pour les blancs (1 victoire, 0.5 nulle, 0 défaite), et les poids sont
+# ajustés pour que sigmoïde(K x score) prédise ce résultat (régression
+# logistique par descente de gradient, sur toutes les positions à la fois).
+#
+# K est d'abord choisi pour les poids par défaut puis fixé : les poids réglés
+# restent à l'échelle des poids par défaut, donc du bonus d'historique
+# (au plus +5) que CheckersAI.evaluate_moves leur ajoute.
+
+RESULTS = {history.WINNER_WHITE: 1.0, history.WINNER_DRAW: 0.5, history.WINNER_BLACK: 0.0}
+SKIP_PLIES = 4          # Demi-coups d'ouverture ignorés (joués au hasard par l'auto-jeu)
+CHUNK_BYTES = 1 << 20   # Taille des blocs de CSV répartis entre les processus
+ITERATIONS = 1000
+LEARNING_RATE = 0.05
+REGULARIZATION = 1e-4   # Rappel vers les poids par défaut (cases rarement occupées)
+MATCH_GAMES = 200
+
+_match_ais = None  # (IA aux poids réglés, IA de référence), créées une fois par processus
+
+
+def collect_chunk(chunk, skip_plies=SKIP_PLIES):
+    """
+    Replays the decided games of a history chunk and keeps their quiet positions.
+    Returns:
+        tuple: (codes, results), int8 array (n, 32) of positions (see
+        evaluation.encode_board) and float64 array (n,) of game results for white.
+    """
+    winners = chunk.games["winner"].astype(object).to_numpy()
+    codes, results = [], []
+    board, current, playable, ply = None, -1, False, 0
+    for game, player, start, end in zip(chunk.moves["game"], chunk.moves["player"],
+                                        chunk.moves["start"], chunk.moves["end"]):
+        if game != current:
+            current, board, ply = game, Board(), 0
+            playable = pd.notna(winners[game])  # Parties sans résultat ignorées
+        if not playable:
+            continue
+        start_square, end_square = history_reader.SQUARES[start], history_reader.SQUARES[end]
+        piece = board.board[start_square[0]][start_square[1]]
+        # Coup illisible ou illégal : la suite de la partie n'est pas rejouée
+        if not piece or piece[0] != player or not board.is_valid_move(start_square, end_square):
+            playable = False
+            continue
+
+        board.make_move(start_square, end_square)
+        ply += 1
+        if board.mandatory_jump_piece:
+            continue  # Rafle en cours : même tour
+        # Position calme : le score statique a un sens sans prise en suspens
+        if ply > skip_plies and not board.has_capture("N" if player == "B" else "B"):
+            codes.append(evaluation.board_codes(board.board))
+            results.append(RESULTS[winners[game]])
+    return np.array(codes, dtype=np.int8).reshape(-1, 32), np.array(results, dtype=np.float64)
+
+
+def load_positions(csv_path=history.HISTORY_FILE, workers=1, skip_plies=SKIP_PLIES, chunk_bytes=CHUNK_BYTES):
+    """
+    Collects the quiet positions of the whole history, merging duplicates.
+    Chunks of the CSV are replayed in parallel when workers > 1.
+    Returns:
+        tuple: (codes, results, counts), one row per distinct position, with
+        the mean result and the number of occurrences.
+    """
+    chunks = history_reader.iter_chunks(csv_path, chunk_bytes=chunk_bytes)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(collect_chunk, chunks, repeat(skip_plies)))
+    else:
+        parts = [collect_chunk(chunk, skip_plies) for chunk in chunks]
+
+    codes = np.concatenate([part[0] for part in parts] + [np.zeros((0, 32), dtype=np.int8)])
+    results = np.concatenate([part[1] for part in parts] + [np.zeros(0)])
+    # Positions identiques (ouvertures surtout) : une ligne, résultat moyen
+    codes, inverse = np.unique(codes, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    counts = np.bincount(inverse, minlength=len(codes)).astype(np.float64)
+    results = np.bincount(inverse, weights=results, minlength=len(codes)) / np.maximum(counts, 1)
+    return codes, results, counts
+
+
+def sigmoid(x):
+    # Forme tanh : pas de dépassement pour les grands scores
+    return 0.5 * (1 + np.tanh(x / 2))
+
+
+def log_loss(scores, results, counts, scale):
+    # Entropie croisée moyenne, pondérée par le nombre d'occurrences des positions
+    p = np.clip(sigmoid(scale * scores), 1e-12, 1 - 1e-12)
+    return float(-(counts * (results * np.log(p) + (1 - results) * np.log(1 - p))).sum() / counts.sum())
+
+
+def fit_scale(scores, results, counts):
+    # K qui explique le mieux les résultats avec les poids de départ (recherche sur une grille logarithmique)
+    grid = np.logspace(-4, 1, 200)
+    return float(grid[np.argmin([log_loss(scores, results, counts, k) for k in grid])])
+
+
+def tune(features, results, counts, weights=evaluation.DEFAULT_WEIGHTS, iterations=ITERATIONS,
+         learning_rate=LEARNING_RATE, regularization=REGULARIZATION, scale=None):
+    """
+    Fits the weights by logistic regression on the position features (Adam steps
+    on the full batch), starting from and regularised towards `weights`.
+    Args:
+        features: float array (n, N_FEATURES), white's point of view.
+        results, counts: Mean result for white and occurrences of each position.
+        scale (float, optional): Logistic scale K; fitted on `weights` if None.
+    Returns:
+        tuple: (tuned weights, scale).
+    """
+    if scale is None:
+        scale = fit_scale(features @ weights, results, counts)
+    start = np.asarray(weights, dtype=np.float64)
+    tuned = start.copy()
+    share = counts / counts.sum()
+    m, v = np.zeros_like(tuned), np.zeros_like(tuned)
+    beta1, beta2 = 0.9, 0.999
+    for step in range(1, iterations + 1):
+        error = sigmoid(scale * (features @ tuned)) - results
+        gradient = scale * (features.T @ (share * error)) + regularization * (tuned - start)
+        m = beta1 * m + (1 - beta1) * gradient
+        v = beta2 * v + (1 - beta2) * gradient ** 2
+        tuned -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + 1e-9)
+    return tuned, scale
+
+
+def _init_match(history_file, weights, baseline):
+    global _match_ais
+    # Sans bibliothèque ni tables de finales : seule l'évaluation diffère
+    _match_ais = [CheckersAI(history_file=history_file, weights=w, use_book=False, use_tablebase=False)
+                  for w in (weights, baseline)]
+
+
+def _play_match_game(args):
+    # Parties par paires : même graine, couleurs inversées
+    game, seed, max_plies = args
+    tuned, baseline = _match_ais
+    white, black = (tuned, baseline) if game % 2 == 0 else (baseline, tuned)
+    _, winner = play_game(white, seed + game // 2, max_plies=max_plies, black_ai=black)
+    return game, winner
+
+
+def play_match(weights, baseline=evaluation.DEFAULT_WEIGHTS, games=MATCH_GAMES, workers=1, seed=0,
+               history_file=history.HISTORY_FILE, max_plies=MAX_PLIES):
+    """
+    Self-play match of `weights` against `baseline` (CheckersAI, history mode),
+    each opening played twice with colours swapped.
+    Returns:
+        dict: Wins, losses and draws of `weights`, its score (draw = 1/2) and
+        the 95 % margin of that score.
+    """
+    summary = {"parties": 0, "victoires": 0, "défaites": 0, "nulles": 0}
+    tasks = ((game, seed, max_plies) for game in range(games))
+    # Miroir binaire à jour avant le démarrage des processus, qui ne font que le lire
+    prepare_history(history_file)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_match,
+                             initargs=(history_file, weights, baseline)) as pool:
+        for game, winner in pool.map(_play_match_game, tasks, chunksize=max(1, min(16, games // 32))):
+            summary["parties"] += 1
+            tuned_side = history.WINNER_WHITE if game % 2 == 0 else history.WINNER_BLACK
+            if winner == history.WINNER_DRAW:
+                summary["nulles"] += 1
+            elif winner == tuned_side:
+                summary["victoires"] += 1
+            else:
+                summary["défaites"] += 1
+    score = (summary["victoires"] + summary["nulles"] / 2) / max(summary["parties"], 1)
+    summary["score"] = score
+    # Demi-largeur de l'intervalle de confiance à 95 % du score
+    summary["marge"] = 1.96 * (score * (1 - score) / max(summary["parties"], 1)) ** 0.5
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Réglage des poids de l'évaluation sur l'historique des parties.")
+    parser.add_argument("--history", default=history.HISTORY_FILE, help="Historique des parties")
+    parser.add_argument("--output", default=evaluation.WEIGHTS_FILE, help="Fichier de poids à écrire")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="Nombre de processus")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument("--learning-rate", type=float, default=LEARNING_RATE)
+    parser.add_argument("--regularization", type=float, default=REGULARIZATION)
+    parser.add_argument("--skip-plies", type=int, default=SKIP_PLIES, help="Demi-coups d'ouverture ignorés")
+    parser.add_argument("--games", type=int, default=MATCH_GAMES,
+                        help="Parties du match poids réglés contre poids par défaut (0 : pas de match)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de la première paire de parties du match")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    codes, results, counts = load_positions(args.history, args.workers, args.skip_plies)
+    if not len(codes):
+        print("❌ Aucune position exploitable dans l'historique")
+        return 1
+    features = np.concatenate([evaluation.position_features(codes[i:i + 65536], False)
+                               for i in range(0, len(codes), 65536)])
+    print(f"{int(counts.sum())} positions ({len(codes)} distinctes) en {time.perf_counter() - started:.1f} s")
+
+    started = time.perf_counter()
+    weights, scale = tune(features, results, counts, iterations=args.iterations,
+                         learning_rate=args.learning_rate, regularization=args.regularization)
+    before = log_loss(features @ evaluation.DEFAULT_WEIGHTS, results, counts, scale)
+    after = log_loss(features @ weights, results, counts, scale)
+    print(f"K = {scale:.4g}, perte {before:.4f} -> {after:.4f} en {time.perf_counter() - started:.1f} s")
+    for name, size in evaluation.FEATURES:
+        if size == 1:
+            print(f"  {name:<15} {evaluation.DEFAULT_WEIGHTS[evaluation.FEATURE_SLICES[name]][0]:>8.2f} "
+                  f"-> {weights[evaluation.FEATURE_SLICES[name]][0]:>8.2f}")
+    evaluation.save_weights(weights, args.output, scale=scale, positions=int(counts.sum()),
+                            loss_before=before, loss_after=after)
+    print(f"Poids écrits dans {args.output}")
+
+    if args.games:
+        started = time.perf_counter()
+        summary = play_match(weights, games=args.games, workers=args.workers, seed=args.seed,
+                             history_file=args.history)
+        print(f"Match contre les poids par défaut ({time.perf_counter() - started:.1f} s) : "
+              f"{summary['victoires']} victoires, {summary['défaites']} défaites, {summary['nulles']} nulles, "
+              f"score {summary['score']:.1%} ± {summary['marge']:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())